@@ -0,0 +1,97 @@
+"""
+Almacén de alertas indexado por estado de lectura y prioridad.
+
+Los contadores de no leídas se mantienen de forma incremental y las
+consultas paginadas recorren solo la página pedida, así el badge del
+dashboard y la pestaña de alertas no dependen del total de alertas.
+"""
+
+import heapq
+import itertools
+import threading
+
+PRIORITIES = ("HIGH", "MEDIUM", "LOW")
+
+
+class AlertStore:
+    """Alertas (`alert_templates.Alert`) en orden de llegada con índices de no leídas por prioridad"""
+
+    def __init__(self, alerts=None):
+        self._lock = threading.Lock()
+        self.load(alerts or [])
+
+    def load(self, alerts):
+        """Reemplazar el contenido (p. ej. al cargar un snapshot)"""
+        with self._lock:
+            self._alerts = {}
+            self._order = []
+            self._by_priority = {p: [] for p in PRIORITIES}
+            self._unread = {p: {} for p in PRIORITIES}
+            for alert in alerts:
+                self._add(alert)
+
+    def _add(self, alert):
+        alert_id = alert.id
+        priority = alert.priority
+        self._by_priority.setdefault(priority, [])
+        self._unread.setdefault(priority, {})
+        self._alerts[alert_id] = alert
+        self._order.append(alert_id)
+        self._by_priority[priority].append(alert_id)
+        if not alert.is_read:
+            self._unread[priority][alert_id] = None
+
+    def add(self, alert):
+        with self._lock:
+            self._add(alert)
+
+    append = add
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        with self._lock:
+            return [self._alerts[alert_id] for alert_id in self._order]
+
+    def mark_read(self, ids):
+        """Marcar como leídas las alertas indicadas; devuelve cuántas cambiaron"""
+        changed = 0
+        with self._lock:
+            for alert_id in ids:
+                alert = self._alerts.get(alert_id)
+                if alert is None or alert.is_read:
+                    continue
+                alert.is_read = True
+                self._unread[alert.priority].pop(alert_id, None)
+                changed += 1
+        return changed
+
+    def mark_all_read(self, priority=None):
+        """Acuse masivo: todas las no leídas (opcionalmente de una prioridad)"""
+        with self._lock:
+            priorities = [priority] if priority else list(self._unread)
+            ids = [alert_id for p in priorities for alert_id in self._unread.get(p, {})]
+        return self.mark_read(ids)
+
+    def unread_counts(self):
+        counts = {p: len(ids) for p, ids in self._unread.items()}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def page(self, per_page=10, unread_only=False, priority=None):
+        """Alertas más recientes primero; coste proporcional a la página"""
+        with self._lock:
+            if unread_only:
+                if priority:
+                    ids = reversed(self._unread.get(priority, {}))
+                else:
+                    ids = heapq.merge(*(reversed(index) for index in self._unread.values()), reverse=True)
+            elif priority:
+                ids = reversed(self._by_priority.get(priority, []))
+            else:
+                ids = reversed(self._order)
+            return [self._alerts[alert_id] for alert_id in itertools.islice(ids, per_page)]
@@ -0,0 +1,127 @@
+"""
+Alertas compactas con plantillas renderizadas por canal.
+
+Cada alerta guarda solo un ID de plantilla y sus campos estructurados; el
+mensaje se genera bajo demanda para el canal que lo pide (HTML del
+dashboard, Markdown de Telegram o texto plano).
+"""
+
+import html
+import sys
+from datetime import datetime
+
+# ID de plantilla -> (tipo de alerta, emoji)
+TEMPLATES = {
+    1: ("GEM_DETECTED", "🚀"),
+    2: ("RISK_WARNING", "⚠️"),
+}
+TEMPLATE_IDS = {alert_type: template_id for template_id, (alert_type, _) in TEMPLATES.items()}
+
+# Líneas del cuerpo: (emoji, etiqueta, campo, formato)
+BODY_LINES = (
+    ("💎", "Confianza", "confidence", "{:}%"),
+    ("💰", "Market Cap", "market_cap", "${:,.0f}"),
+    ("💧", "Liquidez", "liquidity", "${:,.0f}"),
+    ("📊", "PnL", "pnl", "${:.2f}"),
+)
+
+CHANNELS = ("text", "html", "telegram")
+
+_TELEGRAM_SPECIAL = str.maketrans({c: '\\' + c for c in '_*[]`'})
+
+
+class Alert:
+    """Alerta compacta: plantilla + campos, sin mensaje preformateado"""
+
+    __slots__ = ("id", "template", "token", "confidence", "market_cap", "liquidity",
+                 "pnl", "priority", "is_read", "ts")
+
+    def __init__(self, id, template, token, confidence, market_cap, liquidity, pnl,
+                 priority="MEDIUM", is_read=False, ts=None):
+        self.id = id
+        self.template = template
+        self.token = sys.intern(token)
+        self.confidence = confidence
+        self.market_cap = market_cap
+        self.liquidity = liquidity
+        self.pnl = pnl
+        self.priority = sys.intern(priority)
+        self.is_read = is_read
+        self.ts = datetime.now().timestamp() if ts is None else ts
+
+    @property
+    def alert_type(self):
+        return TEMPLATES[self.template][0]
+
+    def to_record(self):
+        """Forma compacta para el diario y los snapshots"""
+        return {
+            "id": self.id, "tpl": self.template, "token": self.token,
+            "confidence": self.confidence, "market_cap": self.market_cap,
+            "liquidity": self.liquidity, "pnl": self.pnl,
+            "priority": self.priority, "is_read": self.is_read, "ts": self.ts
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Cargar desde el diario; acepta también alertas antiguas con `message`"""
+        if "tpl" in record:
+            return cls(record["id"], record["tpl"], record["token"], record["confidence"],
+                       record["market_cap"], record["liquidity"], record["pnl"],
+                       record.get("priority", "MEDIUM"), record.get("is_read", False), record["ts"])
+        fields = _parse_legacy_message(record.get("message", ""))
+        return cls(
+            record["id"], TEMPLATE_IDS.get(record.get("alert_type"), 1), record.get("token_symbol", ""),
+            fields.get("confidence"), fields.get("market_cap"), fields.get("liquidity"), fields.get("pnl"),
+            record.get("priority", "MEDIUM"), record.get("is_read", False),
+            datetime.fromisoformat(record["created_at"]).timestamp()
+        )
+
+    def to_dict(self, channel="text"):
+        """Representación para la API con el mensaje renderizado para `channel`"""
+        return {
+            "id": self.id,
+            "alert_type": self.alert_type,
+            "message": render(self, channel),
+            "token_symbol": self.token,
+            "is_read": self.is_read,
+            "priority": self.priority,
+            "created_at": datetime.fromtimestamp(self.ts).isoformat()
+        }
+
+
+def _parse_legacy_message(message):
+    fields = {}
+    for line in message.replace('\\n', '\n').split('\n')[1:]:
+        for _, label, field, _ in BODY_LINES:
+            if f"{label}:" in line:
+                value = line.split(':', 1)[1].strip().strip('$%').replace(',', '')
+                try:
+                    fields[field] = float(value)
+                except ValueError:
+                    pass
+    return fields
+
+
+def _body(alert):
+    for emoji, label, field, fmt in BODY_LINES:
+        value = getattr(alert, field)
+        if value is not None:
+            yield emoji, label, fmt.format(value)
+
+
+def render(alert, channel="text"):
+    """Renderizar el mensaje de una alerta para un canal"""
+    alert_type, emoji = TEMPLATES[alert.template]
+    title = f"{emoji} {alert_type.replace('_', ' ')}: "
+    if channel == "html":
+        lines = [f"<strong>{html.escape(title)}{html.escape(alert.token)}</strong>"]
+        lines += [f"{emoji} {label}: {html.escape(value)}" for emoji, label, value in _body(alert)]
+        return "<br>".join(lines)
+    if channel == "telegram":
+        lines = [f"*{title}{alert.token.translate(_TELEGRAM_SPECIAL)}*"]
+        lines += [f"{emoji} {label}: `{value}`" for emoji, label, value in _body(alert)]
+        return "\n".join(lines)
+    lines = [title + alert.token]
+    lines += [f"{emoji} {label}: {value}" for emoji, label, value in _body(alert)]
+    return "\n".join(lines)
@@ -0,0 +1,221 @@
+"""
+Analítica del historial de trades con tablas de rollup precalculadas.
+
+Por cada dimensión (token, red, día y tramo de confianza) se mantiene un
+acumulador por grupo que se actualiza en O(1) con cada trade insertado, de
+modo que una consulta cuesta O(grupos) y no O(trades). Al cerrarse un
+trade, `update` cambia su PnL de alta por el realizado. Para backfills
+(snapshot recuperado, importaciones) `rebuild` recalcula todas las tablas
+de forma vectorizada con numpy.
+
+Métricas por grupo: nº de trades, win rate, PnL total y medio, drawdown
+máximo de la curva de PnL acumulado del grupo (en $) y Sharpe por trade
+(media / desviación típica muestral del PnL, sin anualizar).
+"""
+
+import math
+import threading
+
+DIMENSIONS = ("token", "network", "day", "confidence")
+CONFIDENCE_BUCKET = 5
+
+
+def confidence_bucket(confidence):
+    if confidence is None:
+        return "n/a"
+    low = int(float(confidence) // CONFIDENCE_BUCKET * CONFIDENCE_BUCKET)
+    return f"{low}-{low + CONFIDENCE_BUCKET}"
+
+
+def trade_pnl(trade):
+    """PnL actual del trade (el realizado una vez cerrado); ver `TradeAnalytics.update`"""
+    return float(trade.get("pnl", 0) or 0)
+
+
+def group_keys(trade):
+    """Clave de grupo del trade en cada dimensión"""
+    return (
+        trade.get("token_symbol", "?"),
+        trade.get("network", "?"),
+        trade.get("created_at", "")[:10],
+        confidence_bucket(trade.get("confidence")),
+    )
+
+
+class Rollup:
+    """Acumulador incremental de un grupo"""
+
+    __slots__ = ('count', 'wins', 'pnl_sum', 'pnl_sq_sum', 'equity', 'peak', 'max_drawdown')
+
+    def __init__(self, count=0, wins=0, pnl_sum=0.0, pnl_sq_sum=0.0, equity=0.0, peak=0.0, max_drawdown=0.0):
+        self.count = count
+        self.wins = wins
+        self.pnl_sum = pnl_sum
+        self.pnl_sq_sum = pnl_sq_sum
+        self.equity = equity
+        self.peak = peak
+        self.max_drawdown = max_drawdown
+
+    def add(self, pnl):
+        self.count += 1
+        if pnl > 0:
+            self.wins += 1
+        self.pnl_sum += pnl
+        self.pnl_sq_sum += pnl * pnl
+        self.equity += pnl
+        if self.equity > self.peak:
+            self.peak = self.equity
+        drawdown = self.peak - self.equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def replace(self, old, new):
+        """
+        Sustituir el PnL de un trade ya contado (p. ej. al cerrarse). La curva
+        de equity avanza en ese momento; `rebuild` la recalcula en orden de alta.
+        """
+        if old > 0:
+            self.wins -= 1
+        if new > 0:
+            self.wins += 1
+        self.pnl_sum += new - old
+        self.pnl_sq_sum += new * new - old * old
+        self.equity += new - old
+        if self.equity > self.peak:
+            self.peak = self.equity
+        drawdown = self.peak - self.equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def sharpe(self):
+        if self.count < 2:
+            return None
+        mean = self.pnl_sum / self.count
+        variance = (self.pnl_sq_sum - self.count * mean * mean) / (self.count - 1)
+        if variance <= 1e-12:
+            return None
+        return mean / math.sqrt(variance)
+
+    def to_dict(self, key):
+        sharpe = self.sharpe()
+        return {
+            "key": key,
+            "trades": self.count,
+            "win_rate": round(self.wins / self.count * 100, 1) if self.count else 0.0,
+            "total_pnl": round(self.pnl_sum, 2),
+            "avg_pnl": round(self.pnl_sum / self.count, 2) if self.count else 0.0,
+            "max_drawdown": round(self.max_drawdown, 2),
+            "sharpe": round(sharpe, 3) if sharpe is not None else None
+        }
+
+
+class TradeAnalytics:
+    """Tablas de rollup por dimensión, actualizadas en cada inserción"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.tables = {dimension: {} for dimension in DIMENSIONS}
+        self.overall = Rollup()
+
+    def add(self, trade):
+        pnl = trade_pnl(trade)
+        with self._lock:
+            self.overall.add(pnl)
+            for dimension, key in zip(DIMENSIONS, group_keys(trade)):
+                table = self.tables[dimension]
+                rollup = table.get(key)
+                if rollup is None:
+                    rollup = table[key] = Rollup()
+                rollup.add(pnl)
+
+    def update(self, trade, old_pnl):
+        """Cambiar el PnL contado de un trade (`old_pnl`) por su PnL actual"""
+        new_pnl = trade_pnl(trade)
+        with self._lock:
+            self.overall.replace(old_pnl, new_pnl)
+            for dimension, key in zip(DIMENSIONS, group_keys(trade)):
+                rollup = self.tables[dimension].get(key)
+                if rollup is not None:
+                    rollup.replace(old_pnl, new_pnl)
+
+    def query(self, dimension=None):
+        """Filas por grupo de una dimensión (o de todas) más el total"""
+        dimensions = DIMENSIONS if dimension is None else (dimension,)
+        with self._lock:
+            result = {"overall": self.overall.to_dict("all")}
+            for name in dimensions:
+                rows = [rollup.to_dict(key) for key, rollup in self.tables[name].items()]
+                if name == "day":
+                    rows.sort(key=lambda row: row["key"])
+                else:
+                    rows.sort(key=lambda row: (-row["trades"], row["key"]))
+                result[name] = rows
+        return result
+
+    def rebuild(self, trades):
+        """Recalcular todas las tablas desde cero (vectorizado con numpy)"""
+        import numpy as np
+
+        trades = list(trades)
+        pnl = np.fromiter((trade_pnl(t) for t in trades), dtype=np.float64, count=len(trades))
+        confidence = np.fromiter(
+            (np.nan if t.get("confidence") is None else float(t["confidence"]) for t in trades),
+            dtype=np.float64, count=len(trades)
+        )
+        buckets = np.floor(confidence / CONFIDENCE_BUCKET)
+        bucket_ids, bucket_codes = np.unique(np.nan_to_num(buckets, nan=-1), return_inverse=True)
+        tables = {
+            "token": _rollups_by_group(np, *_factorize(np, [t.get("token_symbol", "?") for t in trades]), pnl),
+            "network": _rollups_by_group(np, *_factorize(np, [t.get("network", "?") for t in trades]), pnl),
+            "day": _rollups_by_group(np, *_factorize(np, [t.get("created_at", "")[:10] for t in trades]), pnl),
+            "confidence": _rollups_by_group(
+                np,
+                [confidence_bucket(None if b < 0 else b * CONFIDENCE_BUCKET) for b in bucket_ids.tolist()],
+                bucket_codes.reshape(-1),
+                pnl
+            ),
+        }
+        overall = _rollups_by_group(np, ["all"], np.zeros(len(trades), dtype=np.int64), pnl).get("all", Rollup())
+        with self._lock:
+            self.tables = tables
+            self.overall = overall
+        return len(trades)
+
+    def summary(self):
+        with self._lock:
+            return {"trades": self.overall.count, **{name: len(table) for name, table in self.tables.items()}}
+
+
+def _factorize(np, values):
+    """Claves únicas (en orden de aparición) y código entero de cada valor"""
+    codes = {}
+    inverse = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64, count=len(values))
+    return list(codes), inverse
+
+
+def _rollups_by_group(np, keys, inverse, pnl):
+    """Rollups de todos los grupos (`inverse` = código de grupo por trade) en una pasada vectorizada"""
+    if len(pnl) == 0:
+        return {}
+    groups = len(keys)
+    counts = np.bincount(inverse, minlength=groups)
+    wins = np.bincount(inverse, weights=pnl > 0, minlength=groups)
+    sums = np.bincount(inverse, weights=pnl, minlength=groups)
+    squares = np.bincount(inverse, weights=pnl * pnl, minlength=groups)
+
+    # Curva de PnL acumulado por grupo (orden de inserción dentro de cada grupo)
+    order = np.argsort(inverse, kind='stable')
+    sorted_pnl = pnl[order]
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    rollups = {}
+    for g in range(groups):
+        equity = np.cumsum(sorted_pnl[bounds[g]:bounds[g + 1]])
+        peaks = np.maximum(np.maximum.accumulate(equity), 0.0)
+        rollups[keys[g]] = Rollup(
+            int(counts[g]), int(wins[g]), float(sums[g]), float(squares[g]),
+            float(equity[-1]), float(peaks[-1]), float((peaks - equity).max())
+        )
+    return rollups
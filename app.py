@@ -1,25 +1,94 @@
 import os
 import sys
-from flask import Flask, send_from_directory, request, jsonify, render_template_string
+from flask import Flask, Response, send_from_directory, request, jsonify, render_template_string
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import json
+import math
 import random
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
+import itertools
+import threading
+
+from lazy_imports import lazy_import, warm_up, import_report, process_uptime_ms
+from log_pipeline import setup_logging
+from analytics import DIMENSIONS
+from alert_templates import Alert, CHANNELS, TEMPLATE_IDS
+from contract_risk import ContractRiskAnalyzer
+import export
+from journal import Journal
+from paper_trading import OrderBook, PaperBroker
+from request_guard import ControlGuard
+from response_cache import ResponseCache
+from state import AtomicFlag
+from strategies import DEFAULT_STRATEGY, StrategyRegistry, valid_strategy_name
+from vault import SECRET_FIELDS, SecretVault, is_masked, load_key, split_secrets
+from candles import CandleAggregator, write_bars
+from market_sim import TICK, SyntheticMarket
+from scanner import DEFAULT_NETWORKS, MultiChainScanner
+from supervisor import Stage, Supervisor
 
 # Configurar logging
-logging.basicConfig(level=logging.INFO)
+log_pipeline = setup_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
 
+# Proxies de confianza delante de la app (Railway: 1). ProxyFix toma la IP del
+# cliente del X-Forwarded-For añadido por el último de ellos, no del que envía el cliente
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 1 if os.environ.get('RAILWAY_ENVIRONMENT') else 0))
+if TRUSTED_PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS, x_proto=TRUSTED_PROXY_HOPS)
+
+# Subsistemas pesados: se importan en el primer uso o en el warm-up
+dashboard_page = lazy_import('dashboard')
+market_data = lazy_import('market_data')
+exit_engine = lazy_import('exit_engine')
+shards = lazy_import('shards')
+
+# Modo de arranque rápido: la recuperación del diario y el warm-up corren en
+# segundo plano y /health responde mientras tanto
+FAST_STARTUP = os.environ.get('FAST_STARTUP', '1') == '1'
+startup_ready = threading.Event()
+startup_info = {"ready_ms": None, "first_health_ms": None}
+_market_cache = None
+
+def get_market_cache():
+    """Caché de datos de mercado (abre numpy solo en el primer uso)"""
+    global _market_cache
+    if _market_cache is None:
+        _market_cache = market_data.MarketDataCache(os.environ.get('MARKET_DATA_DIR', 'data/market'))
+    return _market_cache
+
+_exit_engine_lock = threading.Lock()
+
+def get_exit_engine(strategy):
+    """Motor de salidas de una estrategia (abre numpy solo en el primer uso)"""
+    with _exit_engine_lock:
+        if strategy.exit_engine is None:
+            strategy.exit_engine = exit_engine.ExitEngine(**exit_settings(strategy.config))
+        return strategy.exit_engine
+
+def exit_settings(config):
+    return {
+        "stop_loss_pct": float(config["stop_loss_pct"]),
+        "take_profit_pcts": (
+            float(config["take_profit_1_pct"]),
+            float(config["take_profit_2_pct"]),
+            float(config["take_profit_3_pct"])
+        ),
+        "trailing_stop_pct": float(config["trailing_stop_pct"]),
+        "max_hold_seconds": float(config["max_hold_minutes"]) * 60
+    }
+
 # Configuración
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'crypto-bot-secret-2024')
 
-# Variables globales para configuración del bot
-bot_config = {
+# Configuración por defecto de cada estrategia
+DEFAULT_CONFIG = {
     "bot_enabled": True,
     "max_daily_trades": 4,
     "max_position_size": 300.0,
@@ -28,852 +97,748 @@ bot_config = {
     "take_profit_1_pct": 100.0,
     "take_profit_2_pct": 200.0,
     "take_profit_3_pct": 400.0,
+    "trailing_stop_pct": 15.0,
+    "max_hold_minutes": 240,
     "min_confidence": 85.0,
     "min_market_cap": 25000.0,
     "max_market_cap": 300000.0,
     "min_liquidity": 75000.0,
-    "binance_api_key": os.environ.get('BINANCE_API_KEY', 'demo_key_12345'),
-    "binance_api_secret": os.environ.get('BINANCE_API_SECRET', 'demo_secret_67890'),
-    "telegram_bot_token": os.environ.get('TELEGRAM_BOT_TOKEN', '1234567890:ABCDEFghijklmnopqrstuvwxyz123456789'),
+    "max_risk_score": 60.0,
+    "token_cooldown_minutes": 60,
+    "paper_trading": True,
+    "trading_fee_pct": 0.25,
+    "max_slippage_pct": 5.0,
     "telegram_chat_id": os.environ.get('TELEGRAM_CHAT_ID', '622075030')
 }
 
+# Claves del filtro de gemas (passes_filters): al cambiarlas se olvidan los rechazos
+FILTER_KEYS = ("min_confidence", "min_market_cap", "max_market_cap", "min_liquidity", "max_risk_score")
+
+def coerce_config(changes):
+    """
+    Convertir los valores al tipo de DEFAULT_CONFIG antes de registrarlos en
+    el diario. Lanza ValueError con el campo inválido (números negativos,
+    no finitos o no enteros donde se espera un entero).
+    """
+    coerced = {}
+    for key, value in changes.items():
+        default = DEFAULT_CONFIG.get(key)
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"'{key}' debe ser true o false")
+        elif isinstance(default, (int, float)):
+            try:
+                if isinstance(value, bool):
+                    raise ValueError
+                number = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{key}' debe ser numérico") from None
+            if not math.isfinite(number) or number < 0:
+                raise ValueError(f"'{key}' debe ser un número finito no negativo")
+            if isinstance(default, int):
+                if not number.is_integer():
+                    raise ValueError(f"'{key}' debe ser entero")
+                value = int(number)
+            else:
+                value = number
+        elif isinstance(default, str):
+            value = str(value)
+        coerced[key] = value
+    return coerced
+
+# Credenciales: viven cifradas en el vault, nunca en la configuración ni en el diario
+DEMO_SECRETS = {
+    "binance_api_key": 'demo_key_12345',
+    "binance_api_secret": 'demo_secret_67890',
+    "telegram_bot_token": '1234567890:ABCDEFghijklmnopqrstuvwxyz123456789'
+}
+SECRET_ENV = {
+    "binance_api_key": 'BINANCE_API_KEY',
+    "binance_api_secret": 'BINANCE_API_SECRET',
+    "telegram_bot_token": 'TELEGRAM_BOT_TOKEN'
+}
+
+# Estrategias: la de por defecto más las creadas con POST /api/strategies.
+# Cada una tiene configuración, trades, alertas, control de riesgo e índice
+# de tokens propios; los nombres globales apuntan a la de por defecto.
+strategies = StrategyRegistry(DEFAULT_CONFIG)
+default_strategy = strategies.default
+
 # Estado del bot
-bot_running = False
-trades_list = []
-alerts_list = []
-performance_data = []
-
-def generate_demo_trade():
-    """Generar trade de demostración realista"""
-    tokens = ['PEPE', 'SHIB', 'FLOKI', 'CHAD', 'WOJAK', 'BONK', 'MEME', 'DOGE2', 'BABYDOGE', 'SAFEMOON']
-    token = random.choice(tokens)
+bot_running = AtomicFlag()
+bot_config = default_strategy.config
+trades_list = default_strategy.trades
+alert_store = default_strategy.alerts
+trade_ids = itertools.count(1)
+alert_ids = itertools.count(1)
+
+# Diario de eventos persistente (trades, alertas y configuración)
+journal = Journal(
+    os.environ.get('JOURNAL_DIR', 'data'),
+    snapshot_every=int(os.environ.get('JOURNAL_SNAPSHOT_EVERY', 1000))
+)
+
+vault = SecretVault(
+    os.path.join(journal.directory, 'vault.json'),
+    load_key(os.path.join(journal.directory, 'vault.key')),
+    ttl=float(os.environ.get('VAULT_CACHE_TTL', 300))
+)
+# Secretos en claro de diarios anteriores al vault (se migran al recuperar)
+legacy_secrets = {}
+
+def new_state():
+    """Registro vacío con la misma forma que el estado global"""
+    return StrategyRegistry(DEFAULT_CONFIG)
+
+def apply_event(state, event_type, data):
+    """Aplicar un evento del diario a un registro de estrategias"""
+    if event_type == "strategy_created":
+        state.create(data["name"], split_secrets(data["config"])[0])
+        return
+    strategy = state.get(data.get("strategy"))
+    if strategy is None:
+        return
+    if event_type == "trade":
+        if data["status"] == "ACTIVE":
+            # Campos de salida presentes desde el alta
+            data.setdefault("initial_quantity", data["quantity"])
+            data.setdefault("realized_pnl", 0.0)
+            data.setdefault("exit_reason", None)
+            strategy.open_positions[data["id"]] = data
+        strategy.trades.append(data)
+        strategy.analytics.add(data)
+        strategy.performance.append({
+            "timestamp": data["created_at"],
+            "pnl": data["pnl"],
+            "confidence": data.get("confidence"),
+            "market_cap": data.get("market_cap")
+        })
+    elif event_type == "alert":
+        strategy.alerts.add(Alert.from_record(data))
+    elif event_type == "alert_ack":
+        if data.get("all"):
+            strategy.alerts.mark_all_read(data.get("priority"))
+        else:
+            strategy.alerts.mark_read(data.get("ids", []))
+    elif event_type == "config":
+        changes, secrets = split_secrets(data)
+        if secrets and state is strategies:
+            legacy_secrets.update(secrets)
+        strategy.config.update({key: value for key, value in changes.items() if key != "strategy"})
+    elif event_type == "trade_exit":
+        trade = strategy.open_positions.get(data["trade_id"])
+        if trade is None:
+            return
+        trade["quantity"] = data["remaining"]
+        trade["realized_pnl"] = round(trade["realized_pnl"] + data["pnl"], 2)
+        trade["exit_reason"] = data["reason"]
+        trade["fees"] = round(trade.get("fees", 0.0) + data.get("fees", 0.0), 4)
+        trade["updated_at"] = data["at"]
+        if data["closed"]:
+            opened_pnl = float(trade["pnl"] or 0)
+            trade["pnl"] = trade["realized_pnl"]
+            strategy.analytics.update(trade, opened_pnl)
+            trade["status"] = "STOPPED" if data["reason"] == "stop_loss" else "COMPLETED"
+            del strategy.open_positions[data["trade_id"]]
+
+# Caché de respuestas de lectura; cada tipo de evento invalida sus etiquetas
+response_cache = ResponseCache(max_entries=int(os.environ.get('RESPONSE_CACHE_SIZE', 512)))
+EVENT_TAGS = {
+    "trade": ("trades",),
+    "alert": ("alerts",),
+    "alert_ack": ("alerts",),
+    "config": ("config",),
+    "trade_exit": ("trades",),
+    "strategy_created": ("config", "trades", "alerts"),
+}
+
+def record_event(event_type, data):
+    """Aplicar un evento al estado en memoria y persistirlo en el diario"""
+    journal.append(event_type, data, apply=lambda t, d, ts: apply_event(strategies, t, d))
+    response_cache.invalidate(*EVENT_TAGS[event_type])
+
+def snapshot_state():
+    return {"strategies": {strategy.name: strategy.snapshot() for strategy in strategies}}
+
+def load_state(state):
+    if "strategies" not in state:
+        # Snapshot anterior a las estrategias: todo pertenece a la de por defecto
+        state = {"strategies": {DEFAULT_STRATEGY: state}}
+    for name, strategy_state in state["strategies"].items():
+        config, secrets = split_secrets(strategy_state["config"])
+        legacy_secrets.update(secrets)
+        strategy = strategies.create(name, {**DEFAULT_CONFIG, **config})
+        strategy.load({**strategy_state, "config": config}, Alert.from_record)
+
+DEMO_TOKENS = ['PEPE', 'SHIB', 'FLOKI', 'CHAD', 'WOJAK', 'BONK', 'MEME', 'DOGE2', 'BABYDOGE', 'SAFEMOON']
+
+def generate_demo_trade(candidate=None, strategy=None):
+    """Generar trade de demostración realista (a partir de un candidato del escáner si se indica)"""
+    strategy = strategy or default_strategy
+    token_index = strategy.token_index
+    risk_gate = strategy.risk_gate
+    if candidate is None:
+        candidates = [t for t in DEMO_TOKENS if not token_index.should_skip(t)]
+        if not candidates:
+            logger.info("⏳ Todos los tokens están en cooldown, no se genera trade")
+            return None
+        candidate = {
+            "symbol": random.choice(candidates),
+            "network": "BSC",
+            "confidence": round(random.uniform(85, 98), 1),
+            "market_cap": round(random.uniform(25000, 300000), 0),
+            "liquidity": round(random.uniform(75000, 500000), 0)
+        }
+    config = strategy.config.snapshot()
+    token = candidate["symbol"]
+    token_key = candidate.get("address", token)
+    
+    trade_id = next(trade_ids)
+    position_size = float(config['max_position_size'])
+    rejection = risk_gate.try_reserve(trade_id, position_size)
+    if rejection:
+        logger.info("🛡️ Trade bloqueado por control de riesgo: %s (%s)", token, rejection,
+                    extra={"strategy": strategy.name, "token": token})
+        return None
     
     # Generar datos más realistas
-    confidence = round(random.uniform(85, 98), 1)
-    market_cap = round(random.uniform(25000, 300000), 0)
-    liquidity = round(random.uniform(75000, 500000), 0)
-    entry_price = round(random.uniform(0.000001, 0.01), 8)
-    quantity = round(bot_config['max_position_size'] / entry_price, 0)
+    confidence = candidate["confidence"]
+    market_cap = candidate["market_cap"]
+    liquidity = candidate["liquidity"]
+    mid_price = candidate.get("price") or random.uniform(0.000001, 0.01)
+    execution = {}
     
-    # PnL basado en confianza (mayor confianza = mejor resultado promedio)
-    pnl_multiplier = (confidence - 80) / 20  # 0.25 a 0.9
-    base_pnl = random.uniform(-100, 500)
-    pnl = round(base_pnl * pnl_multiplier, 2)
+    if config.get("paper_trading", True):
+        # Paper trading: compra contra un libro simulado con slippage y comisión;
+        # la venta la hace el motor de salidas (process_exits)
+        broker = PaperBroker(config.get("trading_fee_pct", 0.25), config.get("max_slippage_pct", 5.0))
+        entry = broker.market_buy(OrderBook.simulate(mid_price, liquidity), position_size)
+        if entry.quantity <= 0:
+            risk_gate.release(trade_id)
+            logger.info("💧 Sin liquidez suficiente para %s, orden no ejecutada", token,
+                        extra={"strategy": strategy.name, "token": token})
+            return None
+        if entry.partial:
+            position_size = round(entry.notional + entry.fee, 2)
+            risk_gate.adjust(trade_id, position_size)
+        entry_price = round(entry.avg_price, 10)
+        quantity = round(entry.quantity, 0)
+        pnl = -round(entry.fee, 2)
+        execution = {
+            "fees": round(entry.fee, 4),
+            "slippage_pct": round(entry.slippage_pct, 3),
+            "partial_fill": entry.partial
+        }
+    else:
+        entry_price = round(mid_price, 8)
+        quantity = round(position_size / entry_price, 0)
+        fee = quantity * entry_price * float(config.get("trading_fee_pct", 0.25)) / 100
+        pnl = -round(fee, 2)
+        execution = {"fees": round(fee, 4)}
     
     trade = {
-        "id": len(trades_list) + 1,
+        "id": trade_id,
+        "strategy": strategy.name,
         "token_symbol": token,
-        "network": "BSC",
+        "network": candidate["network"],
         "trade_type": "BUY",
         "entry_price": entry_price,
         "quantity": quantity,
+        "position_size": position_size,
         "pnl": pnl,
-        "status": random.choice(["ACTIVE", "COMPLETED", "STOPPED"]),
+        "status": "ACTIVE",
         "confidence": confidence,
         "market_cap": market_cap,
         "liquidity": liquidity,
+        "risk_score": candidate.get("risk_score"),
+        **execution,
         "created_at": datetime.now().isoformat(),
         "updated_at": datetime.now().isoformat()
     }
     
-    trades_list.append(trade)
-    
-    # Generar alerta correspondiente
-    alert_type = "GEM_DETECTED" if pnl >= 0 else "RISK_WARNING"
-    emoji = "🚀" if pnl >= 0 else "⚠️"
+    # Toda posición nace abierta (PnL = comisión de entrada); la cierra el motor de salidas
+    record_event("trade", trade)
+    get_exit_engine(strategy).open(trade_id, entry_price, quantity)
+    token_index.mark_bought(token_key, float(config.get("token_cooldown_minutes", 60)) * 60)
     
-    alert = {
-        "id": len(alerts_list) + 1,
-        "alert_type": alert_type,
-        "message": f"{emoji} {alert_type.replace('_', ' ')}: {token}\\n💎 Confianza: {confidence}%\\n💰 Market Cap: ${market_cap:,.0f}\\n💧 Liquidez: ${liquidity:,.0f}\\n📊 PnL: ${pnl:.2f}",
-        "token_symbol": token,
-        "is_read": False,
-        "priority": "HIGH" if confidence > 90 else "MEDIUM",
-        "created_at": datetime.now().isoformat()
-    }
+    # Generar alerta correspondiente (plantilla + campos, se renderiza por canal)
+    alert = Alert(
+        next(alert_ids),
+        TEMPLATE_IDS["RISK_WARNING" if execution.get("partial_fill") else "GEM_DETECTED"],
+        token,
+        confidence,
+        market_cap,
+        liquidity,
+        pnl,
+        priority="HIGH" if confidence > 90 else "MEDIUM"
+    )
     
-    alerts_list.append(alert)
-    
-    # Actualizar datos de performance
-    performance_data.append({
-        "timestamp": datetime.now().isoformat(),
-        "pnl": pnl,
-        "confidence": confidence,
-        "market_cap": market_cap
-    })
+    record_event("alert", strategy.scoped(alert.to_record()))
     
-    logger.info(f"💎 Gema generada: {token} (Confianza: {confidence}%, PnL: ${pnl:.2f})")
+    logger.info("💎 Gema generada [%s]: %s (Confianza: %s%%, PnL: $%.2f)", strategy.name, token, confidence, pnl,
+                extra={"strategy": strategy.name, "token": token, "trade_id": trade_id})
     return trade
 
-# HTML del dashboard embebido
-DASHBOARD_HTML = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Crypto Gem Bot - Professional Dashboard</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://unpkg.com/lucide@latest/dist/umd/lucide.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        .gradient-bg { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
-        .card-hover { transition: all 0.3s ease; }
-        .card-hover:hover { transform: translateY(-2px); box-shadow: 0 10px 25px rgba(0,0,0,0.1); }
-        .status-indicator { width: 8px; height: 8px; border-radius: 50%; display: inline-block; margin-right: 8px; }
-        .status-online { background-color: #10b981; }
-        .status-offline { background-color: #ef4444; }
-        .status-warning { background-color: #f59e0b; }
-        .notification { position: fixed; top: 20px; right: 20px; z-index: 1000; padding: 16px; border-radius: 8px; color: white; font-weight: bold; }
-        .notification.success { background-color: #10b981; }
-        .notification.error { background-color: #ef4444; }
-        .notification.info { background-color: #3b82f6; }
-    </style>
-</head>
-<body class="bg-gray-50 min-h-screen">
-    <!-- Header -->
-    <header class="gradient-bg text-white shadow-lg">
-        <div class="container mx-auto px-6 py-4">
-            <div class="flex items-center justify-between">
-                <div class="flex items-center space-x-4">
-                    <div class="w-10 h-10 bg-white bg-opacity-20 rounded-lg flex items-center justify-center">
-                        <i data-lucide="gem" class="w-6 h-6"></i>
-                    </div>
-                    <div>
-                        <h1 class="text-2xl font-bold">Crypto Gem Bot</h1>
-                        <p class="text-blue-100">Professional Trading Dashboard</p>
-                    </div>
-                </div>
-                <div class="flex items-center space-x-4">
-                    <div id="bot-status" class="flex items-center">
-                        <span class="status-indicator status-offline"></span>
-                        <span id="status-text">Desconectado</span>
-                    </div>
-                    <button id="emergency-stop" class="bg-red-500 hover:bg-red-600 px-4 py-2 rounded-lg font-semibold transition-colors">
-                        Stop Emergencia
-                    </button>
-                </div>
-            </div>
-        </div>
-    </header>
-
-    <!-- Main Content -->
-    <div class="container mx-auto px-6 py-8">
-        <!-- Control Panel -->
-        <div class="grid grid-cols-1 lg:grid-cols-4 gap-6 mb-8">
-            <!-- Bot Control -->
-            <div class="bg-white rounded-xl shadow-lg p-6 card-hover">
-                <h3 class="text-lg font-semibold mb-4 flex items-center">
-                    <i data-lucide="play-circle" class="w-5 h-5 mr-2"></i>
-                    Control del Bot
-                </h3>
-                <div class="space-y-3">
-                    <button id="start-bot" class="w-full bg-green-500 hover:bg-green-600 text-white py-2 px-4 rounded-lg font-semibold transition-colors">
-                        <i data-lucide="play" class="w-4 h-4 inline mr-2"></i>
-                        Iniciar Bot
-                    </button>
-                    <button id="stop-bot" class="w-full bg-red-500 hover:bg-red-600 text-white py-2 px-4 rounded-lg font-semibold transition-colors">
-                        <i data-lucide="square" class="w-4 h-4 inline mr-2"></i>
-                        Detener Bot
-                    </button>
-                </div>
-            </div>
-
-            <!-- Statistics -->
-            <div class="bg-white rounded-xl shadow-lg p-6 card-hover">
-                <h3 class="text-lg font-semibold mb-4 flex items-center">
-                    <i data-lucide="trending-up" class="w-5 h-5 mr-2"></i>
-                    Estadísticas Hoy
-                </h3>
-                <div class="space-y-2">
-                    <div class="flex justify-between">
-                        <span>Trades:</span>
-                        <span id="daily-trades" class="font-bold">0</span>
-                    </div>
-                    <div class="flex justify-between">
-                        <span>PnL:</span>
-                        <span id="daily-pnl" class="font-bold">$0.00</span>
-                    </div>
-                    <div class="flex justify-between">
-                        <span>Win Rate:</span>
-                        <span id="win-rate" class="font-bold">0%</span>
-                    </div>
-                </div>
-            </div>
-
-            <!-- Active Positions -->
-            <div class="bg-white rounded-xl shadow-lg p-6 card-hover">
-                <h3 class="text-lg font-semibold mb-4 flex items-center">
-                    <i data-lucide="activity" class="w-5 h-5 mr-2"></i>
-                    Posiciones Activas
-                </h3>
-                <div class="text-center">
-                    <div id="active-positions" class="text-3xl font-bold text-blue-600">0</div>
-                    <p class="text-gray-500 text-sm">posiciones abiertas</p>
-                </div>
-            </div>
-
-            <!-- Capital -->
-            <div class="bg-white rounded-xl shadow-lg p-6 card-hover">
-                <h3 class="text-lg font-semibold mb-4 flex items-center">
-                    <i data-lucide="dollar-sign" class="w-5 h-5 mr-2"></i>
-                    Capital
-                </h3>
-                <div class="space-y-2">
-                    <div class="flex justify-between">
-                        <span>Total:</span>
-                        <span id="total-capital" class="font-bold">$0.00</span>
-                    </div>
-                    <div class="flex justify-between">
-                        <span>Disponible:</span>
-                        <span id="available-capital" class="font-bold">$0.00</span>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Navigation Tabs -->
-        <div class="bg-white rounded-xl shadow-lg mb-6">
-            <div class="border-b border-gray-200">
-                <nav class="flex space-x-8 px-6">
-                    <button class="tab-button py-4 px-2 border-b-2 border-blue-500 text-blue-600 font-medium" data-tab="overview">
-                        <i data-lucide="home" class="w-4 h-4 inline mr-2"></i>
-                        Resumen
-                    </button>
-                    <button class="tab-button py-4 px-2 border-b-2 border-transparent text-gray-500 hover:text-gray-700" data-tab="trades">
-                        <i data-lucide="bar-chart-3" class="w-4 h-4 inline mr-2"></i>
-                        Trades
-                    </button>
-                    <button class="tab-button py-4 px-2 border-b-2 border-transparent text-gray-500 hover:text-gray-700" data-tab="alerts">
-                        <i data-lucide="bell" class="w-4 h-4 inline mr-2"></i>
-                        Alertas
-                    </button>
-                    <button class="tab-button py-4 px-2 border-b-2 border-transparent text-gray-500 hover:text-gray-700" data-tab="config">
-                        <i data-lucide="settings" class="w-4 h-4 inline mr-2"></i>
-                        Configuración
-                    </button>
-                </nav>
-            </div>
-
-            <!-- Tab Content -->
-            <div class="p-6">
-                <!-- Overview Tab -->
-                <div id="overview-tab" class="tab-content">
-                    <div class="grid grid-cols-1 lg:grid-cols-2 gap-6">
-                        <div>
-                            <h4 class="text-lg font-semibold mb-4">Performance (30 días)</h4>
-                            <canvas id="performance-chart" width="400" height="200"></canvas>
-                        </div>
-                        <div>
-                            <h4 class="text-lg font-semibold mb-4">Trades Recientes</h4>
-                            <div id="recent-trades" class="space-y-2">
-                                <!-- Trades will be loaded here -->
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="mt-6">
-                        <h4 class="text-lg font-semibold mb-4">Estado de Conexiones</h4>
-                        <div class="grid grid-cols-1 md:grid-cols-3 gap-4">
-                            <div class="flex items-center justify-between p-4 bg-gray-50 rounded-lg">
-                                <span class="flex items-center">
-                                    <i data-lucide="link" class="w-4 h-4 mr-2"></i>
-                                    Binance
-                                </span>
-                                <span id="binance-status" class="status-indicator status-offline"></span>
-                            </div>
-                            <div class="flex items-center justify-between p-4 bg-gray-50 rounded-lg">
-                                <span class="flex items-center">
-                                    <i data-lucide="message-circle" class="w-4 h-4 mr-2"></i>
-                                    Telegram
-                                </span>
-                                <span id="telegram-status" class="status-indicator status-offline"></span>
-                            </div>
-                            <div class="flex items-center justify-between p-4 bg-gray-50 rounded-lg">
-                                <span class="flex items-center">
-                                    <i data-lucide="cpu" class="w-4 h-4 mr-2"></i>
-                                    Agente
-                                </span>
-                                <span id="agent-status" class="status-indicator status-online"></span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-
-                <!-- Trades Tab -->
-                <div id="trades-tab" class="tab-content hidden">
-                    <div class="flex justify-between items-center mb-4">
-                        <h4 class="text-lg font-semibold">Historial de Trades</h4>
-                        <button id="refresh-trades" class="bg-blue-500 hover:bg-blue-600 text-white px-4 py-2 rounded-lg">
-                            <i data-lucide="refresh-cw" class="w-4 h-4 inline mr-2"></i>
-                            Actualizar
-                        </button>
-                    </div>
-                    <div class="overflow-x-auto">
-                        <table class="min-w-full bg-white">
-                            <thead class="bg-gray-50">
-                                <tr>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Token</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Red</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Tipo</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Precio</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Cantidad</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">PnL</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Estado</th>
-                                    <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Fecha</th>
-                                </tr>
-                            </thead>
-                            <tbody id="trades-table" class="bg-white divide-y divide-gray-200">
-                                <!-- Trades will be loaded here -->
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-
-                <!-- Alerts Tab -->
-                <div id="alerts-tab" class="tab-content hidden">
-                    <div class="flex justify-between items-center mb-4">
-                        <h4 class="text-lg font-semibold">Alertas del Agente</h4>
-                        <button id="refresh-alerts" class="bg-blue-500 hover:bg-blue-600 text-white px-4 py-2 rounded-lg">
-                            <i data-lucide="refresh-cw" class="w-4 h-4 inline mr-2"></i>
-                            Actualizar
-                        </button>
-                    </div>
-                    <div id="alerts-container" class="space-y-4">
-                        <!-- Alerts will be loaded here -->
-                    </div>
-                </div>
-
-                <!-- Configuration Tab -->
-                <div id="config-tab" class="tab-content hidden">
-                    <form id="config-form" class="space-y-6">
-                        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
-                            <!-- Bot Configuration -->
-                            <div>
-                                <h4 class="text-lg font-semibold mb-4">Configuración del Bot</h4>
-                                <div class="space-y-4">
-                                    <div>
-                                        <label class="flex items-center">
-                                            <input type="checkbox" id="bot_enabled" name="bot_enabled" class="mr-2">
-                                            Bot Habilitado
-                                        </label>
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Trades Diarios Máximos</label>
-                                        <input type="number" name="max_daily_trades" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Tamaño Máximo Posición ($)</label>
-                                        <input type="number" name="max_position_size" step="0.01" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Capital Total ($)</label>
-                                        <input type="number" name="total_capital" step="0.01" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                </div>
-                            </div>
-
-                            <!-- Risk Management -->
-                            <div>
-                                <h4 class="text-lg font-semibold mb-4">Gestión de Riesgo</h4>
-                                <div class="space-y-4">
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Stop Loss (%)</label>
-                                        <input type="number" name="stop_loss_pct" step="0.1" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Take Profit 1 (%)</label>
-                                        <input type="number" name="take_profit_1_pct" step="0.1" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Take Profit 2 (%)</label>
-                                        <input type="number" name="take_profit_2_pct" step="0.1" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Take Profit 3 (%)</label>
-                                        <input type="number" name="take_profit_3_pct" step="0.1" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-
-                        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
-                            <!-- Token Filters -->
-                            <div>
-                                <h4 class="text-lg font-semibold mb-4">Filtros de Tokens</h4>
-                                <div class="space-y-4">
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Confianza Mínima (%)</label>
-                                        <input type="number" name="min_confidence" step="0.1" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Market Cap Mínimo ($)</label>
-                                        <input type="number" name="min_market_cap" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Market Cap Máximo ($)</label>
-                                        <input type="number" name="max_market_cap" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Liquidez Mínima ($)</label>
-                                        <input type="number" name="min_liquidity" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                </div>
-                            </div>
-
-                            <!-- API Configuration -->
-                            <div>
-                                <h4 class="text-lg font-semibold mb-4">Configuración de APIs</h4>
-                                <div class="space-y-4">
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Binance API Key</label>
-                                        <input type="text" name="binance_api_key" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Binance API Secret</label>
-                                        <input type="password" name="binance_api_secret" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Telegram Bot Token</label>
-                                        <input type="text" name="telegram_bot_token" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                    <div>
-                                        <label class="block text-sm font-medium text-gray-700">Telegram Chat ID</label>
-                                        <input type="text" name="telegram_chat_id" class="mt-1 block w-full border-gray-300 rounded-md shadow-sm">
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-
-                        <div class="flex space-x-4">
-                            <button type="submit" class="bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded-lg font-semibold">
-                                <i data-lucide="save" class="w-4 h-4 inline mr-2"></i>
-                                Guardar Configuración
-                            </button>
-                            <button type="button" id="test-connections" class="bg-green-500 hover:bg-green-600 text-white px-6 py-2 rounded-lg font-semibold">
-                                <i data-lucide="wifi" class="w-4 h-4 inline mr-2"></i>
-                                Probar Conexiones
-                            </button>
-                        </div>
-                    </form>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // Initialize Lucide icons
-        lucide.createIcons();
-
-        // API base URL
-        const API_BASE = '/api';
-
-        // Global state
-        let currentTab = 'overview';
-        let performanceChart = null;
-
-        // Initialize dashboard
-        document.addEventListener('DOMContentLoaded', function() {
-            initializeTabs();
-            loadDashboardData();
-            setupEventListeners();
-            
-            // Auto-refresh every 30 seconds
-            setInterval(loadDashboardData, 30000);
-        });
-
-        function initializeTabs() {
-            const tabButtons = document.querySelectorAll('.tab-button');
-            const tabContents = document.querySelectorAll('.tab-content');
-
-            tabButtons.forEach(button => {
-                button.addEventListener('click', () => {
-                    const tabName = button.getAttribute('data-tab');
-                    
-                    // Update button states
-                    tabButtons.forEach(btn => {
-                        btn.classList.remove('border-blue-500', 'text-blue-600');
-                        btn.classList.add('border-transparent', 'text-gray-500');
-                    });
-                    button.classList.remove('border-transparent', 'text-gray-500');
-                    button.classList.add('border-blue-500', 'text-blue-600');
-
-                    // Update content visibility
-                    tabContents.forEach(content => {
-                        content.classList.add('hidden');
-                    });
-                    document.getElementById(tabName + '-tab').classList.remove('hidden');
-
-                    currentTab = tabName;
-                    
-                    // Load tab-specific data
-                    if (tabName === 'trades') loadTrades();
-                    if (tabName === 'alerts') loadAlerts();
-                    if (tabName === 'config') loadConfiguration();
-                });
-            });
-        }
-
-        function setupEventListeners() {
-            // Bot control buttons
-            document.getElementById('start-bot').addEventListener('click', startBot);
-            document.getElementById('stop-bot').addEventListener('click', stopBot);
-            document.getElementById('emergency-stop').addEventListener('click', emergencyStop);
-            
-            // Refresh buttons
-            document.getElementById('refresh-trades').addEventListener('click', loadTrades);
-            document.getElementById('refresh-alerts').addEventListener('click', loadAlerts);
-            
-            // Configuration form
-            document.getElementById('config-form').addEventListener('submit', saveConfiguration);
-            document.getElementById('test-connections').addEventListener('click', testConnections);
-        }
-
-        async function loadDashboardData() {
-            try {
-                await Promise.all([
-                    loadBotStatus(),
-                    loadStatistics(),
-                    currentTab === 'overview' && loadPerformanceChart(),
-                    currentTab === 'trades' && loadTrades(),
-                    currentTab === 'alerts' && loadAlerts()
-                ]);
-            } catch (error) {
-                console.error('Error loading dashboard data:', error);
-            }
-        }
-
-        async function loadBotStatus() {
-            try {
-                const response = await fetch(`${API_BASE}/status`);
-                const data = await response.json();
-
-                if (response.ok) {
-                    const statusElement = document.getElementById('bot-status');
-                    const statusText = document.getElementById('status-text');
-                    const indicator = statusElement.querySelector('.status-indicator');
-
-                    if (data.bot_running) {
-                        indicator.className = 'status-indicator status-online';
-                        statusText.textContent = 'Funcionando';
-                    } else {
-                        indicator.className = 'status-indicator status-offline';
-                        statusText.textContent = 'Detenido';
-                    }
-
-                    // Update statistics
-                    document.getElementById('daily-trades').textContent = data.daily_trades || 0;
-                    document.getElementById('active-positions').textContent = data.active_positions || 0;
-                    document.getElementById('total-capital').textContent = `$${(data.total_capital || 0).toFixed(2)}`;
-                    document.getElementById('available-capital').textContent = `$${(data.available_capital || 0).toFixed(2)}`;
-                }
-            } catch (error) {
-                console.error('Error loading bot status:', error);
-            }
-        }
-
-        async function loadStatistics() {
-            try {
-                const response = await fetch(`${API_BASE}/statistics`);
-                const data = await response.json();
-
-                if (response.ok) {
-                    document.getElementById('daily-pnl').textContent = `$${(data.daily_pnl || 0).toFixed(2)}`;
-                    document.getElementById('win-rate').textContent = `${(data.win_rate || 0).toFixed(1)}%`;
-                    
-                    // Update PnL color
-                    const pnlElement = document.getElementById('daily-pnl');
-                    if (data.daily_pnl > 0) {
-                        pnlElement.className = 'font-bold text-green-600';
-                    } else if (data.daily_pnl < 0) {
-                        pnlElement.className = 'font-bold text-red-600';
-                    } else {
-                        pnlElement.className = 'font-bold';
-                    }
-                }
-            } catch (error) {
-                console.error('Error loading statistics:', error);
-            }
-        }
-
-        async function loadTrades() {
-            try {
-                const response = await fetch(`${API_BASE}/trades?per_page=50`);
-                const data = await response.json();
-
-                if (response.ok) {
-                    const tbody = document.getElementById('trades-table');
-                    tbody.innerHTML = '';
-
-                    data.forEach(trade => {
-                        const row = document.createElement('tr');
-                        row.innerHTML = `
-                            <td class="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${trade.token_symbol}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${trade.network}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${trade.trade_type}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">$${trade.entry_price.toFixed(8)}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${trade.quantity.toLocaleString()}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm ${trade.pnl >= 0 ? 'text-green-600' : 'text-red-600'}">$${trade.pnl.toFixed(2)}</td>
-                            <td class="px-6 py-4 whitespace-nowrap">
-                                <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${getStatusColor(trade.status)}">
-                                    ${trade.status}
-                                </span>
-                            </td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${new Date(trade.created_at).toLocaleString()}</td>
-                        `;
-                        tbody.appendChild(row);
-                    });
-                }
-            } catch (error) {
-                console.error('Error loading trades:', error);
-            }
-        }
-
-        async function loadAlerts() {
-            try {
-                const response = await fetch(`${API_BASE}/alerts?per_page=20`);
-                const data = await response.json();
-
-                if (response.ok) {
-                    const container = document.getElementById('alerts-container');
-                    container.innerHTML = '';
-
-                    data.forEach(alert => {
-                        const alertDiv = document.createElement('div');
-                        alertDiv.className = `p-4 rounded-lg border-l-4 ${getAlertColor(alert.alert_type)}`;
-                        alertDiv.innerHTML = `
-                            <div class="flex justify-between items-start">
-                                <div>
-                                    <h5 class="font-semibold">${alert.alert_type.replace('_', ' ')}</h5>
-                                    <p class="text-sm text-gray-600 mt-1">${alert.message.replace(/\\n/g, '<br>')}</p>
-                                    <p class="text-xs text-gray-400 mt-2">${new Date(alert.created_at).toLocaleString()}</p>
-                                </div>
-                                <span class="px-2 py-1 text-xs font-semibold rounded ${getPriorityColor(alert.priority)}">
-                                    ${alert.priority}
-                                </span>
-                            </div>
-                        `;
-                        container.appendChild(alertDiv);
-                    });
-                }
-            } catch (error) {
-                console.error('Error loading alerts:', error);
-            }
-        }
-
-        async function loadConfiguration() {
-            try {
-                const response = await fetch(`${API_BASE}/config`);
-                const data = await response.json();
-
-                if (response.ok) {
-                    const form = document.getElementById('config-form');
-                    Object.keys(data).forEach(key => {
-                        const input = form.querySelector(`[name="${key}"]`);
-                        if (input) {
-                            if (input.type === 'checkbox') {
-                                input.checked = data[key];
-                            } else {
-                                input.value = data[key];
-                            }
-                        }
-                    });
-                }
-            } catch (error) {
-                console.error('Error loading configuration:', error);
-            }
-        }
-
-        async function startBot() {
-            try {
-                const response = await fetch(`${API_BASE}/start`, { method: 'POST' });
-                const data = await response.json();
-
-                if (response.ok) {
-                    showNotification('Bot iniciado correctamente', 'success');
-                    loadBotStatus();
-                } else {
-                    showNotification(data.error || 'Error iniciando bot', 'error');
-                }
-            } catch (error) {
-                showNotification('Error iniciando bot', 'error');
-            }
-        }
-
-        async function stopBot() {
-            try {
-                const response = await fetch(`${API_BASE}/stop`, { method: 'POST' });
-                const data = await response.json();
-
-                if (response.ok) {
-                    showNotification('Bot detenido correctamente', 'success');
-                    loadBotStatus();
-                } else {
-                    showNotification(data.error || 'Error deteniendo bot', 'error');
-                }
-            } catch (error) {
-                showNotification('Error deteniendo bot', 'error');
-            }
-        }
-
-        async function emergencyStop() {
-            try {
-                const response = await fetch(`${API_BASE}/emergency-stop`, { method: 'POST' });
-                const data = await response.json();
-
-                if (response.ok) {
-                    showNotification('Stop de emergencia activado', 'info');
-                    loadBotStatus();
-                } else {
-                    showNotification(data.error || 'Error en stop de emergencia', 'error');
-                }
-            } catch (error) {
-                showNotification('Error en stop de emergencia', 'error');
-            }
-        }
-
-        async function saveConfiguration(event) {
-            event.preventDefault();
-            
-            const formData = new FormData(event.target);
-            const config = {};
-            
-            for (let [key, value] of formData.entries()) {
-                if (value !== '') {
-                    config[key] = isNaN(value) ? value : parseFloat(value);
-                }
-            }
-
-            // Handle checkbox
-            config.bot_enabled = document.getElementById('bot_enabled').checked;
-
-            try {
-                const response = await fetch(`${API_BASE}/config`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(config)
-                });
-
-                const data = await response.json();
-
-                if (response.ok) {
-                    showNotification('Configuración guardada exitosamente', 'success');
-                    loadConfiguration();
-                } else {
-                    showNotification(data.error || 'Error guardando configuración', 'error');
-                }
-            } catch (error) {
-                showNotification('Error guardando configuración', 'error');
-            }
-        }
-
-        async function testConnections() {
-            try {
-                const response = await fetch(`${API_BASE}/test-connections`, { method: 'POST' });
-                const data = await response.json();
-
-                if (response.ok) {
-                    // Update connection status indicators
-                    document.getElementById('binance-status').className = `status-indicator ${data.binance ? 'status-online' : 'status-offline'}`;
-                    document.getElementById('telegram-status').className = `status-indicator ${data.telegram ? 'status-online' : 'status-offline'}`;
-                    
-                    let message = 'Resultados de prueba de conexiones:\\n';
-                    message += `Binance: ${data.binance ? '✅ Conectado' : '❌ Error'}\\n`;
-                    message += `Telegram: ${data.telegram ? '✅ Conectado' : '❌ Error'}\\n`;
-                    message += `DEX: ${data.dex ? '✅ Conectado' : '❌ Error'}`;
-                    
-                    showNotification(message, 'info');
-                } else {
-                    showNotification(data.error || 'Error probando conexiones', 'error');
-                }
-            } catch (error) {
-                showNotification('Error probando conexiones', 'error');
-            }
-        }
-
-        function showNotification(message, type) {
-            const notification = document.createElement('div');
-            notification.className = `notification ${type}`;
-            notification.textContent = message;
-            document.body.appendChild(notification);
-
-            setTimeout(() => {
-                notification.remove();
-            }, 5000);
-        }
+# Mercado sintético con semilla por red: la demo es reproducible (MARKET_SEED)
+MARKET_SEED = int(os.environ.get('MARKET_SEED', 42))
+demo_markets = {
+    network: SyntheticMarket(
+        seed=MARKET_SEED + i,
+        launch_rate=float(os.environ.get('DEMO_LAUNCH_RATE', 0.5)),
+        tick_rate=float(os.environ.get('DEMO_TICK_RATE', 0)),
+        liquidity_rate=0,
+        networks=(network,),
+        start_ts=time.time()
+    )
+    for i, network in enumerate(DEFAULT_NETWORKS)
+}
 
-        function getStatusColor(status) {
-            switch (status) {
-                case 'ACTIVE': return 'bg-green-100 text-green-800';
-                case 'COMPLETED': return 'bg-blue-100 text-blue-800';
-                case 'STOPPED': return 'bg-red-100 text-red-800';
-                default: return 'bg-gray-100 text-gray-800';
-            }
+# Velas 1s/1m/5m de los ticks de precio (CANDLE_PERSIST=1 las guarda en la caché de mercado)
+candles = CandleAggregator()
+candle_lock = threading.Lock()
+CANDLE_PERSIST = os.environ.get('CANDLE_PERSIST', '0') == '1'
+
+def demo_candidates(network):
+    """Fuente de demostración: lanzamientos del mercado sintético de la red (los ticks van a las velas)"""
+    market = demo_markets[network]
+    for event in market.advance(DEFAULT_NETWORKS[network]["poll_interval"]):
+        if event.kind == TICK:
+            with candle_lock:
+                candles.tick(event.address, event.ts, event.price, event.qty)
+            continue
+        yield {
+            "symbol": event.symbol,
+            "address": event.address,
+            "network": network,
+            "price": event.price,
+            "confidence": event.confidence,
+            "market_cap": event.market_cap,
+            "liquidity": event.liquidity
         }
 
-        function getAlertColor(type) {
-            switch (type) {
-                case 'GEM_DETECTED': return 'border-green-400 bg-green-50';
-                case 'RISK_WARNING': return 'border-yellow-400 bg-yellow-50';
-                case 'ERROR': return 'border-red-400 bg-red-50';
-                default: return 'border-blue-400 bg-blue-50';
-            }
-        }
+def process_candidate(candidate):
+    """Handler del escáner: cada candidato se analiza una vez y se evalúa en cada estrategia"""
+    if not bot_running.is_set():
+        # Stop (de emergencia) en curso: no abrir posiciones nuevas
+        return None
+    key = candidate.get("address", candidate["symbol"])
+    targets = [
+        strategy for strategy in strategies
+        if strategy.config.get("bot_enabled", True) and not strategy.token_index.should_skip(key)
+    ]
+    if not targets:
+        return None
+    if "address" not in candidate:
+        return evaluate_candidate(candidate, targets)
+    if shard_pool is not None:
+        # Detección en el shard de la dirección; el resultado vuelve en orden de envío
+        shard_pool.submit(candidate, targets)
+        return None
+    # Riesgo del contrato: acierto de caché en línea, análisis nuevo en el pool
+    contract_analyzer.evaluate(
+        candidate, lambda c, risk: evaluate_candidate({**c, "risk_score": risk.score}, targets)
+    )
+    return None
+
+def evaluate_candidate(candidate, targets):
+    """Aplicar el filtro de cada estrategia (con la puntuación de riesgo ya calculada) y operar"""
+    key = candidate.get("address", candidate["symbol"])
+    trades = []
+    for strategy in targets:
+        if not bot_running.is_set():
+            break
+        if not strategy.passes_filters(candidate):
+            strategy.token_index.mark_rejected(key)
+            continue
+        trade = generate_demo_trade(candidate, strategy)
+        if trade:
+            trades.append(trade)
+    return trades
+
+# Análisis de riesgo de contratos (caché TTL + LRU por dirección, pool propio)
+contract_analyzer = ContractRiskAnalyzer(
+    workers=int(os.environ.get('CONTRACT_RISK_WORKERS', 4)),
+    ttl=float(os.environ.get('CONTRACT_RISK_TTL', 3600)),
+    max_entries=int(os.environ.get('CONTRACT_RISK_CACHE_SIZE', 50000))
+)
+
+# Shards de detección (procesos por hash de dirección): SCANNER_SHARDS locales
+# o SCANNER_SHARD_ADDRESSES remotos (host:puerto,... con SHARD_AUTHKEY obligatoria;
+# los locales usan una clave aleatoria propia)
+SCANNER_SHARDS = int(os.environ.get('SCANNER_SHARDS', 0))
+SCANNER_SHARD_ADDRESSES = [a for a in os.environ.get('SCANNER_SHARD_ADDRESSES', '').split(',') if a]
+# Plazo por candidato: un shard colgado no retiene los resultados de los demás
+SHARD_RESULT_TIMEOUT = float(os.environ.get('SHARD_RESULT_TIMEOUT', 5.0))
+# Candidatos que cada shard local analiza a la vez (la E/S del análisis se solapa)
+SHARD_CONCURRENCY = int(os.environ.get('SHARD_CONCURRENCY', 32))
+shard_pool = None
+shard_lock = threading.Lock()
+
+def start_shards():
+    """Arrancar (una vez) los shards configurados; si fallan se sigue con el análisis en proceso"""
+    global shard_pool
+    if not (SCANNER_SHARDS or SCANNER_SHARD_ADDRESSES):
+        return None
+    with shard_lock:
+        if shard_pool is not None:
+            return shard_pool
+        try:
+            if SCANNER_SHARD_ADDRESSES:
+                shard_pool = shards.ShardRouter(
+                    [shards.parse_address(a) for a in SCANNER_SHARD_ADDRESSES],
+                    os.environ.get('SHARD_AUTHKEY', '').encode(),
+                    evaluate_candidate,
+                    result_timeout=SHARD_RESULT_TIMEOUT
+                )
+            else:
+                shard_pool = shards.LocalShardPool(
+                    SCANNER_SHARDS, evaluate_candidate, latency=float(os.environ.get('CONTRACT_RISK_LATENCY', 0.05)),
+                    result_timeout=SHARD_RESULT_TIMEOUT, concurrency=SHARD_CONCURRENCY
+                )
+            logger.info(f"🧩 {len(shard_pool)} shards de detección conectados")
+        except Exception as e:
+            logger.error(f"Error arrancando shards, se usa el análisis en proceso: {str(e)}")
+        return shard_pool
+
+def stop_shards():
+    """Cerrar los shards (los procesos locales terminan); el siguiente start los vuelve a lanzar"""
+    global shard_pool
+    with shard_lock:
+        pool, shard_pool = shard_pool, None
+    if pool is not None:
+        pool.close()
+
+# Motor de salidas: un tick por segundo sobre todas las posiciones abiertas
+EXIT_TICK_SECONDS = float(os.environ.get('EXIT_TICK_SECONDS', 1.0))
+DEMO_PRICE_VOLATILITY = float(os.environ.get('DEMO_PRICE_VOLATILITY', 0.05))
+_exit_rng = None
+
+def process_exits(strategy, batch):
+    """
+    Registrar en el diario las salidas (parciales o totales) de un tick.
+    Con paper trading la venta se ejecuta contra un libro simulado; el PnL
+    descuenta la comisión de entrada (a prorrata) y la de salida, y lo que
+    no llega a venderse se valora a 0 como en `realized_pnl`.
+    """
+    config = strategy.config.snapshot()
+    fee = float(config.get("trading_fee_pct", 0.25)) / 100
+    broker = None
+    if config.get("paper_trading", True):
+        broker = PaperBroker(config.get("trading_fee_pct", 0.25), config.get("max_slippage_pct", 5.0))
+    now = datetime.now().isoformat()
+    for trade_id, quantity, price, entry_price, reason, closed in batch:
+        trade = strategy.open_positions.get(trade_id)
+        if trade is None:
+            continue
+        cost = quantity * entry_price * (1 + fee)
+        if broker is not None:
+            fill = broker.market_sell(OrderBook.simulate(price, float(trade.get("liquidity") or 0)), quantity)
+            if fill.partial:
+                logger.info("💧 Venta parcial de %s (trade %s): %.0f de %.0f tokens", trade['token_symbol'],
+                            trade_id, fill.quantity, quantity, extra={"strategy": strategy.name, "trade_id": trade_id})
+            exit_price = fill.avg_price
+            proceeds = fill.notional - fill.fee
+            fees = quantity * entry_price * fee + fill.fee
+        else:
+            exit_price = price
+            proceeds = quantity * price * (1 - fee)
+            fees = quantity * (entry_price + price) * fee
+        pnl = proceeds - cost
+        record_event("trade_exit", strategy.scoped({
+            "trade_id": trade_id,
+            "quantity": quantity,
+            "price": round(exit_price, 10),
+            "reason": reason,
+            "pnl": round(pnl, 4),
+            "fees": round(fees, 4),
+            "remaining": 0.0 if closed else max(0.0, trade["quantity"] - quantity),
+            "closed": closed,
+            "at": now
+        }))
+        if closed:
+            strategy.risk_gate.release(trade_id)
+        logger.info("🎯 Salida %s de %s (trade %s): PnL $%.2f", reason, trade['token_symbol'], trade_id, pnl,
+                    extra={"strategy": strategy.name, "trade_id": trade_id, "reason": reason})
+
+def exit_cycle():
+    """Un tick de precio de demostración para las posiciones abiertas de cada estrategia"""
+    global _exit_rng
+    if _exit_rng is None:
+        import numpy as np
+        _exit_rng = np.random.default_rng(MARKET_SEED)
+    for strategy in strategies:
+        engine = strategy.exit_engine
+        if engine is None or not len(engine):
+            continue
+        try:
+            batch = engine.tick(engine.random_walk(_exit_rng, DEMO_PRICE_VOLATILITY))
+            if len(batch):
+                process_exits(strategy, batch)
+        except Exception as e:
+            logger.error(f"Error en el motor de salidas [{strategy.name}]: {e}")
+
+def candle_cycle():
+    """Cerrar las velas vencidas y guardarlas si está activado"""
+    with candle_lock:
+        candles.close_expired(time.time())
+        bars = candles.drain()
+    if bars and CANDLE_PERSIST:
+        write_bars(get_market_cache(), bars)
+
+# Supervisor: latidos de cada etapa y reinicio de las que mueren o se bloquean
+SCAN_CYCLE_BUDGET = float(os.environ.get('SCAN_CYCLE_BUDGET', 5.0))
+supervisor = Supervisor(
+    interval=float(os.environ.get('SUPERVISOR_INTERVAL', 1.0)),
+    stall_factor=float(os.environ.get('SUPERVISOR_STALL_FACTOR', 3.0))
+)
+def exits_wanted():
+    """Las salidas siguen activas tras un stop mientras queden posiciones abiertas"""
+    return bot_running.is_set() or any(strategy.open_positions for strategy in strategies)
+
+exit_runner = supervisor.loop("exits", exit_cycle, EXIT_TICK_SECONDS,
+                              budget=float(os.environ.get('EXIT_CYCLE_BUDGET', 0.5)), wanted=exits_wanted)
+candle_runner = supervisor.loop("candles", candle_cycle, 1.0, budget=0.5, wanted=bot_running.is_set)
+
+def resume_exits():
+    """Arrancar el motor de salidas (y el supervisor) si hay posiciones abiertas, aunque el bot esté parado"""
+    if any(strategy.open_positions for strategy in strategies):
+        exit_runner.start()
+        supervisor.start()
+
+# Escáner multi-red (un pool de workers por cadena), cada red supervisada por separado
+scanner = MultiChainScanner(demo_candidates, process_candidate, networks={
+    name: {**settings, "cycle_budget": SCAN_CYCLE_BUDGET} for name, settings in DEFAULT_NETWORKS.items()
+})
+for network, settings in DEFAULT_NETWORKS.items():
+    supervisor.register(Stage(
+        f"scanner:{network}",
+        heartbeats=lambda name=network: scanner.heartbeats(name),
+        alive=lambda name=network: scanner.alive(name),
+        restart=lambda name=network: scanner.restart(name),
+        wanted=lambda name=network: bot_running.is_set() and name in scanner.scanners,
+        max_idle=settings["poll_interval"] + SCAN_CYCLE_BUDGET * supervisor.stall_factor
+    ))
+
+# Endpoints de control: límite por cliente + idempotencia (el stop de emergencia queda fuera)
+control_guard = ControlGuard(
+    rate=float(os.environ.get('CONTROL_RATE_LIMIT', 1.0)),
+    burst=int(os.environ.get('CONTROL_BURST', 5))
+)
+config_lock = threading.Lock()
+
+def restore_runtime_state():
+    """Recuperar el diario y reconstruir contadores derivados"""
+    global trade_ids, alert_ids
+    
+    journal.recover(load_state, lambda t, d, ts: apply_event(strategies, t, d))
+    journal.open(snapshot_fn=snapshot_state)
+    seed_vault()
+    response_cache.clear()
+    
+    trade_ids = itertools.count(max((t["id"] for s in strategies for t in s.trades), default=0) + 1)
+    alert_ids = itertools.count(max((a.id for s in strategies for a in s.alerts), default=0) + 1)
+    
+    today = datetime.now(timezone.utc).date()
+    for strategy in strategies:
+        strategy.configure_risk()
+        for trade in strategy.trades:
+            created = datetime.fromisoformat(trade["created_at"]).astimezone(timezone.utc)
+            strategy.risk_gate.restore(
+                trade["id"],
+                amount=trade.get("position_size", trade["entry_price"] * trade["quantity"]) if trade["status"] == "ACTIVE" else None,
+                counts_today=created.date() == today
+            )
+        
+        if strategy.open_positions:
+            engine = get_exit_engine(strategy)
+            for trade in list(strategy.open_positions.values()):
+                reason = trade.get("exit_reason") or ""
+                engine.open(
+                    trade["id"],
+                    trade["entry_price"],
+                    trade["quantity"],
+                    opened_at=datetime.fromisoformat(trade["created_at"]).timestamp(),
+                    initial_quantity=trade.get("initial_quantity"),
+                    stage=int(reason[-1]) if reason.startswith("take_profit_") else 0
+                )
+    
+    stats = journal.stats
+    logger.info(f"📼 Diario recuperado: {sum(len(s.trades) for s in strategies)} trades, "
+                f"{sum(len(s.alerts) for s in strategies)} alertas en {len(strategies)} estrategias "
+                f"({stats['events_replayed']} eventos reproducidos en {stats['recovery_ms']} ms)")
+    resume_exits()
+
+def seed_vault():
+    """Credenciales iniciales: variables de entorno, luego las del diario antiguo y por último las de demo"""
+    for name in SECRET_FIELDS:
+        value = os.environ.get(SECRET_ENV[name])
+        if value:
+            vault.put(name, value)
+        elif name not in vault:
+            vault.put(name, legacy_secrets.get(name) or DEMO_SECRETS[name])
+    if legacy_secrets:
+        logger.warning(f"🔐 {len(legacy_secrets)} credenciales del diario migradas al vault; "
+                       f"los eventos antiguos las conservan en claro, conviene rotarlas")
+        legacy_secrets.clear()
+
+def seed_demo_data():
+    """Trades de demostración iniciales (solo con el diario vacío)"""
+    if trades_list:
+        return
+    logger.info("📊 Generando datos de demostración...")
+    for _ in range(5):
+        generate_demo_trade()
+    resume_exits()
 
-        function getPriorityColor(priority) {
-            switch (priority) {
-                case 'HIGH': return 'bg-red-100 text-red-800';
-                case 'MEDIUM': return 'bg-yellow-100 text-yellow-800';
-                case 'LOW': return 'bg-green-100 text-green-800';
-                default: return 'bg-gray-100 text-gray-800';
-            }
-        }
-    </script>
-</body>
-</html>
-'''
+def finish_startup():
+    """Recuperar el estado y precargar los módulos diferidos"""
+    try:
+        restore_runtime_state()
+        # Tras la recuperación (ids y diario abierto) y solo al ejecutar app.py directamente
+        if __name__ == '__main__':
+            seed_demo_data()
+    finally:
+        startup_ready.set()
+        startup_info["ready_ms"] = process_uptime_ms()
+    warm_up()
+
+if FAST_STARTUP:
+    threading.Thread(target=finish_startup, name='startup', daemon=True).start()
+else:
+    finish_startup()
+
+@app.before_request
+def wait_for_startup():
+    """Retener las peticiones de datos hasta que el estado esté recuperado"""
+    if request.path == '/health' or startup_ready.is_set():
+        return None
+    if not startup_ready.wait(timeout=30):
+        return jsonify({"error": "Servicio iniciándose, inténtalo de nuevo"}), 503
+    return None
 
 # Rutas principales
 @app.route('/')
 def dashboard():
     """Servir dashboard principal"""
-    return render_template_string(DASHBOARD_HTML)
+    return render_template_string(dashboard_page.DASHBOARD_HTML)
 
 @app.route('/health')
 def health_check():
     """Health check para Railway"""
-    return jsonify({
+    return jsonify(health_payload()), 200
+
+def health_payload():
+    """Respuesta de /health (también la sirve asgi.py de forma nativa)"""
+    if startup_info["first_health_ms"] is None:
+        startup_info["first_health_ms"] = process_uptime_ms()
+    return {
         "status": "healthy",
+        "ready": startup_ready.is_set(),
         "timestamp": datetime.now().isoformat(),
-        "bot_running": bot_running,
+        "bot_running": bot_running.is_set(),
         "version": "5.0.0-github-ready",
         "trades_count": len(trades_list),
-        "alerts_count": len(alerts_list)
-    }), 200
+        "alerts_count": len(alert_store)
+    }
+
+def requested_strategy():
+    """Estrategia indicada con ?strategy= (la de por defecto si no se indica)"""
+    return strategies.get(request.args.get('strategy'))
+
+def page_size_arg(name, default):
+    """Tamaño de página de la query (?per_page=, ?limit=): entero, como mínimo 1"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise ValueError(f"'{name}' debe ser un entero") from None
 
 # API Routes
+@app.route('/api/strategies', methods=['GET'])
+@response_cache.cached("config", "trades", "alerts", ttl=1.0)
+def list_strategies():
+    """Estrategias configuradas con su resumen"""
+    try:
+        return jsonify([strategy.summary() for strategy in strategies]), 200
+    except Exception as e:
+        logger.error(f"Error listando estrategias: {str(e)}")
+        return jsonify({"error": f"Error listando estrategias: {str(e)}"}), 500
+
+@app.route('/api/strategies', methods=['POST'])
+@control_guard.protect("strategies")
+def create_strategy():
+    """Crear una estrategia nueva (hereda la configuración de la de por defecto)"""
+    try:
+        data = request.get_json() or {}
+        name = str(data.get("name", "")).strip().lower()
+        if not valid_strategy_name(name):
+            return jsonify({"error": "Nombre inválido: minúsculas, dígitos, '-' o '_' (máx. 32)"}), 400
+        if name in strategies:
+            return jsonify({"error": f"La estrategia '{name}' ya existe"}), 409
+        
+        try:
+            overrides = coerce_config({key: value for key, value in (data.get("config") or {}).items()
+                                       if key in DEFAULT_CONFIG})
+        except ValueError as e:
+            return jsonify({"error": f"Configuración inválida: {e}"}), 400
+        record_event("strategy_created", {"name": name, "config": {**bot_config.to_dict(), **overrides}})
+        logger.info(f"🧭 Estrategia creada: {name} ({len(overrides)} parámetros propios)")
+        return jsonify(strategies.get(name).summary()), 201
+        
+    except Exception as e:
+        logger.error(f"Error creando estrategia: {str(e)}")
+        return jsonify({"error": f"Error creando estrategia: {str(e)}"}), 500
+
 @app.route('/api/config', methods=['GET'])
+@response_cache.cached("config")
 def get_config():
     """Obtener configuración actual"""
     try:
-        return jsonify(bot_config), 200
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        return jsonify({**strategy.config.to_dict(), **vault.masked()}), 200
     except Exception as e:
         logger.error(f"Error obteniendo configuración: {str(e)}")
         return jsonify({"error": f"Error obteniendo configuración: {str(e)}"}), 500
 
 @app.route('/api/config', methods=['POST'])
+@control_guard.protect("config")
 def save_config():
     """Guardar configuración"""
     try:
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
         
-        # Actualizar configuración
-        for key, value in data.items():
-            if key in bot_config:
-                bot_config[key] = value
+        # Actualizar configuración (escrituras serializadas: diario y gate en el mismo orden)
+        try:
+            changes = coerce_config({key: value for key, value in data.items() if key in strategy.config})
+        except ValueError as e:
+            return jsonify({"error": f"Configuración inválida: {e}"}), 400
+        # Credenciales al vault; los valores enmascarados (o vacíos) que devuelve el formulario no cambian nada
+        secrets = {key: data[key] for key in SECRET_FIELDS if data.get(key) and not is_masked(data[key])}
+        if any([vault.put(key, value) for key, value in secrets.items()]):
+            response_cache.invalidate("config")
+        with config_lock:
+            filters_changed = any(key in FILTER_KEYS and strategy.config.get(key) != value
+                                  for key, value in changes.items())
+            record_event("config", strategy.scoped(changes))
+            if filters_changed:
+                # Los tokens rechazados con los filtros anteriores vuelven a evaluarse
+                strategy.token_index.clear_rejected()
+            strategy.risk_gate.configure(
+                strategy.config["max_daily_trades"],
+                strategy.config["total_capital"],
+                strategy.config["max_position_size"]
+            )
+            if strategy.exit_engine is not None:
+                strategy.exit_engine.configure(**exit_settings(strategy.config))
         
         logger.info(f"✅ Configuración guardada: {list(data.keys())}")
         return jsonify({"message": "Configuración guardada exitosamente"}), 200
@@ -887,8 +852,8 @@ def test_connections():
     """Probar conexiones"""
     try:
         results = {
-            "binance": bool(bot_config.get("binance_api_key") and bot_config.get("binance_api_key") != "demo_key_12345"),
-            "telegram": bool(bot_config.get("telegram_bot_token") and bot_config.get("telegram_bot_token") != "1234567890:ABCDEFghijklmnopqrstuvwxyz123456789"),
+            "binance": bool(vault.get("binance_api_key") and vault.get("binance_api_key") != DEMO_SECRETS["binance_api_key"]),
+            "telegram": bool(vault.get("telegram_bot_token") and vault.get("telegram_bot_token") != DEMO_SECRETS["telegram_bot_token"]),
             "dex": True
         }
         return jsonify(results), 200
@@ -898,23 +863,29 @@ def test_connections():
         return jsonify({"error": f"Error probando conexiones: {str(e)}"}), 500
 
 @app.route('/api/start', methods=['POST'])
+@control_guard.protect("start")
 def start_bot():
     """Iniciar bot"""
-    global bot_running
-    
     try:
-        if bot_running:
+        if bot_running.is_set():
             return jsonify({"message": "Bot ya está funcionando"}), 200
         
-        if bot_config.get("total_capital", 0) <= 0:
+        if float(bot_config.get("total_capital", 0)) <= 0:
             return jsonify({"error": "Capital total debe ser mayor a 0"}), 400
         
-        bot_running = True
+        if bot_running.test_and_set():
+            return jsonify({"message": "Bot ya está funcionando"}), 200
+        response_cache.invalidate("bot")
         
         # Generar algunos trades de demostración
         for _ in range(random.randint(1, 3)):
             generate_demo_trade()
         
+        start_shards()
+        scanner.start()
+        exit_runner.start()
+        candle_runner.start()
+        supervisor.start()
         logger.info("🤖 Bot iniciado correctamente")
         return jsonify({"message": "Bot iniciado correctamente"}), 200
         
@@ -923,12 +894,14 @@ def start_bot():
         return jsonify({"error": f"Error iniciando bot: {str(e)}"}), 500
 
 @app.route('/api/stop', methods=['POST'])
+@control_guard.protect("stop")
 def stop_bot():
     """Detener bot"""
-    global bot_running
-    
     try:
-        bot_running = False
+        bot_running.clear()
+        response_cache.invalidate("bot")
+        scanner.stop()
+        stop_shards()
         logger.info("🛑 Bot detenido correctamente")
         return jsonify({"message": "Bot detenido correctamente"}), 200
         
@@ -938,11 +911,13 @@ def stop_bot():
 
 @app.route('/api/emergency-stop', methods=['POST'])
 def emergency_stop():
-    """Stop de emergencia"""
-    global bot_running
-    
+    """Stop de emergencia (sin límite ni coalescencia: siempre se ejecuta al instante)"""
     try:
-        bot_running = False
+        bot_running.clear()
+        scanner.halt()
+        # Sin esperar a que terminen los procesos de los shards
+        threading.Thread(target=stop_shards, name='shard-reaper', daemon=True).start()
+        response_cache.invalidate("bot")
         logger.info("🚨 Stop de emergencia activado")
         return jsonify({"message": "Stop de emergencia activado"}), 200
         
@@ -951,23 +926,42 @@ def emergency_stop():
         return jsonify({"error": f"Error en stop de emergencia: {str(e)}"}), 500
 
 @app.route('/api/status', methods=['GET'])
+@response_cache.cached("trades", "alerts", "config", "bot", ttl=1.0)
 def bot_status():
     """Estado del bot"""
     try:
-        daily_pnl = sum(trade.get("pnl", 0) for trade in trades_list)
-        active_positions = len([t for t in trades_list if t.get("status") == "ACTIVE"])
-        total_capital = bot_config.get("total_capital", 0)
-        used_capital = active_positions * bot_config.get("max_position_size", 300)
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        trades = strategy.trades.view()
+        daily_pnl = sum(trade.get("pnl", 0) for trade in trades)
+        active_positions = len([t for t in trades if t.get("status") == "ACTIVE"])
+        risk = strategy.risk_gate.snapshot()
         
         return jsonify({
-            "bot_running": bot_running,
-            "bot_enabled": bot_config.get("bot_enabled", False),
-            "daily_trades": len(trades_list),
-            "max_daily_trades": bot_config.get("max_daily_trades", 4),
+            "strategy": strategy.name,
+            "bot_running": bot_running.is_set(),
+            "bot_enabled": strategy.config.get("bot_enabled", False),
+            "daily_trades": risk["daily_trades"],
+            "max_daily_trades": risk["max_daily_trades"],
             "active_positions": active_positions,
             "daily_pnl": round(daily_pnl, 2),
-            "total_capital": total_capital,
-            "available_capital": max(0, total_capital - used_capital)
+            "total_capital": strategy.risk_gate.total_capital,
+            "available_capital": risk["available_capital"],
+            "reserved_capital": risk["reserved_capital"],
+            "risk_rejections": risk["rejections"],
+            "token_index": strategy.token_index.summary(),
+            "unread_alerts": strategy.alerts.unread_counts(),
+            "journal": journal.stats,
+            "networks": scanner.stats(),
+            "contract_risk": contract_analyzer.summary(),
+            "vault": vault.summary(),
+            "candles": candles.summary(),
+            "supervisor": supervisor.summary(),
+            "shards": shard_pool.summary() if shard_pool is not None else None,
+            "exits": strategy.exit_engine.summary() if strategy.exit_engine is not None else {"open_positions": len(strategy.open_positions)},
+            "control": control_guard.summary(),
+            "logging": log_pipeline.stats()
         }), 200
         
     except Exception as e:
@@ -975,58 +969,284 @@ def bot_status():
         return jsonify({"error": f"Error obteniendo estado: {str(e)}"}), 500
 
 @app.route('/api/statistics', methods=['GET'])
+@response_cache.cached("trades")
 def get_statistics():
     """Obtener estadísticas"""
     try:
-        daily_pnl = sum(trade.get("pnl", 0) for trade in trades_list)
-        winning_trades = len([t for t in trades_list if t.get("pnl", 0) > 0])
-        total_trades = len(trades_list)
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        trades = strategy.trades.view()
+        daily_pnl = sum(trade.get("pnl", 0) for trade in trades)
+        winning_trades = len([t for t in trades if t.get("pnl", 0) > 0])
+        total_trades = len(trades)
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
         return jsonify({
             "daily_trades": total_trades,
             "daily_pnl": round(daily_pnl, 2),
             "win_rate": round(win_rate, 1),
-            "active_positions": len([t for t in trades_list if t.get("status") == "ACTIVE"])
+            "active_positions": len([t for t in trades if t.get("status") == "ACTIVE"])
         }), 200
         
     except Exception as e:
         logger.error(f"Error obteniendo estadísticas: {str(e)}")
         return jsonify({"error": f"Error obteniendo estadísticas: {str(e)}"}), 500
 
+@app.route('/api/analytics', methods=['GET'])
+@response_cache.cached("trades")
+def get_analytics():
+    """Rollups por token, red, día y tramo de confianza (?by=token|network|day|confidence)"""
+    try:
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        dimension = request.args.get('by')
+        if dimension is not None and dimension not in DIMENSIONS:
+            return jsonify({"error": f"Dimensión inválida, usa una de: {', '.join(DIMENSIONS)}"}), 400
+        return jsonify(strategy.analytics.query(dimension)), 200
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo analítica: {str(e)}")
+        return jsonify({"error": f"Error obteniendo analítica: {str(e)}"}), 500
+
 @app.route('/api/trades', methods=['GET'])
+@response_cache.cached("trades")
 def get_trades():
     """Obtener trades"""
     try:
-        per_page = int(request.args.get('per_page', 20))
-        return jsonify(trades_list[-per_page:]), 200
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        per_page = page_size_arg('per_page', 20)
+        return jsonify(strategy.trades.tail(per_page)), 200
         
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error obteniendo trades: {str(e)}")
         return jsonify({"error": f"Error obteniendo trades: {str(e)}"}), 500
 
 @app.route('/api/alerts', methods=['GET'])
+@response_cache.cached("alerts")
 def get_alerts():
     """Obtener alertas"""
     try:
-        per_page = int(request.args.get('per_page', 10))
-        return jsonify(alerts_list[-per_page:]), 200
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        per_page = page_size_arg('per_page', 10)
+        unread_only = request.args.get('unread', '').lower() in ('1', 'true')
+        priority = request.args.get('priority')
+        channel = request.args.get('channel', 'text')
+        if channel not in CHANNELS:
+            return jsonify({"error": f"Canal inválido, usa uno de: {', '.join(CHANNELS)}"}), 400
+        alerts = strategy.alerts.page(per_page, unread_only=unread_only, priority=priority)
+        return jsonify([alert.to_dict(channel) for alert in alerts]), 200
         
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error obteniendo alertas: {str(e)}")
         return jsonify({"error": f"Error obteniendo alertas: {str(e)}"}), 500
 
+@app.route('/api/alerts/ack', methods=['POST'])
+def acknowledge_alerts():
+    """Marcar alertas como leídas en bloque"""
+    try:
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        data = request.get_json() or {}
+        if data.get("all"):
+            event = {"all": True, "priority": data.get("priority")}
+        else:
+            ids = [int(alert_id) for alert_id in data.get("ids", [])]
+            if not ids:
+                return jsonify({"error": "Indica 'ids' o 'all'"}), 400
+            event = {"ids": ids}
+        
+        before = strategy.alerts.unread_counts()["total"]
+        record_event("alert_ack", strategy.scoped(event))
+        unread = strategy.alerts.unread_counts()
+        return jsonify({"acknowledged": before - unread["total"], "unread": unread}), 200
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"IDs inválidos: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error marcando alertas: {str(e)}")
+        return jsonify({"error": f"Error marcando alertas: {str(e)}"}), 500
+
+def export_response(name, fields, rows_in_range, source):
+    """Respuesta en streaming (CSV o Parquet) del rango [start, end) pedido"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in export.FORMATS:
+        return jsonify({"error": f"Formato inválido, usa uno de: {', '.join(export.FORMATS)}"}), 400
+    if fmt == 'parquet' and not export.parquet_available():
+        return jsonify({"error": "La exportación Parquet requiere pyarrow"}), 501
+    try:
+        start = export.parse_bound(request.args.get('start'))
+        end = export.parse_bound(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({"error": f"Fecha inválida: {str(e)}"}), 400
+    
+    mimetype, extension = export.FORMATS[fmt]
+    rows = rows_in_range(source(), start, end)
+    logger.info(f"📤 Exportando {name} en {fmt} (desde {start or 'inicio'} hasta {end or 'ahora'})")
+    return Response(
+        export.stream_rows(rows, fields, fmt),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={name}.{extension}"}
+    )
+
+@app.route('/api/export/trades', methods=['GET'])
+def export_trades():
+    """Exportar el historial de trades (?format=csv|parquet&start=&end=)"""
+    try:
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        return export_response("trades" if strategy.is_default else f"trades-{strategy.name}", export.TRADE_FIELDS, export.trades_in_range, strategy.trades.view)
+    except Exception as e:
+        logger.error(f"Error exportando trades: {str(e)}")
+        return jsonify({"error": f"Error exportando trades: {str(e)}"}), 500
+
+@app.route('/api/export/alerts', methods=['GET'])
+def export_alerts():
+    """Exportar el historial de alertas (?format=csv|parquet&start=&end=)"""
+    try:
+        strategy = requested_strategy()
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada"}), 404
+        return export_response("alerts" if strategy.is_default else f"alerts-{strategy.name}", export.ALERT_FIELDS, export.alerts_in_range, strategy.alerts.to_list)
+    except Exception as e:
+        logger.error(f"Error exportando alertas: {str(e)}")
+        return jsonify({"error": f"Error exportando alertas: {str(e)}"}), 500
+
+@app.route('/api/market-data/<symbol>', methods=['GET'])
+def get_market_data(symbol):
+    """Barras OHLCV de la caché local"""
+    try:
+        cache = get_market_cache()
+        start = request.args.get('start', type=int)
+        end = request.args.get('end', type=int)
+        limit = page_size_arg('limit', 500)
+        bars = cache.read(symbol, start, end)
+        return jsonify({
+            "symbol": symbol,
+            "metadata": cache.metadata(symbol),
+            "bars": {name: column[-limit:].tolist() for name, column in bars.items()}
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error leyendo datos de mercado: {str(e)}")
+        return jsonify({"error": f"Error leyendo datos de mercado: {str(e)}"}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Métricas de la caché de respuestas"""
+    return jsonify(response_cache.summary()), 200
+
+def process_metrics():
+    """CPU y memoria de este proceso (con gunicorn, del worker que atiende la petición)"""
+    metrics = {
+        "pid": os.getpid(),
+        "uptime_ms": process_uptime_ms(),
+        "threads": threading.active_count()
+    }
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        metrics.update({
+            "cpu_user_s": round(usage.ru_utime, 3),
+            "cpu_system_s": round(usage.ru_stime, 3),
+            # ru_maxrss en KB en Linux
+            "peak_rss_mb": round(usage.ru_maxrss / 1024, 1)
+        })
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        metrics["rss_mb"] = round(pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20, 1)
+        metrics["open_fds"] = len(os.listdir('/proc/self/fd'))
+    except (OSError, ValueError, IndexError):
+        pass
+    return metrics
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """CPU, memoria e hilos del proceso (para pruebas de carga y dimensionado)"""
+    try:
+        return jsonify({**process_metrics(), "cache": response_cache.summary()}), 200
+
+    except Exception as e:
+        logger.error(f"Error obteniendo métricas: {str(e)}")
+        return jsonify({"error": f"Error obteniendo métricas: {str(e)}"}), 500
+
+@app.route('/api/startup', methods=['GET'])
+def startup_status():
+    """Desglose del arranque: tiempos de importación y módulos aún diferidos"""
+    try:
+        return jsonify({
+            "fast_startup": FAST_STARTUP,
+            "ready": startup_ready.is_set(),
+            "uptime_ms": process_uptime_ms(),
+            **startup_info,
+            **import_report(),
+            "journal_recovery_ms": journal.stats["recovery_ms"]
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo estado de arranque: {str(e)}")
+        return jsonify({"error": f"Error obteniendo estado de arranque: {str(e)}"}), 500
+
+@app.route('/api/journal/state', methods=['GET'])
+def journal_state():
+    """Reconstruir el estado en un instante dado (auditoría)"""
+    try:
+        at = request.args.get('at')
+        if not at:
+            return jsonify({"error": "Parámetro 'at' requerido (ISO 8601)"}), 400
+        until = datetime.fromisoformat(at).timestamp()
+        
+        state = new_state()
+        events = journal.reconstruct(
+            lambda snapshot: None,
+            lambda t, d, ts: apply_event(state, t, d),
+            until
+        )
+        strategy = state.get(request.args.get('strategy'))
+        if strategy is None:
+            return jsonify({"error": "Estrategia no encontrada en ese instante"}), 404
+        trades = strategy.trades.view()
+        return jsonify({
+            "at": at,
+            "strategy": strategy.name,
+            "events": events,
+            "trades_count": len(trades),
+            "alerts_count": len(strategy.alerts),
+            "active_positions": len([t for t in trades if t.get("status") == "ACTIVE"]),
+            "total_pnl": round(sum(t.get("pnl", 0) for t in trades), 2),
+            "config_changes": {
+                key: value for key, value in strategy.config.items() if DEFAULT_CONFIG.get(key) != value
+            }
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({"error": f"Fecha inválida: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error reconstruyendo estado: {str(e)}")
+        return jsonify({"error": f"Error reconstruyendo estado: {str(e)}"}), 500
+
 # Inicialización
 if __name__ == '__main__':
     logger.info("🚀 Iniciando Crypto Gem Bot Professional...")
     logger.info("✅ Configuración cargada")
     logger.info("✅ APIs configuradas")
     
-    # Generar datos de demostración iniciales
-    logger.info("📊 Generando datos de demostración...")
-    for _ in range(5):
-        generate_demo_trade()
-    
     # Configuración para producción
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') != 'production'
@@ -0,0 +1,155 @@
+"""
+Modo de servicio ASGI para la API del dashboard.
+
+Las rutas Flask existentes se sirven a través de `asgiref.wsgi.WsgiToAsgi`
+(en un pool de hilos), mientras que `/health` y el canal push `/api/stream`
+(Server-Sent Events) se atienden de forma nativa en el event loop: una
+conexión inactiva del dashboard cuesta una corrutina, no un hilo.
+
+Arranque:
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port $PORT
+
+Comparativa frente a gunicorn: ver `loadtest.py idle`.
+"""
+
+import asyncio
+import json
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as flask_app
+
+STREAM_TAGS = ("trades", "alerts", "config", "bot")
+KEEPALIVE_SECONDS = 15
+
+
+def stream_payload():
+    """Resumen ligero que se envía a los dashboards conectados"""
+    return {
+        "bot_running": flask_app.bot_running.is_set(),
+        "trades_count": len(flask_app.trades_list),
+        "unread_alerts": flask_app.alert_store.unread_counts()["total"],
+        "ts": time.time()
+    }
+
+
+class StreamHub:
+    """Difunde cambios de estado a todas las conexiones SSE abiertas"""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.clients = set()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=8)
+        self.clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.clients.discard(queue)
+
+    async def _run(self):
+        # Un único sondeo de versiones para todos los clientes
+        last_versions = None
+        while True:
+            versions = flask_app.response_cache.versions(STREAM_TAGS)
+            if versions != last_versions and self.clients:
+                message = f"data: {json.dumps(stream_payload())}\n\n".encode()
+                for queue in list(self.clients):
+                    if queue.full():
+                        continue
+                    queue.put_nowait(message)
+            last_versions = versions
+            await asyncio.sleep(self.interval)
+
+
+hub = StreamHub()
+wsgi_app = WsgiToAsgi(flask_app.app)
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _health(send):
+    await _send_json(send, {**flask_app.health_payload(), "stream_clients": len(hub.clients)})
+
+
+async def _wait_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _stream(receive, send):
+    queue = hub.subscribe()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no")
+        ]
+    })
+    disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        await send({"type": "http.response.body", "body": f"data: {json.dumps(stream_payload())}\n\n".encode(), "more_body": True})
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, disconnected}, timeout=KEEPALIVE_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                getter.cancel()
+                return
+            message = getter.result() if getter in done else b": keepalive\n\n"
+            if getter not in done:
+                getter.cancel()
+            await send({"type": "http.response.body", "body": message, "more_body": True})
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe(queue)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            hub.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await hub.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def asgi_app(scope, receive, send):
+    """Punto de entrada ASGI"""
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] == "http":
+        path = scope["path"]
+        if path == "/health":
+            return await _health(send)
+        if path == "/api/stream":
+            hub.start()
+            return await _stream(receive, send)
+    return await wsgi_app(scope, receive, send)
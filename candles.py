@@ -0,0 +1,275 @@
+"""
+Agregación de ticks en velas OHLCV (1s, 1m y 5m) en tiempo real.
+
+El estado de cada token vive en buffers `array('d')` preasignados (un slot
+por token y nivel), así que procesar un tick no crea objetos: solo se
+actualizan floats en su sitio. Los niveles se encadenan: un tick solo toca
+la vela del intervalo más fino y, al cerrarse, esa vela se pliega en la
+del siguiente intervalo (1s → 1m → 5m). Por eso cada intervalo debe ser
+múltiplo del anterior.
+
+Una vela se emite al cerrarse: cuando llega el primer tick del intervalo
+siguiente o cuando `close_expired(now)` detecta que su intervalo terminó.
+Las velas cerradas se acumulan en columnas y se recogen con `drain()`,
+listas para `MarketDataCache.append` (ver `write_bars`). Los intervalos
+sin ticks no generan velas vacías y los ticks con timestamp anterior a la
+vela abierta se descartan (se cuentan en `late`).
+
+Benchmark:
+    python candles.py [ticks] [tokens]
+"""
+
+import random
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+INTERVALS = (("1s", 1), ("1m", 60), ("5m", 300))
+
+# Velas cerradas de un intervalo, en columnas alineadas
+Bars = namedtuple('Bars', ['tokens', 'ts', 'open', 'high', 'low', 'close', 'volume', 'trades'])
+
+
+class _ClosedBars:
+    """Columnas de velas cerradas pendientes de recoger"""
+
+    __slots__ = ('slots', 'ts', 'open', 'high', 'low', 'close', 'volume', 'trades')
+
+    def __init__(self):
+        self.slots = array('q')
+        self.ts = array('d')
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('d')
+        self.trades = array('q')
+
+    def __len__(self):
+        return len(self.ts)
+
+
+class CandleAggregator:
+    """Velas por token en buffers preasignados; no es thread-safe (un hilo por agregador)"""
+
+    def __init__(self, intervals=INTERVALS, capacity=16384):
+        self.names = tuple(name for name, _ in intervals)
+        self.seconds = tuple(float(seconds) for _, seconds in intervals)
+        for finer, coarser in zip(self.seconds, self.seconds[1:]):
+            if coarser % finer:
+                raise ValueError(f"El intervalo {coarser}s no es múltiplo de {finer}s")
+        self.levels = len(intervals)
+        self._slots = {}
+        self._tokens = []
+        self.capacity = 0
+        self._allocate(capacity)
+        self._closed = [_ClosedBars() for _ in intervals]
+        self.ticks = 0
+        self.late = 0
+        self.emitted = 0
+
+    def _allocate(self, capacity):
+        size = capacity * self.levels
+        for name in ('start', 'open', 'high', 'low', 'close', 'volume'):
+            old = getattr(self, name, None)
+            buffer = array('d', bytes(8 * size))
+            if old is not None:
+                buffer[:len(old)] = old
+            setattr(self, name, buffer)
+        old = getattr(self, 'trades', None)
+        buffer = array('q', bytes(8 * size))
+        if old is not None:
+            buffer[:len(old)] = old
+        self.trades = buffer
+        self.capacity = capacity
+
+    def _add_token(self, token):
+        slot = len(self._tokens)
+        if slot == self.capacity:
+            self._allocate(self.capacity * 2)
+        self._tokens.append(token)
+        self._slots[token] = slot
+        return slot
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def tick(self, token, ts, price, qty=0.0):
+        """Procesar un tick (precio y cantidad negociada) de `token` en el instante `ts`"""
+        self.ticks += 1
+        slot = self._slots.get(token)
+        if slot is None:
+            slot = self._add_token(token)
+        i = slot * self.levels
+        bucket = ts - ts % self.seconds[0]
+        trades = self.trades
+        if trades[i] and bucket == self.start[i]:
+            # Camino caliente: mismo intervalo fino, solo se actualiza esa vela
+            if price > self.high[i]:
+                self.high[i] = price
+            elif price < self.low[i]:
+                self.low[i] = price
+            self.close[i] = price
+            self.volume[i] += qty
+            trades[i] += 1
+            return
+        if trades[i] and bucket < self.start[i]:
+            self.late += 1
+            return
+        self._roll(slot, bucket)
+        self.start[i] = bucket
+        self.open[i] = self.high[i] = self.low[i] = self.close[i] = price
+        self.volume[i] = qty
+        trades[i] = 1
+
+    def _roll(self, slot, bucket):
+        """Cerrar las velas del slot cuyo intervalo no contiene `bucket`, plegándolas hacia arriba"""
+        base = slot * self.levels
+        start, trades, seconds = self.start, self.trades, self.seconds
+        for level in range(self.levels):
+            i = base + level
+            if not trades[i]:
+                continue
+            if start[i] == bucket - bucket % seconds[level]:
+                return
+            self._emit(slot, level, i)
+            if level + 1 < self.levels:
+                self._fold(i, i + 1, seconds[level + 1])
+            trades[i] = 0
+
+    def _fold(self, src, dst, seconds):
+        """Añadir la vela cerrada `src` a la vela en curso `dst` del intervalo superior"""
+        if not self.trades[dst]:
+            self.start[dst] = self.start[src] - self.start[src] % seconds
+            self.open[dst] = self.open[src]
+            self.high[dst] = self.high[src]
+            self.low[dst] = self.low[src]
+            self.volume[dst] = 0.0
+        else:
+            if self.high[src] > self.high[dst]:
+                self.high[dst] = self.high[src]
+            if self.low[src] < self.low[dst]:
+                self.low[dst] = self.low[src]
+        self.close[dst] = self.close[src]
+        self.volume[dst] += self.volume[src]
+        self.trades[dst] += self.trades[src]
+
+    def _emit(self, slot, level, i):
+        closed = self._closed[level]
+        closed.slots.append(slot)
+        closed.ts.append(self.start[i])
+        closed.open.append(self.open[i])
+        closed.high.append(self.high[i])
+        closed.low.append(self.low[i])
+        closed.close.append(self.close[i])
+        closed.volume.append(self.volume[i])
+        closed.trades.append(self.trades[i])
+        self.emitted += 1
+
+    def close_expired(self, now):
+        """Cerrar las velas cuyo intervalo terminó antes de `now` aunque no lleguen más ticks"""
+        bucket = now - now % self.seconds[0]
+        before = self.emitted
+        for slot in range(len(self._tokens)):
+            self._roll(slot, bucket)
+        return self.emitted - before
+
+    def drain(self):
+        """Velas cerradas desde la última llamada: {intervalo: Bars}"""
+        result = {}
+        for level, name in enumerate(self.names):
+            closed = self._closed[level]
+            if not len(closed):
+                continue
+            self._closed[level] = _ClosedBars()
+            tokens = self._tokens
+            result[name] = Bars(
+                [tokens[slot] for slot in closed.slots], closed.ts, closed.open, closed.high,
+                closed.low, closed.close, closed.volume, closed.trades
+            )
+        return result
+
+    def current(self, token):
+        """Velas abiertas de un token: {intervalo: dict} (1m y 5m sin la vela fina en curso)"""
+        slot = self._slots.get(token)
+        if slot is None:
+            return {}
+        base = slot * self.levels
+        return {
+            name: {
+                "ts": self.start[base + level], "open": self.open[base + level],
+                "high": self.high[base + level], "low": self.low[base + level],
+                "close": self.close[base + level], "volume": self.volume[base + level],
+                "trades": self.trades[base + level]
+            }
+            for level, name in enumerate(self.names) if self.trades[base + level]
+        }
+
+    def summary(self):
+        return {
+            "tokens": len(self._tokens),
+            "capacity": self.capacity,
+            "ticks": self.ticks,
+            "late": self.late,
+            "emitted": self.emitted,
+            "pending": {name: len(closed) for name, closed in zip(self.names, self._closed)}
+        }
+
+
+def write_bars(cache, bars):
+    """
+    Guardar en un MarketDataCache las velas de `drain()`; cada serie es
+    `{token}_{intervalo}`. Devuelve el número de velas escritas.
+    """
+    import numpy as np
+
+    written = 0
+    for name, batch in bars.items():
+        columns = [np.frombuffer(column, dtype=np.float64) for column in
+                   (batch.ts, batch.open, batch.high, batch.low, batch.close, batch.volume)]
+        groups = {}
+        for row, token in enumerate(batch.tokens):
+            groups.setdefault(token, []).append(row)
+        for token, rows in groups.items():
+            rows = np.asarray(rows)
+            written += cache.append(f"{token}_{name}", columns[0][rows].astype(np.int64),
+                                    *(column[rows] for column in columns[1:]))
+    return written
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ticks = int(argv[0]) if argv else 1000000
+    tokens = int(argv[1]) if len(argv) > 1 else 10000
+    rate = 100000.0
+
+    # Flujo pregenerado a 100k ticks/s de tiempo simulado repartidos entre `tokens`
+    rng = random.Random(42)
+    names = [f"0x{rng.getrandbits(160):040x}" for _ in range(tokens)]
+    prices = [10 ** rng.uniform(-7, -2) for _ in range(tokens)]
+    stream = []
+    ts = 1700000000.0
+    for _ in range(ticks):
+        ts += 1 / rate
+        t = int(rng.random() * tokens)
+        prices[t] *= 1 + rng.gauss(0, 0.002)
+        stream.append((names[t], ts, prices[t], rng.random() * 100))
+
+    aggregator = CandleAggregator(capacity=tokens)
+    tick = aggregator.tick
+    started = time.perf_counter()
+    for token, ts, price, qty in stream:
+        tick(token, ts, price, qty)
+    elapsed = time.perf_counter() - started
+    aggregator.close_expired(ts + 300)
+    bars = aggregator.drain()
+
+    print(f"{ticks} ticks sobre {tokens} tokens ({ticks / rate:.0f} s simulados) en {elapsed:.2f}s: "
+          f"{ticks / elapsed:,.0f} ticks/s ({elapsed / ticks * 1e6:.2f} µs/tick)")
+    print("velas: " + ", ".join(f"{name}={len(batch.ts)}" for name, batch in bars.items()))
+    print(f"capacidad final: {aggregator.capacity} slots (sin crecer: {aggregator.capacity == tokens})")
+
+
+if __name__ == '__main__':
+    main()
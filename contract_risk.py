@@ -0,0 +1,185 @@
+"""
+Análisis de riesgo de contratos (heurísticas de rug pull).
+
+Para cada dirección de contrato se obtienen una vez los datos relevantes
+(honeypot, liquidez bloqueada, supply acuñable, concentración de holders),
+se calcula una puntuación 0-100 y se guarda en una caché con TTL y
+expulsión LRU. El análisis corre en un pool de workers propio, fuera del
+camino caliente del escáner: un avistamiento repetido cuesta un acierto
+de caché.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+ContractRisk = namedtuple('ContractRisk', [
+    'address', 'score', 'honeypot', 'liquidity_locked', 'mintable', 'top_holders_pct', 'reasons'
+])
+
+# Peso de cada heurística en la puntuación (honeypot = riesgo máximo directo)
+WEIGHTS = {
+    "unlocked_liquidity": 35,
+    "mintable": 25,
+    "concentrated_holders": 30,
+    "thin_liquidity": 10,
+}
+CONCENTRATION_THRESHOLD = 50.0
+
+
+def score_contract(address, facts):
+    """Puntuación de riesgo a partir de los datos del contrato"""
+    reasons = []
+    if facts["honeypot"]:
+        reasons.append("honeypot")
+        score = 100
+    else:
+        score = 0
+        if not facts["liquidity_locked"]:
+            score += WEIGHTS["unlocked_liquidity"]
+            reasons.append("unlocked_liquidity")
+        if facts["mintable"]:
+            score += WEIGHTS["mintable"]
+            reasons.append("mintable")
+        top = facts["top_holders_pct"]
+        if top > CONCENTRATION_THRESHOLD:
+            score += round(WEIGHTS["concentrated_holders"] * min(1.0, (top - CONCENTRATION_THRESHOLD) / 40))
+            reasons.append("concentrated_holders")
+        market_cap = facts.get("market_cap") or 0
+        if market_cap and facts.get("liquidity", 0) < market_cap * 0.1:
+            score += WEIGHTS["thin_liquidity"]
+            reasons.append("thin_liquidity")
+    return ContractRisk(address, min(100, score), facts["honeypot"], facts["liquidity_locked"],
+                        facts["mintable"], round(facts["top_holders_pct"], 1), tuple(reasons))
+
+
+def demo_contract_facts(candidate, latency=0.05):
+    """
+    Datos de contrato de demostración, deterministas por dirección.
+    `latency` simula las llamadas RPC / simulación de venta de un análisis real.
+    """
+    if latency:
+        time.sleep(latency)
+    digest = hashlib.blake2b(candidate["address"].encode(), digest_size=8).digest()
+    return {
+        "honeypot": digest[0] < 13,            # ~5 %
+        "liquidity_locked": digest[1] >= 90,   # ~65 % bloqueada
+        "mintable": digest[2] < 64,            # ~25 %
+        "top_holders_pct": 15 + digest[3] / 255 * 80,
+        "market_cap": candidate.get("market_cap"),
+        "liquidity": candidate.get("liquidity", 0),
+    }
+
+
+class RiskScoreCache:
+    """Caché LRU con TTL de puntuaciones por dirección"""
+
+    def __init__(self, ttl=3600.0, max_entries=50000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, address):
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires, risk = entry
+            if expires <= time.monotonic():
+                del self._entries[address]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(address)
+            self.stats["hits"] += 1
+            return risk
+
+    def put(self, address, risk):
+        with self._lock:
+            self._entries[address] = (time.monotonic() + self.ttl, risk)
+            self._entries.move_to_end(address)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ContractRiskAnalyzer:
+    """Pool de análisis de contratos con caché y deduplicación de análisis en curso"""
+
+    def __init__(self, fetch_facts=demo_contract_facts, workers=4, ttl=3600.0, max_entries=50000):
+        self.fetch_facts = fetch_facts
+        self.cache = RiskScoreCache(ttl, max_entries)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='contract-risk')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.analyzed = 0
+        self.errors = 0
+        self.skipped_pending = 0
+
+    def lookup(self, address):
+        return self.cache.get(address)
+
+    def evaluate(self, candidate, on_ready):
+        """
+        Llamar a `on_ready(candidate, risk)` con la puntuación del contrato.
+        Con acierto de caché se llama en el hilo actual; si no, el análisis
+        se encola en el pool y `on_ready` corre allí al terminar. Devuelve
+        False si ese contrato ya se está analizando (avistamiento duplicado).
+        """
+        address = candidate["address"]
+        risk = self.cache.get(address)
+        if risk is not None:
+            on_ready(candidate, risk)
+            return True
+        with self._lock:
+            if address in self._pending:
+                self.skipped_pending += 1
+                return False
+            self._pending.add(address)
+        self._pool.submit(self._analyze, candidate, on_ready)
+        return True
+
+    def _analyze(self, candidate, on_ready):
+        address = candidate["address"]
+        try:
+            risk = score_contract(address, self.fetch_facts(candidate))
+            self.cache.put(address, risk)
+            self.analyzed += 1
+        except Exception as e:
+            logger.error("Error analizando contrato %s: %s", address, e)
+            self.errors += 1
+            return
+        finally:
+            with self._lock:
+                self._pending.discard(address)
+        try:
+            on_ready(candidate, risk)
+        except Exception as e:
+            logger.error("Error procesando contrato analizado %s: %s", address, e)
+            self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "cached": len(self.cache),
+            "pending": pending,
+            "analyzed": self.analyzed,
+            "errors": self.errors,
+            "skipped_pending": self.skipped_pending,
+            **self.cache.stats
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
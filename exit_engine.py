@@ -0,0 +1,262 @@
+"""
+Motor de salidas: take-profit escalonado, trailing stop y salida por tiempo.
+
+Las posiciones abiertas viven en arrays numpy (estructura de arrays) y cada
+tick de precios se procesa para todas a la vez:
+
+- TP1/TP2/TP3: venta parcial de una fracción de la cantidad inicial en cada
+  nivel (TP3 cierra el resto). Un salto de precio puede cruzar varios
+  niveles en el mismo tick.
+- Stop loss fijo hasta TP1; a partir de TP1 el stop sigue al máximo con un
+  trailing (`trailing_stop_pct`) y solo puede subir.
+- Salida por tiempo al superar `max_hold_seconds`.
+
+Benchmark:
+    python exit_engine.py [num_positions] [num_ticks]
+"""
+
+import sys
+import threading
+import time
+
+import numpy as np
+
+TP_FRACTIONS = (0.4, 0.3, 0.3)
+
+# Motivos de salida (códigos en los arrays, nombres en la API)
+TAKE_PROFIT_1, TAKE_PROFIT_2, TAKE_PROFIT_3, STOP_LOSS, TRAILING_STOP, TIME_EXIT = range(6)
+REASONS = ("take_profit_1", "take_profit_2", "take_profit_3", "stop_loss", "trailing_stop", "time_exit")
+
+_EPSILON = 1e-12
+
+
+class ExitBatch:
+    """Salidas producidas en un tick (arrays alineados)"""
+
+    __slots__ = ('ids', 'quantity', 'price', 'entry_price', 'reason', 'closed')
+
+    def __init__(self, ids, quantity, price, entry_price, reason, closed):
+        self.ids = ids
+        self.quantity = quantity
+        self.price = price
+        self.entry_price = entry_price
+        self.reason = reason
+        self.closed = closed
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        """(id, cantidad, precio, precio de entrada, motivo, posición cerrada)"""
+        for row in zip(self.ids.tolist(), self.quantity.tolist(), self.price.tolist(),
+                       self.entry_price.tolist(), self.reason.tolist(), self.closed.tolist()):
+            yield row[:4] + (REASONS[row[4]], row[5])
+
+
+class ExitEngine:
+    """Posiciones abiertas en arrays preasignados con procesamiento por lotes"""
+
+    def __init__(self, stop_loss_pct=18.0, take_profit_pcts=(100.0, 200.0, 400.0), trailing_stop_pct=15.0,
+                 max_hold_seconds=4 * 3600, fractions=TP_FRACTIONS, capacity=1024):
+        self.configure(stop_loss_pct, take_profit_pcts, trailing_stop_pct, max_hold_seconds, fractions)
+        self.size = 0
+        self._free = []
+        self._slots = {}
+        self._lock = threading.RLock()
+        self._allocate(capacity)
+
+    def configure(self, stop_loss_pct, take_profit_pcts, trailing_stop_pct, max_hold_seconds, fractions=TP_FRACTIONS):
+        """Los cambios se aplican a los ticks siguientes (el stop ya subido no baja)"""
+        self.stop_loss_pct = float(stop_loss_pct)
+        self.take_profit_pcts = tuple(float(pct) for pct in take_profit_pcts)
+        self.trailing_stop_pct = float(trailing_stop_pct)
+        self.max_hold_seconds = float(max_hold_seconds)
+        self.fractions = tuple(float(fraction) for fraction in fractions)
+
+    def _allocate(self, capacity):
+        old = getattr(self, 'ids', None)
+        arrays = {
+            "ids": np.zeros(capacity, dtype=np.int64),
+            "entry": np.zeros(capacity, dtype=np.float64),
+            "initial": np.zeros(capacity, dtype=np.float64),
+            "qty": np.zeros(capacity, dtype=np.float64),
+            "stop": np.zeros(capacity, dtype=np.float64),
+            "high": np.zeros(capacity, dtype=np.float64),
+            "last": np.zeros(capacity, dtype=np.float64),
+            "opened": np.zeros(capacity, dtype=np.float64),
+            "stage": np.zeros(capacity, dtype=np.int8),
+            "active": np.zeros(capacity, dtype=bool),
+        }
+        if old is not None:
+            for name, array in arrays.items():
+                array[:self.size] = getattr(self, name)[:self.size]
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, position_id):
+        return position_id in self._slots
+
+    def open(self, position_id, entry_price, quantity, opened_at=None, initial_quantity=None, stage=0):
+        """
+        Registrar una posición; devuelve su slot. `initial_quantity` y
+        `stage` permiten reanudar una posición con salidas parciales previas.
+        """
+        with self._lock:
+            return self._open(position_id, entry_price, quantity, opened_at, initial_quantity, stage)
+
+    def _open(self, position_id, entry_price, quantity, opened_at, initial_quantity, stage):
+        if position_id in self._slots:
+            raise ValueError(f"Posición {position_id} ya registrada")
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+        entry_price = float(entry_price)
+        self.ids[slot] = position_id
+        self.entry[slot] = entry_price
+        self.qty[slot] = float(quantity)
+        self.initial[slot] = float(quantity if initial_quantity is None else initial_quantity)
+        self.stop[slot] = entry_price * (1 - (self.stop_loss_pct if stage == 0 else self.trailing_stop_pct) / 100)
+        self.high[slot] = self.last[slot] = entry_price
+        self.opened[slot] = time.time() if opened_at is None else opened_at
+        self.stage[slot] = stage
+        self.active[slot] = True
+        self._slots[position_id] = slot
+        return slot
+
+    def close(self, position_id):
+        """Retirar una posición sin generar salida (cierre manual)"""
+        with self._lock:
+            slot = self._slots.pop(position_id)
+            self.active[slot] = False
+            self.qty[slot] = 0.0
+            self._free.append(slot)
+
+    def slot(self, position_id):
+        return self._slots[position_id]
+
+    def tick(self, prices, now=None, slots=None):
+        """
+        Procesar un tick. `prices` está alineado con `slots` o, si `slots` es
+        None, con todos los slots [0, size). NaN = sin precio nuevo.
+        Devuelve un ExitBatch con las salidas (parciales y totales).
+        """
+        with self._lock:
+            return self._tick(prices, time.time() if now is None else now, slots)
+
+    def _tick(self, prices, now, slots):
+        if slots is None:
+            idx = np.arange(self.size)
+            price = np.asarray(prices, dtype=np.float64)[:self.size]
+        else:
+            idx = np.asarray(slots, dtype=np.int64)
+            price = np.asarray(prices, dtype=np.float64)
+        valid = self.active[idx] & (price > 0)
+        idx, price = idx[valid], price[valid]
+        self.last[idx] = price
+        self.high[idx] = np.maximum(self.high[idx], price)
+        entry = self.entry[idx]
+
+        exits = []
+        last_level = len(self.take_profit_pcts) - 1
+        for level, (pct, fraction) in enumerate(zip(self.take_profit_pcts, self.fractions)):
+            hit = (self.stage[idx] == level) & (price >= entry * (1 + pct / 100))
+            if not hit.any():
+                continue
+            slots_hit = idx[hit]
+            remaining = self.qty[slots_hit]
+            sell = remaining if level == last_level else np.minimum(self.initial[slots_hit] * fraction, remaining)
+            self.qty[slots_hit] = remaining - sell
+            self.stage[slots_hit] = level + 1
+            exits.append((slots_hit, sell, price[hit], np.full(len(slots_hit), TAKE_PROFIT_1 + level, np.int8)))
+
+        # Trailing stop a partir de TP1: solo sube
+        trailing = self.stage[idx] >= 1
+        if trailing.any():
+            slots_trailing = idx[trailing]
+            self.stop[slots_trailing] = np.maximum(
+                self.stop[slots_trailing], self.high[slots_trailing] * (1 - self.trailing_stop_pct / 100)
+            )
+
+        open_qty = self.qty[idx] > _EPSILON
+        stop_hit = open_qty & (price <= self.stop[idx])
+        time_hit = open_qty & ~stop_hit & (now - self.opened[idx] >= self.max_hold_seconds)
+        for hit, reason in ((stop_hit, None), (time_hit, TIME_EXIT)):
+            if not hit.any():
+                continue
+            slots_hit = idx[hit]
+            sell = self.qty[slots_hit].copy()
+            self.qty[slots_hit] = 0.0
+            if reason is None:
+                reasons = np.where(self.stage[slots_hit] == 0, STOP_LOSS, TRAILING_STOP).astype(np.int8)
+            else:
+                reasons = np.full(len(slots_hit), reason, np.int8)
+            exits.append((slots_hit, sell, price[hit], reasons))
+
+        if not exits:
+            empty = np.empty(0)
+            return ExitBatch(empty.astype(np.int64), empty, empty, empty, empty.astype(np.int8), empty.astype(bool))
+        slots_out = np.concatenate([e[0] for e in exits])
+        # Solo la última salida de cada posición en el tick la cierra (TP2 y TP3 en el mismo salto)
+        last = np.zeros(len(slots_out), dtype=bool)
+        last[len(slots_out) - 1 - np.unique(slots_out[::-1], return_index=True)[1]] = True
+        closed = last & (self.qty[slots_out] <= _EPSILON)
+        batch = ExitBatch(
+            self.ids[slots_out], np.concatenate([e[1] for e in exits]), np.concatenate([e[2] for e in exits]),
+            self.entry[slots_out], np.concatenate([e[3] for e in exits]), closed
+        )
+        for slot in np.unique(slots_out[closed]).tolist():
+            self.active[slot] = False
+            del self._slots[int(self.ids[slot])]
+            self._free.append(slot)
+        return batch
+
+    def random_walk(self, rng, volatility=0.05, drift=0.0):
+        """Precios de demostración: paseo aleatorio lognormal desde el último precio de cada slot"""
+        with self._lock:
+            return self.last[:self.size] * np.exp(rng.normal(drift, volatility, self.size))
+
+    def summary(self):
+        with self._lock:
+            active = self.active[:self.size]
+            stages = np.bincount(self.stage[:self.size][active], minlength=len(self.take_profit_pcts) + 1)
+        return {
+            "open_positions": len(self._slots),
+            "capacity": self.capacity,
+            "by_stage": {f"tp{level}": int(count) for level, count in enumerate(stages.tolist())}
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    positions = int(argv[0]) if argv else 50000
+    ticks = int(argv[1]) if len(argv) > 1 else 200
+    rng = np.random.default_rng(42)
+    engine = ExitEngine(capacity=positions, max_hold_seconds=ticks * 0.8)
+    entries = 10 ** rng.uniform(-7, -2, positions)
+    quantities = 300 / entries
+    for i in range(positions):
+        engine.open(i + 1, entries[i], quantities[i], opened_at=0.0)
+
+    counts = np.zeros(len(REASONS), dtype=np.int64)
+    started = time.perf_counter()
+    for t in range(ticks):
+        batch = engine.tick(engine.random_walk(rng, volatility=0.08, drift=0.01), now=float(t))
+        counts += np.bincount(batch.reason, minlength=len(REASONS))
+    elapsed = time.perf_counter() - started
+
+    print(f"{positions} posiciones, {ticks} ticks en {elapsed:.2f}s: "
+          f"{elapsed / ticks * 1000:.2f} ms/tick, {positions * ticks / elapsed:,.0f} actualizaciones/s")
+    print("salidas: " + ", ".join(f"{name}={int(count)}" for name, count in zip(REASONS, counts)))
+    print(f"abiertas al final: {len(engine)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Exportación masiva del historial (trades y alertas) en CSV o Parquet.
+
+Las filas se recorren con generadores sobre el almacén y se emiten por
+bloques, así que la memoria usada no depende del tamaño del historial y
+el primer bloque sale en cuanto está listo. Parquet es opcional: solo
+está disponible si `pyarrow` está instalado.
+"""
+
+import bisect
+import csv
+import io
+import itertools
+from datetime import datetime
+
+from alert_templates import render
+
+# Columnas exportadas y su tipo Parquet (nombre de fábrica de `pyarrow`)
+TRADE_FIELDS = (
+    ("id", "int64"), ("created_at", "string"), ("updated_at", "string"),
+    ("token_symbol", "string"), ("network", "string"), ("trade_type", "string"), ("status", "string"),
+    ("entry_price", "float64"), ("quantity", "float64"), ("position_size", "float64"), ("pnl", "float64"),
+    ("fees", "float64"), ("slippage_pct", "float64"), ("partial_fill", "bool_"),
+    ("confidence", "float64"), ("market_cap", "float64"), ("liquidity", "float64"), ("risk_score", "float64"),
+    ("strategy", "string"),
+)
+ALERT_FIELDS = (
+    ("id", "int64"), ("created_at", "string"), ("alert_type", "string"), ("priority", "string"),
+    ("token_symbol", "string"), ("confidence", "float64"), ("market_cap", "float64"),
+    ("liquidity", "float64"), ("pnl", "float64"), ("is_read", "bool_"), ("message", "string"),
+)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parse_bound(value):
+    """Límite de fecha (ISO 8601, fecha o fecha-hora) como datetime local sin zona"""
+    if not value:
+        return None
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        bound = bound.astimezone().replace(tzinfo=None)
+    return bound
+
+
+def trades_in_range(trades, start=None, end=None):
+    """
+    Trades con `created_at` en [start, end). El log está en orden de
+    inserción (cronológico), así que el inicio se busca por bisección.
+    """
+    start_key = start.isoformat() if start else None
+    end_key = end.isoformat() if end else None
+    lo = bisect.bisect_left(trades, start_key, key=lambda t: t["created_at"]) if start_key else 0
+    for i in range(lo, len(trades)):
+        trade = trades[i]
+        if end_key and trade["created_at"] >= end_key:
+            return
+        yield trade
+
+
+def alerts_in_range(alerts, start=None, end=None):
+    """Alertas (en orden de creación) con `ts` en [start, end) como dicts de exportación"""
+    start_ts = start.timestamp() if start else None
+    end_ts = end.timestamp() if end else None
+    lo = bisect.bisect_left(alerts, start_ts, key=lambda a: a.ts) if start_ts is not None else 0
+    for i in range(lo, len(alerts)):
+        alert = alerts[i]
+        if end_ts is not None and alert.ts >= end_ts:
+            return
+        yield {
+            "id": alert.id,
+            "created_at": datetime.fromtimestamp(alert.ts).isoformat(),
+            "alert_type": alert.alert_type,
+            "priority": alert.priority,
+            "token_symbol": alert.token,
+            "confidence": alert.confidence,
+            "market_cap": alert.market_cap,
+            "liquidity": alert.liquidity,
+            "pnl": alert.pnl,
+            "is_read": alert.is_read,
+            "message": render(alert, "text")
+        }
+
+
+def iter_csv(rows, fields, chunk_rows=1000):
+    """CSV por bloques de `chunk_rows` filas"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[name for name, _ in fields], extrasaction='ignore', restval='')
+    writer.writeheader()
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura que acumula bytes hasta que el generador los recoge"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_parquet(rows, fields, chunk_rows=50000):
+    """Parquet con un row group por bloque; cada row group se emite al cerrarse"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = iter(rows)
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in fields])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        while True:
+            chunk = list(itertools.islice(rows, chunk_rows))
+            if not chunk:
+                break
+            # Campos ausentes (p. ej. trades antiguos sin comisiones) = null
+            columns = {name: [row.get(name) for row in chunk] for name, _ in fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def stream_rows(rows, fields, fmt):
+    return iter_parquet(rows, fields) if fmt == "parquet" else iter_csv(rows, fields)
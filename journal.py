@@ -0,0 +1,189 @@
+"""
+Diario de eventos (event sourcing) con snapshots para arranque rápido.
+
+Cada evento (trade, alerta, configuración...) se añade a un fichero binario
+append-only. Cada `snapshot_every` eventos se guarda un snapshot compacto
+del estado (JSON comprimido con zlib) junto con la posición del diario que
+cubre. Al arrancar se carga el último snapshot y solo se reproduce la cola.
+
+Formato de cada registro:
+    cabecera struct '<IIBd' = (longitud, crc32, tipo, timestamp) + payload JSON
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('<IIBd')
+
+# Códigos de tipo de evento; solo se añaden, nunca se renumeran
+EVENT_TYPES = {
+    "trade": 1,
+    "alert": 2,
+    "config": 3,
+    "alert_ack": 4,
+    "trade_exit": 5,
+    "strategy_created": 6,
+}
+EVENT_NAMES = {code: name for name, code in EVENT_TYPES.items()}
+
+
+def _encode(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class Journal:
+    """Diario append-only con snapshots periódicos"""
+
+    def __init__(self, directory, snapshot_every=1000, fsync=False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.journal_path = os.path.join(directory, 'journal.bin')
+        self.snapshot_path = os.path.join(directory, 'snapshot.bin')
+        self._lock = threading.Lock()
+        self._file = None
+        self._since_snapshot = 0
+        self._snapshot_fn = None
+        self._snapshot_thread = None
+        self.stats = {"events_replayed": 0, "snapshot_loaded": False, "recovery_ms": 0.0}
+
+    # Escritura
+
+    def open(self, snapshot_fn=None):
+        """Abrir el diario para escritura; `snapshot_fn` devuelve el estado actual"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._snapshot_fn = snapshot_fn
+        self._file = open(self.journal_path, 'ab')
+
+    def append(self, event_type, data, apply=None, ts=None):
+        """
+        Añadir un evento al diario.
+        `apply` (opcional) aplica el evento al estado en memoria bajo el mismo
+        lock, así un snapshot nunca incluye eventos posteriores a su offset.
+        """
+        payload = _encode(data)
+        ts = time.time() if ts is None else ts
+        header = HEADER.pack(len(payload), zlib.crc32(payload), EVENT_TYPES[event_type], ts)
+        with self._lock:
+            if apply is not None:
+                apply(event_type, data, ts)
+            if self._file is None:
+                return
+            self._file.write(header + payload)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._since_snapshot += 1
+            if self._snapshot_fn and self._since_snapshot >= self.snapshot_every:
+                self._start_snapshot()
+
+    def _start_snapshot(self):
+        # Se captura el estado bajo el lock (copiando todo lo que los eventos
+        # modifican en sitio) y se serializa en segundo plano para no
+        # bloquear la petición en curso
+        if self._snapshot_thread and self._snapshot_thread.is_alive():
+            return
+        offset = self._file.tell()
+        state = self._snapshot_fn()
+        self._since_snapshot = 0
+        self._snapshot_thread = threading.Thread(
+            target=self.write_snapshot, args=(state, offset), daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def write_snapshot(self, state, offset):
+        """Escribir un snapshot de forma atómica (fichero temporal + rename)"""
+        body = zlib.compress(_encode({"offset": offset, "created_at": time.time(), "state": state}), 6)
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        logger.info(f"📸 Snapshot del diario guardado (offset {offset})")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # Lectura
+
+    def load_snapshot(self):
+        """Devolver (estado, offset) del último snapshot, o (None, 0)"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None, 0
+        except (zlib.error, ValueError) as e:
+            logger.error(f"Snapshot corrupto, se reproduce el diario completo: {e}")
+            return None, 0
+        return snapshot["state"], snapshot["offset"]
+
+    def iter_events(self, offset=0, until=None):
+        """
+        Recorrer eventos desde `offset`.
+        Produce (offset_siguiente, tipo, timestamp, datos) y se detiene en una
+        cola truncada o corrupta, o en el primer evento posterior a `until`.
+        """
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return
+                length, crc, code, ts = HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                if until is not None and ts > until:
+                    return
+                offset += HEADER.size + length
+                yield offset, EVENT_NAMES.get(code, code), ts, json.loads(payload)
+
+    def recover(self, load_state, apply_event):
+        """
+        Reconstruir el estado: cargar el último snapshot con `load_state(state)`
+        y reproducir la cola con `apply_event(tipo, datos, ts)`.
+        Recorta cualquier registro incompleto al final del diario.
+        """
+        started = time.perf_counter()
+        state, offset = self.load_snapshot()
+        if state is not None:
+            load_state(state)
+            self.stats["snapshot_loaded"] = True
+        valid_end = offset
+        replayed = 0
+        for valid_end, event_type, ts, data in self.iter_events(offset):
+            apply_event(event_type, data, ts)
+            replayed += 1
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > valid_end:
+            logger.warning("⚠️ Cola del diario incompleta, se recorta")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_end)
+        self._since_snapshot = replayed
+        self.stats["events_replayed"] = replayed
+        self.stats["recovery_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return replayed
+
+    def reconstruct(self, load_state, apply_event, until):
+        """Estado en un instante dado (auditoría): reproduce el diario desde el inicio"""
+        load_state(None)
+        count = 0
+        for _, event_type, ts, data in self.iter_events(0, until=until):
+            apply_event(event_type, data, ts)
+            count += 1
+        return count
@@ -0,0 +1,136 @@
+"""
+Importaciones diferidas y arranque en frío rápido.
+
+Los subsistemas pesados se registran con `lazy_import()` y solo se importan
+en el primer acceso a un atributo (o en segundo plano con `warm_up()`), de
+modo que `/health` responde en cuanto Flask está listo. Cada importación
+queda cronometrada para poder ver el desglose del arranque.
+
+Uso desde la línea de comandos (desglose con `python -X importtime`):
+    python lazy_imports.py [modulo]
+"""
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Tiempos de importación medidos (ms) por módulo
+IMPORT_TIMES = {}
+_registry = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Proxy que importa el módulo real en el primer acceso"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = timed_import(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = 'cargado' if self.loaded else 'diferido'
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def timed_import(name):
+    """Importar un módulo registrando su tiempo de carga"""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.setdefault(name, round((time.perf_counter() - started) * 1000, 2))
+    return module
+
+
+def lazy_import(name):
+    """Devolver un proxy diferido (uno por módulo)"""
+    with _lock:
+        proxy = _registry.get(name)
+        if proxy is None:
+            proxy = _registry[name] = LazyModule(name)
+    return proxy
+
+
+def warm_up(names=None, on_done=None):
+    """Importar en segundo plano los módulos diferidos registrados"""
+    def run():
+        for name in names or list(_registry):
+            try:
+                lazy_import(name)._load()
+            except Exception as e:
+                logger.error(f"Error precargando {name}: {e}")
+        if on_done:
+            on_done()
+
+    thread = threading.Thread(target=run, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def process_uptime_ms():
+    """Milisegundos desde que arrancó el proceso (Linux), o None"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return round((uptime - start_ticks / os.sysconf('SC_CLK_TCK')) * 1000, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def import_report():
+    """Desglose de importaciones para el endpoint de estado"""
+    return {
+        "import_ms": dict(sorted(IMPORT_TIMES.items(), key=lambda item: -item[1])),
+        "deferred": sorted(name for name, proxy in _registry.items() if not proxy.loaded)
+    }
+
+
+def importtime_breakdown(module='app', top=20):
+    """Ejecutar `python -X importtime` y devolver los módulos más lentos (acumulado, ms)"""
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else 'app'
+    print(f"{'acumulado ms':>13} {'propio ms':>10}  módulo")
+    for cumulative, own, name in importtime_breakdown(target):
+        print(f"{cumulative:>13.1f} {own:>10.1f}  {name}")
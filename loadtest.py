@@ -0,0 +1,231 @@
+"""
+Herramientas de prueba de carga contra una instancia local de la app.
+
+Conexiones inactivas + llamadas concurrentes (compara gunicorn y ASGI):
+    python loadtest.py idle --url http://127.0.0.1:8000 --idle 1000 --requests 500
+
+Dashboards abiertos: N clientes que repiten `loadDashboardData()` (status y
+statistics en paralelo, más trades o alerts según la pestaña) cada 30 s,
+con latencias por endpoint, errores y CPU/memoria del servidor (/api/metrics):
+    python loadtest.py dashboard --url http://127.0.0.1:8000 --clients 200 --duration 120
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# Peticiones de `loadDashboardData()` por pestaña (dashboard.py)
+DASHBOARD_TABS = {
+    "overview": ("/api/status", "/api/statistics"),
+    "trades": ("/api/status", "/api/statistics", "/api/trades?per_page=50"),
+    "alerts": ("/api/status", "/api/statistics", "/api/alerts?per_page=20&channel=html"),
+}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def _open_idle(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    return reader, writer
+
+
+def _decode_chunked(body):
+    decoded = b""
+    while body:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line.split(b";")[0] or b"0", 16)
+        if not size:
+            break
+        decoded += body[:size]
+        body = body[size + 2:]
+    return decoded
+
+
+async def _fetch(host, port, path):
+    """GET con conexión nueva: (código HTTP o tipo de fallo, latencia ms, cuerpo)"""
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 10)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 30)
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        if b"transfer-encoding: chunked" in head.lower():
+            body = _decode_chunked(body)
+    except asyncio.TimeoutError:
+        status, body = "timeout", b""
+    except OSError as e:
+        status, body = type(e).__name__, b""
+    except (ValueError, IndexError):
+        status, body = "respuesta inválida", b""
+    return status, (time.perf_counter() - started) * 1000, body
+
+
+async def _timed_get(host, port, path):
+    status, latency, _ = await _fetch(host, port, path)
+    return status == 200, latency
+
+
+async def idle_bench(url, idle, requests, path, idle_path):
+    """Abrir `idle` conexiones que no se cierran y medir `requests` GET concurrentes"""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    idle_conns = []
+    failed_idle = 0
+    for _ in range(idle):
+        try:
+            idle_conns.append(await asyncio.wait_for(_open_idle(host, port, idle_path), 5))
+        except (OSError, asyncio.TimeoutError):
+            failed_idle += 1
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_timed_get(host, port, path) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    for _, writer in idle_conns:
+        writer.close()
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+
+    print(f"conexiones inactivas abiertas: {len(idle_conns)} (fallidas: {failed_idle})")
+    print(f"{requests} GET {path} en {elapsed:.2f}s ({requests / elapsed:,.0f} req/s), errores: {errors}")
+    print(f"latencia ms p50={percentile(latencies, 0.5):.1f} "
+          f"p95={percentile(latencies, 0.95):.1f} p99={percentile(latencies, 0.99):.1f}")
+
+
+async def _dashboard_client(host, port, paths, interval, deadline, results, refreshes):
+    """Una pestaña abierta: carga inicial en un instante aleatorio y luego cada `interval` s"""
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        responses = await asyncio.gather(*(_fetch(host, port, path) for path in paths))
+        for path, (status, latency, _) in zip(paths, responses):
+            results[path].append((status, latency))
+        refreshes.append(max(latency for _, latency, _ in responses))
+        await asyncio.sleep(max(0.0, min(started + interval, deadline) - time.monotonic()))
+
+
+async def _sample_metrics(host, port, deadline, every, samples):
+    """Muestras de /api/metrics; con varios workers cada una es del que la atiende"""
+    while True:
+        status, _, body = await _fetch(host, port, "/api/metrics")
+        if status == 200:
+            samples.append((time.monotonic(), json.loads(body)))
+        if time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(min(every, max(0.0, deadline - time.monotonic())))
+
+
+def _server_report(samples):
+    """CPU media (% de un núcleo) y memoria por proceso entre la primera y la última muestra"""
+    by_pid = defaultdict(list)
+    for at, metrics in samples:
+        by_pid[metrics.get("pid")].append((at, metrics))
+    lines = []
+    for pid, points in by_pid.items():
+        (t0, first), (t1, last) = points[0], points[-1]
+        line = f"  pid {pid}: rss={last.get('rss_mb', '?')} MB pico={last.get('peak_rss_mb', '?')} MB " \
+               f"hilos={last.get('threads')}"
+        if "cpu_user_s" in first and t1 > t0:
+            cpu = (last["cpu_user_s"] + last["cpu_system_s"]) - (first["cpu_user_s"] + first["cpu_system_s"])
+            line += f" cpu={cpu / (t1 - t0) * 100:.1f}%"
+        cache = (first.get("cache"), last.get("cache"))
+        if all(cache):
+            hits = cache[1]["hits"] - cache[0]["hits"]
+            lookups = hits + cache[1]["misses"] - cache[0]["misses"]
+            if lookups:
+                line += f" caché={hits / lookups * 100:.1f}% aciertos"
+        lines.append(line)
+    return lines
+
+
+async def dashboard_bench(url, clients, duration, interval, tabs, sample_every):
+    """`clients` dashboards abiertos durante `duration` s, repartidos entre `tabs`"""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    deadline = time.monotonic() + duration
+    results = defaultdict(list)
+    refreshes = []
+    samples = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        _sample_metrics(host, port, deadline, sample_every, samples),
+        *(_dashboard_client(host, port, DASHBOARD_TABS[tabs[i % len(tabs)]], interval, deadline,
+                            results, refreshes)
+          for i in range(clients))
+    )
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(calls) for calls in results.values())
+    failures = defaultdict(int)
+    for calls in results.values():
+        for status, _ in calls:
+            if status != 200:
+                failures[status] += 1
+    errors = sum(failures.values())
+    print(f"{clients} dashboards ({', '.join(tabs)}) cada {interval:.0f}s durante {elapsed:.0f}s: "
+          f"{len(refreshes)} recargas, {total} peticiones ({total / elapsed:,.1f} req/s), "
+          f"errores: {errors} ({errors / total * 100 if total else 0:.2f}%)")
+    for path, calls in sorted(results.items()):
+        latencies = sorted(latency for status, latency in calls if status == 200)
+        failed = len(calls) - len(latencies)
+        print(f"  {path:40} n={len(calls):6} errores={failed / len(calls) * 100:5.2f}% "
+              f"p50={percentile(latencies, 0.5):7.1f} p95={percentile(latencies, 0.95):7.1f} "
+              f"p99={percentile(latencies, 0.99):7.1f} máx={latencies[-1] if latencies else float('nan'):7.1f} ms")
+    if failures:
+        print("  fallos: " + ", ".join(f"{kind}={count}" for kind, count in
+                                        sorted(failures.items(), key=lambda item: -item[1])))
+    refreshes.sort()
+    print(f"  {'loadDashboardData() completo':40} p50={percentile(refreshes, 0.5):.1f} "
+          f"p95={percentile(refreshes, 0.95):.1f} p99={percentile(refreshes, 0.99):.1f} ms")
+    if samples:
+        print(f"servidor ({len(samples)} muestras de /api/metrics):")
+        for line in _server_report(samples):
+            print(line)
+    else:
+        print("servidor: /api/metrics no disponible")
+    return 1 if total and errors / total > 0.01 else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pruebas de carga del dashboard")
+    sub = parser.add_subparsers(dest="command", required=True)
+    idle_parser = sub.add_parser("idle", help="conexiones inactivas + llamadas concurrentes")
+    idle_parser.add_argument("--url", default="http://127.0.0.1:8000")
+    idle_parser.add_argument("--idle", type=int, default=1000)
+    idle_parser.add_argument("--requests", type=int, default=500)
+    idle_parser.add_argument("--path", default="/api/status")
+    idle_parser.add_argument("--idle-path", default="/api/stream")
+    dashboard_parser = sub.add_parser("dashboard", help="N dashboards abiertos repitiendo loadDashboardData()")
+    dashboard_parser.add_argument("--url", default="http://127.0.0.1:8000")
+    dashboard_parser.add_argument("--clients", type=int, default=50)
+    dashboard_parser.add_argument("--duration", type=float, default=120.0)
+    dashboard_parser.add_argument("--interval", type=float, default=30.0, help="segundos entre recargas")
+    dashboard_parser.add_argument("--tabs", default="overview,trades,alerts",
+                                  help="pestañas abiertas, repartidas entre los clientes")
+    dashboard_parser.add_argument("--sample", type=float, default=5.0, help="segundos entre muestras de /api/metrics")
+    args = parser.parse_args(argv)
+    if args.command == "idle":
+        asyncio.run(idle_bench(args.url, args.idle, args.requests, args.path, args.idle_path))
+    elif args.command == "dashboard":
+        tabs = [tab for tab in args.tabs.split(",") if tab]
+        unknown = [tab for tab in tabs if tab not in DASHBOARD_TABS]
+        if unknown or not tabs:
+            parser.error(f"pestañas válidas: {', '.join(DASHBOARD_TABS)}")
+        return asyncio.run(dashboard_bench(args.url, args.clients, args.duration, args.interval,
+                                           tabs, args.sample))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
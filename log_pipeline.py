@@ -0,0 +1,279 @@
+"""
+Logging asíncrono y estructurado fuera del camino caliente.
+
+Los hilos que registran solo encolan el LogRecord (sin formatear) en una
+cola acotada; un único hilo (QueueListener) formatea y escribe. Si la cola
+está llena el registro se descarta y se cuenta, de modo que un disco o una
+consola lentos nunca frenan al escáner.
+
+- Formato lazy: los mensajes usan estilo `%` (`logger.info("... %s", x)`)
+  y solo se formatean en el hilo de escritura.
+- Muestreo: por debajo de WARNING, cada plantilla de mensaje admite como
+  mucho `sample_rate` registros por segundo; los suprimidos se anotan en el
+  siguiente que pasa (`"sampled": n`). WARNING y superiores no se muestrean.
+- Salida JSON (una línea por registro) o texto, según `LOG_FORMAT`.
+
+Benchmark del escáner con logging desactivado, síncrono y asíncrono:
+    python log_pipeline.py [candidatos]
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+# Atributos estándar de LogRecord; el resto viene de `extra=` y va al JSON
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de `extra=` al primer nivel"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Límite por plantilla de mensaje y segundo para los niveles por debajo de `min_level`"""
+
+    def __init__(self, rate=20, min_level=logging.WARNING, max_keys=10000):
+        super().__init__()
+        self.rate = rate
+        self.max_keys = max_keys
+        self.min_level = min_level
+        self.suppressed = 0
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.min_level or not self.rate:
+            return True
+        key = (record.name, record.msg)
+        second = int(record.created)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None and len(self._windows) >= self.max_keys:
+                # Mensajes ya formateados (f-strings) crean una clave por registro
+                self._windows = {k: w for k, w in self._windows.items() if w[0] == second}
+            if window is None or window[0] != second:
+                skipped = window[2] if window is not None else 0
+                self._windows[key] = [second, 1, 0]
+                if skipped:
+                    record.sampled = skipped
+                return True
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que no bloquea ni formatea: encola el registro o lo descarta"""
+
+    def __init__(self, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Sin formatear aquí (QueueHandler lo haría en el hilo que registra)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.enqueued += 1
+
+
+class LogPipeline:
+    """Cola acotada + hilo de escritura conectados al logger raíz"""
+
+    def __init__(self, level=logging.INFO, fmt="json", queue_size=10000, sample_rate=20, stream=None):
+        self.sink = logging.StreamHandler(stream or sys.stderr)
+        self.sink.setFormatter(
+            JsonFormatter() if fmt == "json" else logging.Formatter('%(levelname)s:%(name)s:%(message)s')
+        )
+        self.handler = BoundedQueueHandler(queue_size)
+        self.sampler = SamplingFilter(sample_rate)
+        self.handler.addFilter(self.sampler)
+        self.listener = logging.handlers.QueueListener(self.handler.queue, self.sink)
+        self.level = level
+        self.started = False
+        self._logger = None
+
+    def install(self, logger=None):
+        logger = logger or logging.getLogger()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(self.handler)
+        logger.setLevel(self.level)
+        if not self.started:
+            self.listener.start()
+            self.started = True
+        self._logger = logger
+        return self
+
+    def stop(self):
+        """Vaciar la cola, parar el hilo de escritura y desconectar el handler"""
+        if not self.started:
+            return
+        self.started = False
+        self._logger.removeHandler(self.handler)
+        self.listener.stop()
+
+    def stats(self):
+        return {
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.suppressed,
+            "queue_depth": self.handler.queue.qsize(),
+            "queue_size": self.handler.queue.maxsize
+        }
+
+
+_pipeline = None
+
+
+def setup_logging():
+    """
+    Configurar el logging del proceso una sola vez (LOG_LEVEL, LOG_FORMAT,
+    LOG_QUEUE_SIZE, LOG_SAMPLE_RATE) y devolver el pipeline.
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(
+            level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+            fmt=os.environ.get('LOG_FORMAT', 'json'),
+            queue_size=int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+            sample_rate=int(os.environ.get('LOG_SAMPLE_RATE', 20))
+        ).install()
+        atexit.register(_pipeline.stop)
+    return _pipeline
+
+
+def _scanner_throughput(candidates, log):
+    """Candidatos/s de un NetworkScanner cuyo handler registra cada trade como la app"""
+    from scanner import NetworkScanner
+
+    logger = logging.getLogger('bench')
+    done = threading.Event()
+    remaining = [candidates]
+    lock = threading.Lock()
+
+    def source(network):
+        for i in range(candidates):
+            yield {"symbol": f"T{i}", "address": f"0x{i:040x}", "confidence": 90.0, "pnl": i * 0.01}
+
+    def handler(candidate):
+        log(logger, candidate)
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    scanner = NetworkScanner('BENCH', source, handler, workers=4, rate_limit=1e9,
+                             poll_interval=3600, queue_size=candidates)
+    started = time.perf_counter()
+    scanner.start()
+    done.wait()
+    elapsed = time.perf_counter() - started
+    scanner.stop(timeout=1.0)
+    return candidates / elapsed
+
+
+def _reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    return root
+
+
+class _SlowStream:
+    """Destino lento (consola o recolector saturado): cada escritura tarda `delay` segundos"""
+
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    candidates = int(argv[0]) if argv else 50000
+    slow_delay = float(argv[1]) if len(argv) > 1 else 0.0002
+
+    def log_fstring(logger, c):
+        logger.info(f"💎 Gema generada: {c['symbol']} (Confianza: {c['confidence']}%, PnL: ${c['pnl']:.2f})")
+
+    def log_lazy(logger, c):
+        logger.info("💎 Gema generada: %s (Confianza: %s%%, PnL: $%.2f)", c['symbol'], c['confidence'], c['pnl'],
+                    extra={"token": c['symbol']})
+
+    rows = []
+    root = _reset_root()
+    root.setLevel(logging.WARNING)
+    rows.append(("sin logging", _scanner_throughput(candidates, log_lazy), None))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, delay in (("fichero", 0.0), (f"destino lento {slow_delay * 1e6:.0f} µs", slow_delay)):
+            with open(os.path.join(directory, 'sync.log'), 'w') as f:
+                stream = _SlowStream(f, delay) if delay else f
+                root = _reset_root()
+                root.addHandler(logging.StreamHandler(stream))
+                root.setLevel(logging.INFO)
+                rows.append((f"síncrono f-string, {label}", _scanner_throughput(candidates, log_fstring), None))
+                _reset_root()
+
+            for rate in (0, 20):
+                with open(os.path.join(directory, f'async-{rate}.log'), 'w') as f:
+                    stream = _SlowStream(f, delay) if delay else f
+                    _reset_root()
+                    pipeline = LogPipeline(sample_rate=rate, stream=stream).install()
+                    throughput = _scanner_throughput(candidates, log_lazy)
+                    stats = pipeline.stats()
+                    pipeline.stop()
+                    _reset_root()
+                sampling = f"muestreo {rate}/s" if rate else "sin muestreo"
+                rows.append((f"asíncrono JSON {sampling}, {label}", throughput, stats))
+
+    baseline = rows[0][1]
+    print(f"{candidates} candidatos por el escáner (4 workers), un registro INFO por candidato")
+    for name, throughput, stats in rows:
+        line = f"{name:48} {throughput:>9,.0f} candidatos/s ({throughput / baseline * 100:5.1f}%)"
+        if stats:
+            line += f"  encolados={stats['enqueued']} descartados={stats['dropped']} muestreados={stats['sampled_out']}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
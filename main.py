@@ -9,10 +9,19 @@ from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
-import threading
-import time
+import logging
 import random
 
+from log_pipeline import setup_logging
+from paper_trading import PaperBroker, realized_pnl, simulate_round_trip
+from supervisor import Supervisor
+from token_index import TokenIndex
+from vault import SECRET_FIELDS, SecretVault, is_masked, load_key, mask
+
+# Logging asíncrono (JSON por defecto, LOG_FORMAT=text para consola)
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # Configuración de la aplicación
 app = Flask(__name__, static_folder='static', static_url_path='')
 app.config['SECRET_KEY'] = 'crypto-bot-secret-key-2024'
@@ -27,7 +36,15 @@ db = SQLAlchemy(app)
 
 # Variable global para el estado del bot
 bot_running = False
-bot_thread = None
+
+# Ejecución simulada (comisión y slippage máximo por defecto de paper_trading)
+paper_broker = PaperBroker()
+
+# Índice de tokens para no recomprar la misma gema en cada ciclo
+token_index = TokenIndex(cooldown_seconds=3600)
+
+# Cifrado de las credenciales guardadas en la base de datos (clave en VAULT_KEY o instance/vault.key)
+vault = SecretVault(None, load_key(os.path.join(app.instance_path, 'vault.key')))
 
 # Modelos de base de datos
 class BotConfig(db.Model):
@@ -43,9 +60,10 @@ class BotConfig(db.Model):
     min_market_cap = db.Column(db.Float, default=10000.0)
     max_market_cap = db.Column(db.Float, default=100000.0)
     min_liquidity = db.Column(db.Float, default=50000.0)
-    binance_api_key = db.Column(db.String(255), default='test_binance_api_key_1234567890abcdef')
-    binance_api_secret = db.Column(db.String(255), default='test_binance_secret_abcdef1234567890')
-    telegram_bot_token = db.Column(db.String(255), default='1234567890:ABCDEFghijklmnopqrstuvwxyz123456789')
+    # Credenciales cifradas (token Fernet), nunca en claro
+    binance_api_key = db.Column(db.String(255))
+    binance_api_secret = db.Column(db.String(255))
+    telegram_bot_token = db.Column(db.String(255))
     telegram_chat_id = db.Column(db.String(255), default='622075030')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -61,51 +79,56 @@ class Trade(db.Model):
     status = db.Column(db.String(20), default='ACTIVE')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-# Función del bot de trading
-def trading_bot():
-    global bot_running
-    print("🤖 Bot de trading iniciado")
-    
-    while bot_running:
-        try:
-            with app.app_context():
-                # Simular detección de gemas
-                gems = [
-                    {"symbol": "PEPE", "confidence": 85, "market_cap": 50000, "liquidity": 75000},
-                    {"symbol": "SHIB", "confidence": 90, "market_cap": 25000, "liquidity": 100000},
-                    {"symbol": "DOGE", "confidence": 78, "market_cap": 80000, "liquidity": 120000},
-                    {"symbol": "FLOKI", "confidence": 82, "market_cap": 35000, "liquidity": 60000}
-                ]
+# Un ciclo del bot de trading (lo repite el supervisor cada 30 segundos)
+def scan_cycle():
+    with app.app_context():
+        # Simular detección de gemas
+        gems = [
+            {"symbol": "PEPE", "network": "ETH", "confidence": 85, "market_cap": 50000, "liquidity": 75000},
+            {"symbol": "SHIB", "network": "BSC", "confidence": 90, "market_cap": 25000, "liquidity": 100000},
+            {"symbol": "DOGE", "network": "SOL", "confidence": 78, "market_cap": 80000, "liquidity": 120000},
+            {"symbol": "FLOKI", "network": "BASE", "confidence": 82, "market_cap": 35000, "liquidity": 60000}
+        ]
+        
+        config = BotConfig.query.first()
+        if config and config.bot_enabled:
+            for gem in gems:
+                if token_index.should_skip(gem["symbol"]):
+                    continue
                 
-                config = BotConfig.query.first()
-                if config and config.bot_enabled:
-                    for gem in gems:
-                        if (gem["confidence"] >= config.min_confidence and 
-                            gem["market_cap"] >= config.min_market_cap and
-                            gem["market_cap"] <= config.max_market_cap and
-                            gem["liquidity"] >= config.min_liquidity):
-                            
-                            # Crear trade simulado
-                            trade = Trade(
-                                token_symbol=gem["symbol"],
-                                network="BSC",
-                                trade_type="BUY",
-                                entry_price=random.uniform(0.0001, 0.01),
-                                quantity=config.max_position_size / random.uniform(0.0001, 0.01),
-                                pnl=random.uniform(-50, 200)  # PnL simulado
-                            )
-                            db.session.add(trade)
-                            db.session.commit()
-                            print(f"💎 Gema detectada y comprada: {gem['symbol']} - PnL: ${trade.pnl:.2f}")
-                            break
-            
-            time.sleep(30)  # Esperar 30 segundos antes del próximo ciclo
-            
-        except Exception as e:
-            print(f"Error en bot: {e}")
-            time.sleep(10)
-    
-    print("🛑 Bot de trading detenido")
+                if (gem["confidence"] >= config.min_confidence and 
+                    gem["market_cap"] >= config.min_market_cap and
+                    gem["market_cap"] <= config.max_market_cap and
+                    gem["liquidity"] >= config.min_liquidity):
+                    
+                    # Trade simulado: fills de paper trading contra un libro con la liquidez de la gema
+                    entry, exit_fill, _ = simulate_round_trip(
+                        paper_broker, random.uniform(0.0001, 0.01), gem["liquidity"],
+                        config.max_position_size, gem["confidence"]
+                    )
+                    if entry.quantity <= 0:
+                        token_index.mark_rejected(gem["symbol"])
+                        continue
+                    trade = Trade(
+                        token_symbol=gem["symbol"],
+                        network=gem["network"],
+                        trade_type="BUY",
+                        entry_price=entry.avg_price,
+                        quantity=entry.quantity,
+                        pnl=round(realized_pnl(entry, exit_fill), 2)
+                    )
+                    db.session.add(trade)
+                    db.session.commit()
+                    token_index.mark_bought(gem["symbol"])
+                    logger.info("💎 Gema detectada y comprada: %s - PnL: $%.2f", gem['symbol'], trade.pnl,
+                                extra={"token": gem['symbol'], "trade_id": trade.id})
+                    break
+                else:
+                    token_index.mark_rejected(gem["symbol"])
+
+# Supervisor: reinicia el bucle del bot si su hilo muere o un ciclo se bloquea
+supervisor = Supervisor()
+bot_loop = supervisor.loop("trading_bot", scan_cycle, 30, budget=10, wanted=lambda: bot_running)
 
 # Inicializar base de datos
 def init_db():
@@ -128,14 +151,27 @@ def init_db():
                 min_market_cap=10000.0,
                 max_market_cap=100000.0,
                 min_liquidity=50000.0,
-                binance_api_key="test_binance_api_key_1234567890abcdef",
-                binance_api_secret="test_binance_secret_abcdef1234567890",
-                telegram_bot_token="1234567890:ABCDEFghijklmnopqrstuvwxyz123456789",
+                binance_api_key=vault.encrypt("test_binance_api_key_1234567890abcdef"),
+                binance_api_secret=vault.encrypt("test_binance_secret_abcdef1234567890"),
+                telegram_bot_token=vault.encrypt("1234567890:ABCDEFghijklmnopqrstuvwxyz123456789"),
                 telegram_chat_id="622075030"
             )
             db.session.add(config)
             db.session.commit()
-            print("✅ Configuración completa creada")
+            logger.info("✅ Configuración completa creada")
+        else:
+            # Bases de datos anteriores al cifrado: cifrar las credenciales en claro
+            plaintext = [field for field in SECRET_FIELDS
+                         if getattr(config, field) and not vault.is_token(getattr(config, field))]
+            for field in plaintext:
+                setattr(config, field, vault.encrypt(getattr(config, field)))
+            if plaintext:
+                db.session.commit()
+                logger.info("🔐 %d credenciales cifradas en la base de datos", len(plaintext))
+
+def masked_secret(token):
+    """Credencial enmascarada para la API (nunca se devuelve el valor)"""
+    return mask(vault.decrypt(token)) if token else ""
 
 # Rutas principales
 @app.route('/')
@@ -160,9 +196,9 @@ def get_config():
         "min_market_cap": config.min_market_cap,
         "max_market_cap": config.max_market_cap,
         "min_liquidity": config.min_liquidity,
-        "binance_api_key": config.binance_api_key,
-        "binance_api_secret": config.binance_api_secret,
-        "telegram_bot_token": config.telegram_bot_token,
+        "binance_api_key": masked_secret(config.binance_api_key),
+        "binance_api_secret": masked_secret(config.binance_api_secret),
+        "telegram_bot_token": masked_secret(config.telegram_bot_token),
         "telegram_chat_id": config.telegram_chat_id
     })
 
@@ -188,13 +224,16 @@ def save_config():
         config.min_market_cap = float(data.get('min_market_cap', 10000))
         config.max_market_cap = float(data.get('max_market_cap', 100000))
         config.min_liquidity = float(data.get('min_liquidity', 50000))
-        config.binance_api_key = data.get('binance_api_key', '')
-        config.binance_api_secret = data.get('binance_api_secret', '')
-        config.telegram_bot_token = data.get('telegram_bot_token', '')
+        for field in SECRET_FIELDS:
+            value = data.get(field, '')
+            # El valor enmascarado que devuelve el GET deja la credencial como estaba
+            if not is_masked(value):
+                setattr(config, field, vault.encrypt(value) if value else '')
         config.telegram_chat_id = data.get('telegram_chat_id', '')
         config.updated_at = datetime.utcnow()
         
         db.session.commit()
+        token_index.clear_rejected()
         return jsonify({"message": "Configuración guardada exitosamente"})
         
     except Exception as e:
@@ -211,18 +250,19 @@ def get_status():
     active_positions = Trade.query.filter_by(status='ACTIVE').count()
     
     return jsonify({
-        "is_running": bot_running,
+        "is_running": bot_running and bot_loop.alive(),
         "total_capital": config.total_capital if config else 0,
         "available_capital": (config.total_capital - (active_positions * config.max_position_size)) if config else 0,
         "trades_today": trades_today,
         "total_pnl": total_pnl,
         "active_positions": active_positions,
-        "win_rate": 65.5  # Simulado
+        "win_rate": 65.5,  # Simulado
+        "supervisor": supervisor.summary()
     })
 
 @app.route('/api/trading/start', methods=['POST'])
 def start_bot():
-    global bot_running, bot_thread
+    global bot_running
     
     try:
         config = BotConfig.query.first()
@@ -236,9 +276,9 @@ def start_bot():
             return jsonify({"message": "Bot ya está ejecutándose"})
         
         bot_running = True
-        bot_thread = threading.Thread(target=trading_bot)
-        bot_thread.daemon = True
-        bot_thread.start()
+        bot_loop.start()
+        supervisor.start()
+        logger.info("🤖 Bot de trading iniciado")
         
         return jsonify({"message": "Bot iniciado correctamente"})
         
@@ -251,6 +291,7 @@ def stop_bot():
     
     try:
         bot_running = False
+        logger.info("🛑 Bot de trading detenido")
         return jsonify({"message": "Bot detenido correctamente"})
         
     except Exception as e:
@@ -296,6 +337,6 @@ def get_trades():
 
 if __name__ == '__main__':
     init_db()
-    print("🚀 Iniciando Crypto Trading Bot Dashboard...")
+    logger.info("🚀 Iniciando Crypto Trading Bot Dashboard...")
     app.run(host='0.0.0.0', port=5000, debug=False)
 
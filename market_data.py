@@ -0,0 +1,143 @@
+"""
+Caché local de datos de mercado en ficheros columnares mapeados en memoria.
+
+Cada símbolo tiene un directorio con un fichero binario por columna OHLCV
+(`ts` en int64 ordenado, el resto en float64) y un `meta.json` con los
+metadatos del par. Las lecturas devuelven vistas `numpy.memmap` sin copiar
+ni parsear nada; el índice temporal es la propia columna `ts` ordenada
+(búsqueda binaria con `searchsorted`).
+"""
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+COLUMNS = (
+    ("ts", np.dtype('<i8')),
+    ("open", np.dtype('<f8')),
+    ("high", np.dtype('<f8')),
+    ("low", np.dtype('<f8')),
+    ("close", np.dtype('<f8')),
+    ("volume", np.dtype('<f8')),
+)
+
+_SYMBOL_RE = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}$')
+
+
+class MarketDataCache:
+    """Caché columnar por símbolo con soporte de append y lecturas zero-copy"""
+
+    def __init__(self, root):
+        self.root = root
+        self._maps = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, symbol):
+        if not _SYMBOL_RE.match(symbol):
+            raise ValueError(f"Símbolo inválido: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _path(self, symbol, column):
+        return os.path.join(self._dir(symbol), f"{column}.bin")
+
+    def symbols(self):
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def __len__(self):
+        return len(self.symbols())
+
+    def length(self, symbol):
+        """Número de barras completas (la columna más corta manda tras un corte)"""
+        lengths = []
+        for column, dtype in COLUMNS:
+            try:
+                lengths.append(os.path.getsize(self._path(symbol, column)) // dtype.itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(lengths)
+
+    def append(self, symbol, ts, opens, highs, lows, closes, volumes):
+        """
+        Añadir barras (arrays o escalares) al final de la serie.
+        Los timestamps deben ser crecientes y posteriores al último guardado.
+        """
+        values = dict(zip((name for name, _ in COLUMNS), (ts, opens, highs, lows, closes, volumes)))
+        arrays = {name: np.atleast_1d(np.asarray(values[name], dtype=dtype)) for name, dtype in COLUMNS}
+        count = len(arrays["ts"])
+        if any(len(array) != count for array in arrays.values()):
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+        if count == 0:
+            return 0
+        if count > 1 and np.any(np.diff(arrays["ts"]) <= 0):
+            raise ValueError("Los timestamps deben ser estrictamente crecientes")
+
+        with self._lock:
+            os.makedirs(self._dir(symbol), exist_ok=True)
+            length = self.length(symbol)
+            if length:
+                last_ts = self._column(symbol, "ts", length)[-1]
+                if arrays["ts"][0] <= last_ts:
+                    raise ValueError(f"Timestamp {arrays['ts'][0]} no posterior al último ({last_ts})")
+            for name, dtype in COLUMNS:
+                path = self._path(symbol, name)
+                with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                    # Recortar restos de un append interrumpido antes de escribir
+                    f.truncate(length * dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(arrays[name].tobytes())
+            self._maps.pop(symbol, None)
+        return count
+
+    def _column(self, symbol, column, length):
+        cached = self._maps.get(symbol)
+        if cached is None or cached[0] != length:
+            dtype = dict(COLUMNS)
+            maps = {
+                name: np.memmap(self._path(symbol, name), dtype=dtype[name], mode='r', shape=(length,))
+                for name, _ in COLUMNS
+            }
+            cached = self._maps[symbol] = (length, maps)
+        return cached[1][column]
+
+    def read(self, symbol, start=None, end=None):
+        """
+        Vistas de solo lectura de las columnas en [start, end) (timestamps).
+        Devuelve un dict columna -> numpy.memmap, sin copias.
+        """
+        with self._lock:
+            length = self.length(symbol)
+            if length == 0:
+                return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+            ts = self._column(symbol, "ts", length)
+            lo = 0 if start is None else int(np.searchsorted(ts, start, side='left'))
+            hi = length if end is None else int(np.searchsorted(ts, end, side='left'))
+            return {name: self._column(symbol, name, length)[lo:hi] for name, _ in COLUMNS}
+
+    def last(self, symbol, count=1):
+        """Últimas `count` barras"""
+        with self._lock:
+            length = self.length(symbol)
+            lo = max(0, length - count)
+            if length == 0:
+                return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+            return {name: self._column(symbol, name, length)[lo:] for name, _ in COLUMNS}
+
+    def set_metadata(self, symbol, metadata):
+        """Guardar metadatos del par (red, contrato, decimales...)"""
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        path = os.path.join(self._dir(symbol), 'meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, path)
+
+    def metadata(self, symbol):
+        try:
+            with open(os.path.join(self._dir(symbol), 'meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
@@ -0,0 +1,189 @@
+"""
+Generador de mercado sintético determinista (con semilla) para pruebas de carga.
+
+Produce lanzamientos de tokens, ticks de precio y cambios de liquidez como
+procesos de Poisson en tiempo simulado. La misma semilla y los mismos
+parámetros generan exactamente la misma secuencia, así que dos ejecuciones
+del escáner, los almacenes o el dashboard se pueden comparar.
+
+Uso:
+    python market_sim.py --seed 42 --events 1000000 --out mercado.csv
+    python market_sim.py --seed 42 --events 200000            # solo mide el ritmo
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+
+MarketEvent = namedtuple('MarketEvent', [
+    'ts', 'kind', 'network', 'address', 'symbol', 'price', 'liquidity', 'market_cap', 'confidence', 'qty'
+])
+
+LAUNCH, TICK, LIQUIDITY = 'launch', 'tick', 'liquidity'
+NETWORKS = ('BSC', 'ETH', 'SOL', 'BASE')
+_SYLLABLES = ('PE', 'PE', 'SHI', 'BA', 'FLO', 'KI', 'DO', 'GE', 'BON', 'MOON', 'CHAD', 'WO', 'JAK', 'ME', 'ZZ', 'TO', 'RA')
+
+
+class SyntheticMarket:
+    """
+    Mercado sintético con semilla; las tasas son eventos por segundo simulado.
+    Con todas las tasas a 0 el mercado está parado: `advance` solo mueve el reloj.
+    """
+
+    def __init__(self, seed=42, launch_rate=5.0, tick_rate=1000.0, liquidity_rate=50.0,
+                 networks=NETWORKS, start_ts=1700000000.0, max_active=10000, volatility=0.02):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.launch_rate = float(launch_rate)
+        self.tick_rate = float(tick_rate)
+        self.liquidity_rate = float(liquidity_rate)
+        self.networks = tuple(networks)
+        self.now = float(start_ts)
+        self.max_active = max_active
+        self.volatility = volatility
+        if min(self.launch_rate, self.tick_rate, self.liquidity_rate) < 0:
+            raise ValueError("Las tasas de eventos no pueden ser negativas")
+        self.total_rate = self.launch_rate + self.tick_rate + self.liquidity_rate
+        self._tokens = []
+        self._cursor = 0
+        self.generated = 0
+
+    def _launch(self):
+        rng = self.rng
+        symbol = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3)))
+        price = 10 ** rng.uniform(-7, -2)
+        liquidity = round(math.exp(rng.gauss(11.5, 1.0)), 0)
+        supply = 10 ** rng.uniform(8, 12)
+        token = [
+            rng.choice(self.networks),
+            f"0x{rng.getrandbits(160):040x}",
+            symbol,
+            price,
+            liquidity,
+            supply
+        ]
+        if len(self._tokens) < self.max_active:
+            self._tokens.append(token)
+        else:
+            # Se reemplaza el token más antiguo (ventana circular)
+            self._tokens[self._cursor] = token
+            self._cursor = (self._cursor + 1) % self.max_active
+        confidence = round(min(99.0, max(50.0, rng.gauss(82, 8))), 1)
+        return MarketEvent(self.now, LAUNCH, token[0], token[1], symbol, price, liquidity,
+                           round(price * supply, 0), confidence, 0.0)
+
+    def _tick(self):
+        rng = self.rng
+        token = self._tokens[int(rng.random() * len(self._tokens))]
+        token[3] *= math.exp(rng.gauss(0.0, self.volatility))
+        qty = rng.expovariate(1.0) * token[4] / token[3] * 0.001
+        return MarketEvent(self.now, TICK, token[0], token[1], token[2], token[3], token[4],
+                           round(token[3] * token[5], 0), None, qty)
+
+    def _liquidity(self):
+        rng = self.rng
+        token = self._tokens[int(rng.random() * len(self._tokens))]
+        token[4] = max(0.0, round(token[4] * math.exp(rng.gauss(0.0, 0.1)), 0))
+        return MarketEvent(self.now, LIQUIDITY, token[0], token[1], token[2], token[3], token[4],
+                           round(token[3] * token[5], 0), None, 0.0)
+
+    def next_event(self):
+        if not self.total_rate:
+            raise ValueError("Mercado sin eventos (todas las tasas son 0)")
+        rng = self.rng
+        self.now += rng.expovariate(self.total_rate)
+        self.generated += 1
+        pick = rng.random() * self.total_rate
+        if pick < self.launch_rate or not self._tokens:
+            return self._launch()
+        if pick < self.launch_rate + self.tick_rate:
+            return self._tick()
+        return self._liquidity()
+
+    def events(self, count=None):
+        """Flujo de eventos (infinito si `count` es None)"""
+        produced = 0
+        while count is None or produced < count:
+            yield self.next_event()
+            produced += 1
+
+    def advance(self, seconds):
+        """Eventos hasta avanzar `seconds` de tiempo simulado"""
+        until = self.now + seconds
+        if not self.total_rate:
+            self.now = until
+            return []
+        batch = []
+        while True:
+            event = self.next_event()
+            batch.append(event)
+            if event.ts >= until:
+                return batch
+
+    def stream(self, events_per_second, count=None):
+        """Flujo al ritmo indicado en tiempo real (para pruebas de carga)"""
+        started = time.perf_counter()
+        for i, event in enumerate(self.events(count)):
+            ahead = i / events_per_second - (time.perf_counter() - started)
+            if ahead > 0.001:
+                time.sleep(ahead)
+            yield event
+
+
+def write_events(path, events):
+    """Guardar eventos en CSV; devuelve cuántos se escribieron"""
+    count = 0
+    events = iter(events)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(MarketEvent._fields)
+        while True:
+            chunk = list(itertools.islice(events, 10000))
+            if not chunk:
+                return count
+            writer.writerows(chunk)
+            count += len(chunk)
+
+
+def read_events(path):
+    """Leer eventos guardados con `write_events`"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for ts, kind, network, address, symbol, price, liquidity, market_cap, confidence, qty in reader:
+            yield MarketEvent(float(ts), kind, network, address, symbol, float(price), float(liquidity),
+                              float(market_cap), float(confidence) if confidence else None, float(qty))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de mercado sintético con semilla")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--launch-rate', type=float, default=5.0)
+    parser.add_argument('--tick-rate', type=float, default=1000.0)
+    parser.add_argument('--liquidity-rate', type=float, default=50.0)
+    parser.add_argument('--out', help="fichero CSV de salida ('-' para stdout)")
+    args = parser.parse_args(argv)
+
+    market = SyntheticMarket(args.seed, args.launch_rate, args.tick_rate, args.liquidity_rate)
+    started = time.perf_counter()
+    if args.out == '-':
+        writer = csv.writer(sys.stdout)
+        for event in market.events(args.events):
+            writer.writerow(event)
+        return
+    if args.out:
+        count = write_events(args.out, market.events(args.events))
+    else:
+        count = sum(1 for _ in market.events(args.events))
+    elapsed = time.perf_counter() - started
+    print(f"{count} eventos en {elapsed:.2f}s ({count / elapsed:,.0f} eventos/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
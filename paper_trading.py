@@ -0,0 +1,142 @@
+"""
+Paper trading: ejecución simulada contra un libro de órdenes.
+
+Las órdenes de mercado recorren los niveles del libro (simulado a partir de
+la liquidez del par, o grabado), con slippage, comisiones y fills parciales
+cuando no hay profundidad suficiente dentro del slippage máximo.
+
+Benchmark:
+    python paper_trading.py [num_trades]
+"""
+
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+
+Fill = namedtuple('Fill', [
+    'side', 'requested', 'quantity', 'avg_price', 'notional', 'fee', 'slippage_pct', 'partial'
+])
+
+
+class OrderBook:
+    """Libro de órdenes: niveles (precio, cantidad) ordenados del mejor al peor"""
+
+    __slots__ = ('bids', 'asks')
+
+    def __init__(self, bids, asks):
+        self.bids = bids
+        self.asks = asks
+
+    @classmethod
+    def from_levels(cls, bids, asks):
+        """Libro grabado: listas de (precio, cantidad) en cualquier orden"""
+        return cls(sorted(bids, key=lambda level: -level[0]), sorted(asks, key=lambda level: level[0]))
+
+    @classmethod
+    def simulate(cls, mid, liquidity_usd, levels=20, spread_pct=0.5, step_pct=0.5, rng=random):
+        """
+        Libro sintético alrededor de `mid`: la mitad de la liquidez en cada lado,
+        con más profundidad en los niveles alejados del precio medio.
+        """
+        half_spread = spread_pct / 200
+        step = step_pct / 100
+        weights = [1.0 + 0.15 * i for i in range(levels)]
+        total = sum(weights)
+        side_usd = liquidity_usd / 2
+        bids, asks = [], []
+        for i, weight in enumerate(weights):
+            jitter = 0.8 + 0.4 * rng.random()
+            usd = side_usd * weight / total * jitter
+            bid = mid * (1 - half_spread - step * i)
+            ask = mid * (1 + half_spread + step * i)
+            bids.append((bid, usd / bid))
+            asks.append((ask, usd / ask))
+        return cls(bids, asks)
+
+    @property
+    def mid(self):
+        return (self.bids[0][0] + self.asks[0][0]) / 2
+
+
+class PaperBroker:
+    """Ejecución simulada de órdenes de mercado"""
+
+    def __init__(self, fee_pct=0.25, max_slippage_pct=5.0):
+        self.fee_pct = float(fee_pct)
+        self.max_slippage_pct = float(max_slippage_pct)
+
+    def market_buy(self, book, notional):
+        """Comprar por un importe en USD recorriendo los asks"""
+        reference = book.asks[0][0]
+        limit = reference * (1 + self.max_slippage_pct / 100)
+        budget = float(notional) / (1 + self.fee_pct / 100)
+        spent = quantity = 0.0
+        for price, size in book.asks:
+            if price > limit or spent >= budget:
+                break
+            take = min(size, (budget - spent) / price)
+            spent += take * price
+            quantity += take
+        return self._fill('BUY', notional, quantity, spent, reference, spent < budget * 0.999)
+
+    def market_sell(self, book, quantity):
+        """Vender una cantidad de tokens recorriendo los bids"""
+        reference = book.bids[0][0]
+        limit = reference * (1 - self.max_slippage_pct / 100)
+        remaining = float(quantity)
+        proceeds = sold = 0.0
+        for price, size in book.bids:
+            if price < limit or remaining <= 0:
+                break
+            take = min(size, remaining)
+            proceeds += take * price
+            sold += take
+            remaining -= take
+        return self._fill('SELL', quantity, sold, proceeds, reference, remaining > quantity * 0.001)
+
+    def _fill(self, side, requested, quantity, notional, reference, partial):
+        if quantity <= 0:
+            return Fill(side, requested, 0.0, 0.0, 0.0, 0.0, 0.0, True)
+        avg_price = notional / quantity
+        fee = notional * self.fee_pct / 100
+        slippage = abs(avg_price - reference) / reference * 100
+        return Fill(side, requested, quantity, avg_price, notional, fee, slippage, partial)
+
+
+def simulate_round_trip(broker, mid, liquidity, notional, confidence, rng=random):
+    """
+    Entrada y salida simuladas de una posición.
+    La deriva del precio depende de la confianza (mayor confianza = mejor
+    resultado medio); devuelve (fill_entrada, fill_salida, precio_salida).
+    """
+    entry = broker.market_buy(OrderBook.simulate(mid, liquidity, rng=rng), notional)
+    drift = (confidence - 85) / 100
+    exit_mid = mid * math.exp(rng.gauss(drift, 0.35))
+    exit_liquidity = liquidity * math.exp(rng.gauss(0, 0.2))
+    exit_fill = broker.market_sell(OrderBook.simulate(exit_mid, exit_liquidity, rng=rng), entry.quantity)
+    return entry, exit_fill, exit_mid
+
+
+def realized_pnl(entry, exit_fill):
+    """PnL neto de comisiones (lo no vendido se valora a 0 por prudencia)"""
+    return exit_fill.notional - exit_fill.fee - entry.notional - entry.fee
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(42)
+    broker = PaperBroker()
+    started = time.perf_counter()
+    total = 0.0
+    partials = 0
+    for _ in range(count):
+        entry, exit_fill, _ = simulate_round_trip(
+            broker, rng.uniform(1e-6, 1e-2), rng.uniform(20000, 500000), 300.0, rng.uniform(80, 98), rng
+        )
+        total += realized_pnl(entry, exit_fill)
+        partials += entry.partial or exit_fill.partial
+    elapsed = time.perf_counter() - started
+    print(f"{count} trades ida y vuelta en {elapsed:.2f}s ({count / elapsed:,.0f} trades/s)")
+    print(f"PnL total: ${total:,.2f} | fills parciales: {partials}")
@@ -0,0 +1,50 @@
+"""
+Token bucket seguro entre hilos.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Cubo de tokens: `rate` tokens por segundo con ráfagas de hasta `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens=1.0):
+        """Consumir sin esperar; devuelve False si no hay tokens"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens=1.0):
+        """Segundos hasta que haya `tokens` disponibles"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+            return 0.0 if missing <= 0 else missing / self.rate
+
+    def acquire(self, tokens=1.0, stop_event=None):
+        """Esperar hasta consumir `tokens`; devuelve False si se activa `stop_event`"""
+        while not self.try_acquire(tokens):
+            delay = max(0.001, self.wait_time(tokens))
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+        return True
@@ -0,0 +1,167 @@
+"""
+Protección de los endpoints de control (start/stop/config).
+
+- Límite por cliente con un token bucket (`rate_limit.TokenBucket`).
+- Coalescencia por clave de idempotencia: peticiones concurrentes con la
+  misma clave ejecutan la vista una sola vez y todas reciben la misma
+  respuesta. Con la cabecera `Idempotency-Key` el resultado se conserva
+  `key_ttl` segundos y los reintentos lo reciben sin volver a ejecutar; sin
+  ella, la clave se deriva del endpoint, el cliente y el cuerpo y solo se
+  agrupan las peticiones simultáneas (el doble clic), para que un
+  stop → start → stop legítimo no reciba una respuesta antigua.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, jsonify, make_response, request
+
+from rate_limit import TokenBucket
+
+
+class ClientRateLimiter:
+    """Un token bucket por cliente (y endpoint), con expulsión LRU de los antiguos"""
+
+    def __init__(self, rate=1.0, burst=5, max_clients=4096):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, client):
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket
+
+    def check(self, client):
+        """0 si se permite la petición; si no, segundos hasta poder reintentar"""
+        bucket = self._bucket(client)
+        if bucket.try_acquire():
+            return 0.0
+        return max(bucket.wait_time(), 0.001)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'expires')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.expires = None
+
+
+class Coalescer:
+    """Ejecuta una sola vez cada clave; los duplicados esperan y reutilizan el resultado"""
+
+    def __init__(self, max_keys=1024):
+        self.max_keys = max_keys
+        self._calls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, key, fn, ttl):
+        """Devuelve (resultado, reutilizado)"""
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.expires is not None and call.expires <= now:
+                del self._calls[key]
+                call = None
+            owner = call is None
+            if owner:
+                call = self._calls[key] = _Call()
+                while len(self._calls) > self.max_keys:
+                    self._calls.popitem(last=False)
+        if not owner:
+            call.done.wait()
+            return call.result, True
+        try:
+            call.result = fn()
+        finally:
+            with self._lock:
+                call.expires = time.monotonic() + ttl
+                if ttl <= 0 or call.result is None:
+                    self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class ControlGuard:
+    """Límite por cliente + idempotencia para vistas Flask de control"""
+
+    def __init__(self, rate=1.0, burst=5, key_ttl=600.0):
+        self.limiter = ClientRateLimiter(rate, burst)
+        self.coalescer = Coalescer()
+        self.key_ttl = key_ttl
+        self._stats_lock = threading.Lock()
+        self.stats = {"executed": 0, "coalesced": 0, "rate_limited": 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def client_id():
+        # Solo remote_addr: X-Forwarded-For lo controla el cliente. Detrás de
+        # un proxy, ProxyFix (TRUSTED_PROXY_HOPS) ya pone aquí la IP real
+        return request.remote_addr or 'unknown'
+
+    def summary(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def protect(self, scope):
+        """
+        Decorador para vistas de control.
+        Las respuestas 5xx no se guardan: el siguiente intento vuelve a ejecutar.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                client = self.client_id()
+                retry_after = self.limiter.check((scope, client))
+                if retry_after:
+                    self._count("rate_limited")
+                    response = jsonify({"error": "Demasiadas peticiones, inténtalo más tarde"})
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(int(retry_after) + 1)
+                    return response
+
+                explicit_key = request.headers.get('Idempotency-Key')
+                if explicit_key:
+                    key = (scope, client, explicit_key)
+                    ttl = self.key_ttl
+                else:
+                    key = (scope, client, hashlib.blake2b(request.get_data(), digest_size=16).digest())
+                    ttl = 0
+
+                def execute():
+                    response = make_response(view(*args, **kwargs))
+                    return response.get_data(), response.status_code
+
+                result, replayed = self.coalescer.run(key, execute, ttl)
+                if result is None:
+                    return jsonify({"error": "Error ejecutando la operación"}), 500
+                self._count("coalesced" if replayed else "executed")
+                body, status = result
+                if status >= 500:
+                    self.coalescer.forget(key)
+                response = Response(body, status=status, mimetype='application/json')
+                if replayed:
+                    response.headers['Idempotent-Replayed'] = 'true'
+                return response
+            return wrapper
+        return decorator
@@ -0,0 +1,100 @@
+"""
+Caché de respuestas HTTP para los endpoints de lectura.
+
+Cada entrada se guarda ya serializada junto con la versión de las
+etiquetas de estado de las que depende (trades, alerts, config...). Un
+evento de estado incrementa la versión de sus etiquetas, de modo que las
+entradas afectadas dejan de ser válidas en el acto sin recorrer la caché.
+Expulsión LRU y métricas de aciertos/fallos.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, make_response, request
+
+
+class ResponseCache:
+    """Caché LRU de respuestas con invalidación por etiquetas"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+
+    def versions(self, tags):
+        return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def invalidate(self, *tags):
+        """Invalidar todas las respuestas que dependen de `tags`"""
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            self.stats["invalidations"] += 1
+
+    def get(self, key, tags):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            versions, expires, body, status = entry
+            if versions != self.versions(tags) or (expires is not None and expires <= time.monotonic()):
+                del self._entries[key]
+                self.stats["stale"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return body, status
+
+    def put(self, key, versions, ttl, body, status):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (versions, expires, body, status)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.stats["hits"] / lookups * 100, 1) if lookups else 0.0,
+                **self.stats
+            }
+
+    def cached(self, *tags, ttl=None):
+        """
+        Decorador para vistas Flask de solo lectura.
+        La clave es la ruta más los argumentos de la query; solo se cachean
+        respuestas 200.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                key = (request.path, tuple(sorted(request.args.items(multi=True))))
+                hit = self.get(key, tags)
+                if hit is not None:
+                    body, status = hit
+                    return Response(body, status=status, mimetype='application/json')
+                # Versión tomada antes de calcular: si llega un evento mientras
+                # tanto, la entrada nace caducada y no se sirve
+                versions = self.versions(tags)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    self.put(key, versions, ttl, response.get_data(), response.status_code)
+                return response
+            return wrapper
+        return decorator
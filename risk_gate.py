@@ -0,0 +1,101 @@
+"""
+Control de riesgo previo a cada trade.
+
+Aplica `max_daily_trades`, `max_position_size` y `total_capital` con
+contadores diarios (reinicio a medianoche UTC) y capital reservado por
+posición. Cada decisión es O(1) y se toma en una sección crítica mínima,
+de modo que varios workers del escáner nunca sobre-suscriben el capital.
+"""
+
+import threading
+from datetime import datetime, timezone
+
+
+def _utc_day(now=None):
+    now = now or datetime.now(timezone.utc)
+    return now.date().toordinal()
+
+
+class RiskGate:
+    """Contadores de trades diarios y capital reservado"""
+
+    def __init__(self, max_daily_trades=4, total_capital=2000.0, max_position_size=300.0):
+        self._lock = threading.Lock()
+        self._reservations = {}
+        self._reserved = 0.0
+        self._day = _utc_day()
+        self._daily_trades = 0
+        self.rejections = {"daily_limit": 0, "position_size": 0, "capital": 0}
+        self.configure(max_daily_trades, total_capital, max_position_size)
+
+    def configure(self, max_daily_trades, total_capital, max_position_size):
+        """Actualizar límites (los valores pueden venir como texto desde el formulario)"""
+        with self._lock:
+            self.max_daily_trades = int(max_daily_trades)
+            self.total_capital = float(total_capital)
+            self.max_position_size = float(max_position_size)
+
+    def _roll_day(self, now=None):
+        day = _utc_day(now)
+        if day != self._day:
+            self._day = day
+            self._daily_trades = 0
+
+    def try_reserve(self, trade_id, amount, now=None):
+        """
+        Reservar capital para un trade nuevo.
+        Devuelve None si se aprueba o el motivo del rechazo.
+        """
+        amount = float(amount)
+        with self._lock:
+            self._roll_day(now)
+            if self._daily_trades >= self.max_daily_trades:
+                reason = "daily_limit"
+            elif amount > self.max_position_size:
+                reason = "position_size"
+            elif self._reserved + amount > self.total_capital:
+                reason = "capital"
+            else:
+                self._daily_trades += 1
+                self._reservations[trade_id] = amount
+                self._reserved += amount
+                return None
+            self.rejections[reason] += 1
+            return reason
+
+    def release(self, trade_id):
+        """Liberar el capital de una posición cerrada"""
+        with self._lock:
+            amount = self._reservations.pop(trade_id, None)
+            if amount is not None:
+                self._reserved = max(0.0, self._reserved - amount)
+            return amount
+
+    def adjust(self, trade_id, amount):
+        """Ajustar la reserva al importe realmente ejecutado (fills parciales)"""
+        with self._lock:
+            previous = self._reservations.get(trade_id)
+            if previous is not None:
+                self._reservations[trade_id] = float(amount)
+                self._reserved = max(0.0, self._reserved - previous + float(amount))
+
+    def restore(self, trade_id, amount=None, counts_today=False):
+        """Recargar una posición tras reiniciar (sin volver a aplicar límites)"""
+        with self._lock:
+            if counts_today:
+                self._daily_trades += 1
+            if amount is not None and trade_id not in self._reservations:
+                self._reservations[trade_id] = float(amount)
+                self._reserved += float(amount)
+
+    def snapshot(self, now=None):
+        with self._lock:
+            self._roll_day(now)
+            return {
+                "daily_trades": self._daily_trades,
+                "max_daily_trades": self.max_daily_trades,
+                "reserved_capital": round(self._reserved, 2),
+                "available_capital": round(max(0.0, self.total_capital - self._reserved), 2),
+                "open_reservations": len(self._reservations),
+                "rejections": dict(self.rejections)
+            }
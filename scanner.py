@@ -0,0 +1,240 @@
+"""
+Escáner multi-red con un pool de workers por cadena.
+
+Cada red (BSC, Ethereum, Solana, Base) tiene su propio hilo de ingesta, su
+cola acotada, su pool de workers y su límite de peticiones, de modo que una
+cadena lenta no frena la detección en las rápidas.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from rate_limit import TokenBucket
+from supervisor import Heartbeat
+
+logger = logging.getLogger(__name__)
+
+# Parámetros por red: workers, peticiones/s al proveedor, segundos entre sondeos
+DEFAULT_NETWORKS = {
+    "BSC": {"workers": 2, "rate_limit": 10.0, "poll_interval": 3.0, "queue_size": 1000},
+    "ETH": {"workers": 2, "rate_limit": 5.0, "poll_interval": 12.0, "queue_size": 1000},
+    "SOL": {"workers": 4, "rate_limit": 20.0, "poll_interval": 1.0, "queue_size": 5000},
+    "BASE": {"workers": 2, "rate_limit": 10.0, "poll_interval": 2.0, "queue_size": 1000},
+}
+
+
+class NetworkScanner:
+    """Ingesta + cola + workers de una sola red"""
+
+    def __init__(self, network, source, handler, workers=2, rate_limit=10.0,
+                 poll_interval=2.0, queue_size=1000, cycle_budget=5.0):
+        self.network = network
+        self.source = source
+        self.handler = handler
+        self.num_workers = workers
+        self.poll_interval = poll_interval
+        self.limiter = TokenBucket(rate_limit)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self._started_at = None
+        self.processed = 0
+        self.detected = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.avg_lag = 0.0
+        self.restarts = 0
+        # Latidos: ingesta (un sondeo por ciclo) y cada worker (un candidato por ciclo)
+        self.feed_heartbeat = Heartbeat(cycle_budget)
+        self.worker_heartbeats = [Heartbeat(cycle_budget) for _ in range(workers)]
+
+    def heartbeats(self):
+        return [self.feed_heartbeat] + self.worker_heartbeats
+
+    def alive(self):
+        return bool(self._threads) and all(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._threads = [threading.Thread(target=self._poll_loop, name=f'{self.network}-feed', daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._worker_loop, args=(self.worker_heartbeats[i],),
+                             name=f'{self.network}-worker-{i}', daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request_stop(self):
+        self._stop.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def drain(self):
+        """Descartar candidatos pendientes en la cola"""
+        discarded = 0
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return discarded
+            discarded += 1
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            self.feed_heartbeat.begin()
+            try:
+                for candidate in self.source(self.network):
+                    candidate.setdefault("network", self.network)
+                    candidate.setdefault("detected_at", time.time())
+                    try:
+                        self.queue.put_nowait(candidate)
+                    except queue.Full:
+                        with self._stats_lock:
+                            self.dropped += 1
+                    else:
+                        with self._stats_lock:
+                            self.detected += 1
+            except Exception as e:
+                logger.error(f"Error en ingesta {self.network}: {e}")
+                with self._stats_lock:
+                    self.errors += 1
+            self.feed_heartbeat.end()
+            self._stop.wait(self.poll_interval)
+
+    def _worker_loop(self, heartbeat):
+        while not self._stop.is_set():
+            try:
+                candidate = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                heartbeat.touch()
+                continue
+            if not self.limiter.acquire(stop_event=self._stop):
+                return
+            heartbeat.begin()
+            try:
+                self.handler(candidate)
+            except Exception as e:
+                logger.error("Error procesando candidato %s: %s", self.network, e)
+                with self._stats_lock:
+                    self.errors += 1
+            heartbeat.end()
+            lag = time.time() - candidate["detected_at"]
+            with self._stats_lock:
+                self.processed += 1
+                self.last_lag = lag
+                self.avg_lag = lag if self.processed == 1 else 0.9 * self.avg_lag + 0.1 * lag
+
+    def stats(self):
+        with self._stats_lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+            return {
+                "running": any(t.is_alive() for t in self._threads),
+                "workers": self.num_workers,
+                "restarts": self.restarts,
+                "queue_depth": self.queue.qsize(),
+                "detected": self.detected,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "throughput_per_s": round(self.processed / elapsed, 3) if elapsed else 0.0,
+                "last_lag_ms": round(self.last_lag * 1000, 1),
+                "avg_lag_ms": round(self.avg_lag * 1000, 1)
+            }
+
+
+class MultiChainScanner:
+    """Conjunto de escáneres, uno por red, que corren en paralelo"""
+
+    def __init__(self, source, handler, networks=None):
+        self.source = source
+        self.handler = handler
+        self.networks = dict(networks or DEFAULT_NETWORKS)
+        self.scanners = {}
+        self._last_stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return bool(self.scanners)
+
+    def start(self, networks=None):
+        with self._lock:
+            if self.scanners:
+                return False
+            for name in networks or list(self.networks):
+                scanner = NetworkScanner(name, self.source, self.handler, **self.networks[name])
+                scanner.start()
+                self.scanners[name] = scanner
+            logger.info(f"🛰️ Escáner iniciado en {', '.join(self.scanners)}")
+            return True
+
+    def stop(self, timeout=2.0):
+        with self._lock:
+            scanners, self.scanners = self.scanners, {}
+        for scanner in scanners.values():
+            scanner.request_stop()
+            scanner.drain()
+        for scanner in scanners.values():
+            scanner.stop(timeout)
+        self._last_stats = {name: scanner.stats() for name, scanner in scanners.items()}
+
+    def halt(self):
+        """
+        Parada inmediata: señaliza y vacía todas las colas sin esperar a los
+        hilos (se recogen en segundo plano). Para el stop de emergencia.
+        """
+        with self._lock:
+            scanners, self.scanners = self.scanners, {}
+        for scanner in scanners.values():
+            scanner.request_stop()
+            scanner.drain()
+        self._last_stats = {name: scanner.stats() for name, scanner in scanners.items()}
+        threading.Thread(target=lambda: [s.stop() for s in scanners.values()],
+                         name='scanner-reaper', daemon=True).start()
+        return len(scanners)
+
+    def restart(self, name):
+        """
+        Sustituir el escáner de una red por uno nuevo (p. ej. con un worker
+        bloqueado). Los candidatos pendientes pasan al nuevo; los hilos
+        antiguos salen cuando vuelvan de lo que los bloquea.
+        """
+        with self._lock:
+            old = self.scanners.get(name)
+            if old is None:
+                return False
+            old.request_stop()
+            new = NetworkScanner(name, self.source, self.handler, **self.networks[name])
+            new.restarts = old.restarts + 1
+            while True:
+                try:
+                    new.queue.put_nowait(old.queue.get_nowait())
+                except (queue.Empty, queue.Full):
+                    break
+            new.start()
+            self.scanners[name] = new
+        return True
+
+    def heartbeats(self, name):
+        scanner = self.scanners.get(name)
+        return scanner.heartbeats() if scanner is not None else []
+
+    def alive(self, name):
+        scanner = self.scanners.get(name)
+        return scanner is not None and scanner.alive()
+
+    def stats(self):
+        with self._lock:
+            scanners = dict(self.scanners)
+        if not scanners:
+            return self._last_stats
+        return {name: scanner.stats() for name, scanner in scanners.items()}
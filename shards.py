@@ -0,0 +1,517 @@
+"""
+Detección particionada por hash de dirección en procesos independientes.
+
+Cada shard es un proceso que no comparte nada con los demás: recibe por
+socket (Unix en local, TCP entre máquinas) los candidatos cuyo hash de
+dirección le corresponde, los puntúa con su propia caché de riesgo y
+devuelve el resultado. Como una dirección siempre cae en el mismo shard,
+las cachés no se solapan y no hace falta coordinación entre procesos.
+
+El router numera los candidatos al enviarlos y un único hilo de mezcla
+entrega los resultados en ese mismo orden, así que el flujo de trades que
+ve la API es idéntico al de un escáner de un solo proceso. Cada candidato
+tiene un plazo (`result_timeout`): si su shard no responde a tiempo el
+hueco se libera y los resultados de los demás shards siguen fluyendo.
+Dentro de cada shard un lote se reparte entre `concurrency` hilos, así la
+E/S de un análisis (RPC, simulación de venta) no serializa todo el lote.
+
+Uso:
+    python shards.py worker --listen 0.0.0.0:7001   # shard remoto (SHARD_AUTHKEY)
+    python shards.py bench --workers 1,2,4          # benchmark de escalado
+    python shards.py bench --rounds 0 --latency 0.05 --candidates 2000 --workers 1 --concurrency 1,32
+"""
+
+import argparse
+import atexit
+import hashlib
+import heapq
+import logging
+import os
+import queue
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+
+from contract_risk import RiskScoreCache, demo_contract_facts, score_contract
+from log_pipeline import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 256
+CONNECT_TIMEOUT = 10.0
+RESULT_TIMEOUT = 5.0
+CONCURRENCY = 32
+
+
+def shard_for(address, shards):
+    """Shard de una dirección (hash estable entre procesos y máquinas)"""
+    digest = hashlib.blake2b(address.lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shards
+
+
+def parse_address(value):
+    """'host:puerto' → tupla TCP; cualquier otra cosa es una ruta de socket Unix"""
+    host, sep, port = value.rpartition(':')
+    if sep and port.isdigit():
+        return (host or '0.0.0.0', int(port))
+    return value
+
+
+def simulated_analysis(address, rounds):
+    """Trabajo de CPU equivalente a un análisis estático del bytecode del contrato"""
+    digest = address.encode()
+    for _ in range(rounds):
+        digest = hashlib.blake2b(digest, digest_size=32).digest()
+    return digest
+
+
+class ShardDetector:
+    """Pipeline de detección de un shard: análisis + puntuación con caché local"""
+
+    def __init__(self, rounds=0, latency=0.0, ttl=3600.0, max_entries=50000):
+        self.rounds = rounds
+        self.latency = latency
+        self.cache = RiskScoreCache(ttl, max_entries)
+
+    def detect(self, candidate):
+        address = candidate["address"]
+        risk = self.cache.get(address)
+        if risk is None:
+            if self.rounds:
+                simulated_analysis(address, self.rounds)
+            risk = score_contract(address, demo_contract_facts(candidate, self.latency))
+            self.cache.put(address, risk)
+        return {**candidate, "risk_score": risk.score, "risk_reasons": list(risk.reasons)}
+
+
+def serve_shard(address, authkey, rounds=0, latency=0.0, concurrency=CONCURRENCY):
+    """
+    Bucle de un shard: acepta conexiones del router y responde cada lote
+    `[(seq, candidato), ...]` con `[(seq, resultado o None), ...]`, analizando
+    hasta `concurrency` candidatos del lote a la vez.
+    """
+    detector = ShardDetector(rounds, latency)
+
+    def detect(item):
+        seq, candidate = item
+        try:
+            return seq, detector.detect(candidate)
+        except Exception as e:
+            logger.error(f"Error en shard con {candidate.get('address')}: {e}")
+            return seq, None
+
+    with Listener(address, authkey=authkey) as listener, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='shard-detect') as executor:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                return
+            with conn:
+                while True:
+                    try:
+                        batch = conn.recv()
+                    except (EOFError, OSError):
+                        break
+                    if batch is None:
+                        return
+                    conn.send(list(executor.map(detect, batch)))
+
+
+def _connect(address, authkey, timeout=CONNECT_TIMEOUT):
+    """Conectar a un shard reintentando mientras arranca"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+class _ShardLink:
+    """Conexión con un shard: hilo emisor (agrupa en lotes) y hilo lector"""
+
+    def __init__(self, index, conn, on_results, on_lost):
+        self.index = index
+        self.conn = conn
+        self.outbox = queue.Queue()
+        self.inflight = set()
+        self.alive = True
+        self.sent = 0
+        self.received = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+        self._on_results = on_results
+        self._on_lost = on_lost
+        self._threads = [
+            threading.Thread(target=self._send_loop, name=f'shard-{index}-send', daemon=True),
+            threading.Thread(target=self._recv_loop, name=f'shard-{index}-recv', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, seq, candidate):
+        with self._lock:
+            if not self.alive:
+                return False
+            self.inflight.add(seq)
+        self.outbox.put((seq, candidate))
+        return True
+
+    def _send_loop(self):
+        while True:
+            item = self.outbox.get()
+            if item is None:
+                return
+            batch = [item]
+            # Lote natural: todo lo que se haya acumulado mientras se enviaba el anterior
+            while len(batch) < BATCH_SIZE:
+                try:
+                    item = self.outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.outbox.put(None)
+                    break
+                batch.append(item)
+            try:
+                self.conn.send(batch)
+            except (OSError, ValueError) as e:
+                self._lost(e)
+                return
+            self.sent += len(batch)
+            self.batches += 1
+
+    def _recv_loop(self):
+        while True:
+            try:
+                results = self.conn.recv()
+            except (EOFError, OSError, TypeError) as e:
+                # TypeError: close() cerró la conexión mientras se leía
+                self._lost(e)
+                return
+            with self._lock:
+                self.inflight.difference_update(seq for seq, _ in results)
+            self.received += len(results)
+            self._on_results(results)
+
+    def forget(self, seq):
+        """Dejar de esperar un candidato (plazo vencido)"""
+        with self._lock:
+            self.inflight.discard(seq)
+
+    def _lost(self, error):
+        with self._lock:
+            if not self.alive:
+                return
+            self.alive = False
+            orphaned, self.inflight = self.inflight, set()
+        self._on_lost(self, error, orphaned)
+
+    def close(self):
+        with self._lock:
+            was_alive, self.alive = self.alive, False
+        self.outbox.put(None)
+        if was_alive:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            inflight = len(self.inflight)
+        return {
+            "alive": self.alive,
+            "sent": self.sent,
+            "received": self.received,
+            "inflight": inflight,
+            "avg_batch": round(self.sent / self.batches, 1) if self.batches else 0.0
+        }
+
+
+class ShardRouter:
+    """
+    Reparte candidatos entre shards por hash de dirección y entrega los
+    resultados en orden de envío con `on_result(resultado, contexto)`.
+    El contexto se queda en este proceso; solo el candidato viaja al shard.
+    """
+
+    def __init__(self, addresses, authkey, on_result, connect_timeout=CONNECT_TIMEOUT,
+                 result_timeout=RESULT_TIMEOUT):
+        if not authkey:
+            raise ValueError("Los shards necesitan una clave de autenticación (SHARD_AUTHKEY)")
+        self.on_result = on_result
+        self.result_timeout = result_timeout
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        # seq → (contexto, plazo, shard)
+        self._contexts = {}
+        self._merge_queue = queue.Queue()
+        self.emitted = 0
+        self.lost = 0
+        self.timed_out = 0
+        self.errors = 0
+        self.max_reorder = 0
+        self.links = [
+            _ShardLink(i, _connect(address, authkey, connect_timeout), self._merge_queue.put, self._shard_lost)
+            for i, address in enumerate(addresses)
+        ]
+        self._merger = threading.Thread(target=self._merge_loop, name='shard-merge', daemon=True)
+        self._merger.start()
+
+    def __len__(self):
+        return len(self.links)
+
+    def submit(self, candidate, context=None):
+        link = self.links[shard_for(candidate["address"], len(self.links))]
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._contexts[seq] = (context, time.monotonic() + self.result_timeout, link)
+        if not link.submit(seq, candidate):
+            # Shard caído: el hueco se rellena para no bloquear el flujo ordenado
+            self.lost += 1
+            self._merge_queue.put([(seq, None)])
+        return seq
+
+    def _shard_lost(self, link, error, orphaned):
+        logger.error(f"🧩 Shard {link.index} perdido ({error}); {len(orphaned)} candidatos descartados")
+        self.lost += len(orphaned)
+        self._merge_queue.put([(seq, None) for seq in orphaned])
+
+    def _merge_loop(self):
+        """Reordenar por número de secuencia y entregar sin huecos (o con el plazo vencido)"""
+        pending = []
+        expected = 0
+        last_warning = float('-inf')
+        while True:
+            with self._lock:
+                entry = self._contexts.get(expected)
+            timeout = None if entry is None else max(0.0, entry[1] - time.monotonic())
+            try:
+                results = self._merge_queue.get(timeout=timeout)
+            except queue.Empty:
+                results = []
+            if results is None:
+                return
+            for item in results:
+                # Los que llegan después de liberar su hueco se descartan
+                if item[0] >= expected:
+                    heapq.heappush(pending, item)
+            self.max_reorder = max(self.max_reorder, len(pending))
+            expired = 0
+            while True:
+                if pending and pending[0][0] == expected:
+                    seq, result = heapq.heappop(pending)
+                    with self._lock:
+                        context = self._contexts.pop(seq)[0]
+                    expected += 1
+                    if result is None:
+                        continue
+                    try:
+                        self.on_result(result, context)
+                    except Exception as e:
+                        logger.error(f"Error entregando resultado de shard: {e}")
+                        self.errors += 1
+                    self.emitted += 1
+                    continue
+                with self._lock:
+                    entry = self._contexts.get(expected)
+                    if entry is None or entry[1] > time.monotonic():
+                        break
+                    del self._contexts[expected]
+                entry[2].forget(expected)
+                expected += 1
+                expired += 1
+            if expired:
+                self.timed_out += expired
+                now = time.monotonic()
+                if now - last_warning >= 10.0:
+                    last_warning = now
+                    logger.warning("🧩 Candidatos sin respuesta de su shard en %.1fs, se descartan (%d en total)",
+                                   self.result_timeout, self.timed_out)
+
+    def pending(self):
+        with self._lock:
+            return len(self._contexts)
+
+    def wait_idle(self, timeout=None):
+        """Esperar a que se hayan entregado todos los candidatos enviados"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def summary(self):
+        return {
+            "shards": len(self.links),
+            "alive": sum(link.alive for link in self.links),
+            "pending": self.pending(),
+            "emitted": self.emitted,
+            "lost": self.lost,
+            "timed_out": self.timed_out,
+            "errors": self.errors,
+            "max_reorder": self.max_reorder,
+            "by_shard": [link.stats() for link in self.links]
+        }
+
+    def close(self):
+        for link in self.links:
+            link.close()
+        self._merge_queue.put(None)
+
+
+class LocalShardPool:
+    """N shards como procesos locales (`shards.py worker`) conectados por sockets Unix"""
+
+    def __init__(self, workers, on_result, rounds=0, latency=0.0, result_timeout=RESULT_TIMEOUT,
+                 concurrency=CONCURRENCY):
+        self._dir = tempfile.mkdtemp(prefix='shards-')
+        authkey = secrets.token_hex(16)
+        addresses = [os.path.join(self._dir, f'shard-{i}.sock') for i in range(workers)]
+        # Proceso nuevo con solo este módulo: multiprocessing reimportaría el
+        # __main__ del padre (la app completa) en cada hijo
+        env = {**os.environ, 'SHARD_AUTHKEY': authkey}
+        self.processes = [
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), 'worker', '--listen', address,
+                 '--rounds', str(rounds), '--latency', str(latency), '--concurrency', str(concurrency),
+                 '--parent', str(os.getpid())],
+                env=env
+            )
+            for address in addresses
+        ]
+        try:
+            self.router = ShardRouter(addresses, authkey.encode(), on_result, result_timeout=result_timeout)
+        except Exception:
+            self._terminate()
+            raise
+        # Al salir el proceso (p. ej. un worker de gunicorn reciclado) los shards se cierran con él
+        atexit.register(self.close)
+
+    def __len__(self):
+        return len(self.router)
+
+    def submit(self, candidate, context=None):
+        return self.router.submit(candidate, context)
+
+    def summary(self):
+        return {**self.router.summary(), "processes": sum(p.poll() is None for p in self.processes)}
+
+    def _terminate(self):
+        if not self.processes:
+            return
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(1.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = []
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def close(self):
+        atexit.unregister(self.close)
+        self.router.close()
+        self._terminate()
+
+
+def _exit_with_parent(parent):
+    """Terminar el shard si muere el proceso que lo lanzó (incluso con SIGKILL)"""
+    while os.getppid() == parent:
+        time.sleep(1.0)
+    os._exit(0)
+
+
+def _bench_candidates(count, seed=7):
+    digest = hashlib.blake2b(str(seed).encode()).digest()
+    for i in range(count):
+        digest = hashlib.blake2b(digest).digest()
+        yield {
+            "symbol": f"T{i}",
+            "address": "0x" + digest[:20].hex(),
+            "network": "SOL",
+            "price": 0.0001,
+            "confidence": 70 + digest[20] % 30,
+            "market_cap": 25000 + digest[21] * 1000,
+            "liquidity": 75000 + digest[22] * 1000
+        }
+
+
+def bench(candidates, workers, rounds, latency, concurrencies=(CONCURRENCY,)):
+    items = list(_bench_candidates(candidates))
+    detector = ShardDetector(rounds, latency)
+    started = time.perf_counter()
+    for candidate in items:
+        detector.detect(candidate)
+    baseline = candidates / (time.perf_counter() - started)
+    print(f"{candidates} candidatos, rounds={rounds}, latencia={latency * 1000:.1f} ms, CPUs={os.cpu_count()}")
+    print(f"en proceso: {baseline:,.0f} candidatos/s")
+
+    for count in workers:
+        for concurrency in concurrencies:
+            received = []
+            # Plazo holgado: el benchmark mide el rendimiento, no descarta candidatos lentos
+            pool = LocalShardPool(count, lambda result, seq: received.append(seq), rounds, latency,
+                                  result_timeout=3600.0, concurrency=concurrency)
+            try:
+                started = time.perf_counter()
+                for seq, candidate in enumerate(items):
+                    pool.submit(candidate, seq)
+                pool.router.wait_idle()
+                elapsed = time.perf_counter() - started
+                ordered = received == list(range(candidates))
+                print(f"{count} shards x {concurrency} hilos: {candidates / elapsed:,.0f} candidatos/s "
+                      f"(x{candidates / elapsed / baseline:.2f}), orden {'OK' if ordered else 'ROTO'}, "
+                      f"reordenación máx. {pool.router.max_reorder}")
+            finally:
+                pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shards de detección")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Servir un shard (para routers en otras máquinas)")
+    worker.add_argument("--listen", required=True, help="host:puerto o ruta de socket Unix")
+    worker.add_argument("--rounds", type=int, default=0)
+    worker.add_argument("--latency", type=float, default=0.0)
+    worker.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Candidatos analizados a la vez")
+    worker.add_argument("--parent", type=int, help="PID del proceso que lo lanza (sale cuando este muere)")
+
+    bench_parser = commands.add_parser("bench", help="Rendimiento en proceso frente a N shards")
+    bench_parser.add_argument("--candidates", type=int, default=20000)
+    bench_parser.add_argument("--workers", default="1,2,4")
+    bench_parser.add_argument("--rounds", type=int, default=2000, help="Trabajo de CPU por contrato")
+    bench_parser.add_argument("--latency", type=float, default=0.0, help="Segundos de E/S simulada por contrato")
+    bench_parser.add_argument("--concurrency", default=str(CONCURRENCY), help="Hilos por shard (lista: 1,32)")
+
+    args = parser.parse_args(argv)
+    setup_logging()
+    if args.command == "worker":
+        authkey = os.environ.get('SHARD_AUTHKEY')
+        if not authkey:
+            parser.error("SHARD_AUTHKEY es obligatorio para servir un shard")
+        if args.parent:
+            threading.Thread(target=_exit_with_parent, args=(args.parent,), name='parent-watch', daemon=True).start()
+        logger.info(f"🧩 Shard escuchando en {args.listen}")
+        serve_shard(parse_address(args.listen), authkey.encode(), args.rounds, args.latency, args.concurrency)
+    else:
+        bench(args.candidates, [int(n) for n in args.workers.split(",")], args.rounds, args.latency,
+              [int(n) for n in args.concurrency.split(",")])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
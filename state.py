@@ -0,0 +1,142 @@
+"""
+Capa de estado segura entre hilos.
+
+- `CowConfig`: configuración copy-on-write; los lectores obtienen un mapping
+  inmutable y nunca ven una escritura a medias.
+- `AppendLog`: log de solo añadido; los lectores toman una vista de longitud
+  fija sin copiar y sin bloquear a los escritores.
+- `AtomicFlag`: bandera atómica (estado del bot).
+
+Permite servir con workers con hilos (`gunicorn --threads`) sin un lock
+global.
+"""
+
+import threading
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+
+
+class AtomicFlag:
+    """Bandera booleana atómica con test-and-set"""
+
+    def __init__(self, value=False):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        if value:
+            self._event.set()
+
+    def is_set(self):
+        return self._event.is_set()
+
+    __bool__ = is_set
+
+    def set(self):
+        self._event.set()
+
+    def clear(self):
+        self._event.clear()
+
+    def test_and_set(self):
+        """Activar la bandera; devuelve True si ya estaba activa"""
+        with self._lock:
+            was_set = self._event.is_set()
+            self._event.set()
+            return was_set
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+class CowConfig(Mapping):
+    """Configuración copy-on-write: cada escritura publica un dict nuevo"""
+
+    def __init__(self, initial=None):
+        self._data = MappingProxyType(dict(initial or {}))
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Mapping inmutable y coherente de la configuración actual"""
+        return self._data
+
+    def to_dict(self):
+        return dict(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def update(self, changes):
+        """Aplicar varios cambios de forma atómica"""
+        with self._lock:
+            data = dict(self._data)
+            data.update(changes)
+            self._data = MappingProxyType(data)
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+
+class LogView(Sequence):
+    """Vista de longitud fija sobre un AppendLog (no copia los elementos)"""
+
+    __slots__ = ('_items', '_length')
+
+    def __init__(self, items, length):
+        self._items = items
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._items[index]
+
+    def __iter__(self):
+        items = self._items
+        for i in range(self._length):
+            yield items[i]
+
+    def tail(self, count):
+        return self[max(0, self._length - count):]
+
+
+class AppendLog:
+    """Log de solo añadido con vistas coherentes para los lectores"""
+
+    def __init__(self, items=None):
+        self._items = list(items or [])
+        self._lock = threading.Lock()
+
+    def append(self, item):
+        with self._lock:
+            self._items.append(item)
+
+    def view(self):
+        """Instantánea: los elementos añadidos después no aparecen en ella"""
+        items = self._items
+        return LogView(items, len(items))
+
+    def replace(self, items):
+        """Sustituir el contenido (p. ej. al cargar un snapshot)"""
+        with self._lock:
+            self._items = list(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def tail(self, count):
+        return self.view().tail(count)
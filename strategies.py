@@ -0,0 +1,145 @@
+"""
+Estrategias con nombre y estado aislado.
+
+Cada estrategia tiene su propia configuración (copy-on-write), su log de
+trades, su almacén de alertas, su control de riesgo, su índice de tokens y
+sus rollups de analítica. Todas comparten el mismo escáner: un candidato se
+ingiere y se analiza una vez y después se evalúa contra cada estrategia.
+
+La estrategia `default` es la que usan las rutas cuando no se indica
+`?strategy=`, así que el comportamiento con una sola estrategia no cambia.
+"""
+
+import re
+import threading
+
+from alert_store import AlertStore
+from analytics import TradeAnalytics
+from risk_gate import RiskGate
+from state import AppendLog, CowConfig
+from token_index import TokenIndex
+
+DEFAULT_STRATEGY = "default"
+
+_NAME_RE = re.compile(r'^[a-z0-9][a-z0-9_-]{0,31}$')
+
+
+def valid_strategy_name(name):
+    return bool(_NAME_RE.match(name))
+
+
+class Strategy:
+    """Configuración y estado de una estrategia"""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = CowConfig(config)
+        self.trades = AppendLog()
+        self.alerts = AlertStore()
+        self.performance = AppendLog()
+        self.analytics = TradeAnalytics()
+        self.open_positions = {}
+        self.token_index = TokenIndex(cooldown_seconds=float(config["token_cooldown_minutes"]) * 60)
+        self.risk_gate = RiskGate(
+            max_daily_trades=config["max_daily_trades"],
+            total_capital=config["total_capital"],
+            max_position_size=config["max_position_size"]
+        )
+        self.exit_engine = None
+
+    @property
+    def is_default(self):
+        return self.name == DEFAULT_STRATEGY
+
+    def scoped(self, data):
+        """Datos de evento con la estrategia indicada (la de por defecto no se anota)"""
+        return data if self.is_default else {**data, "strategy": self.name}
+
+    def configure_risk(self):
+        self.risk_gate.configure(
+            self.config["max_daily_trades"],
+            self.config["total_capital"],
+            self.config["max_position_size"]
+        )
+
+    def passes_filters(self, candidate):
+        """Filtro de gemas según la configuración actual de la estrategia"""
+        config = self.config.snapshot()
+        return (candidate["confidence"] >= float(config["min_confidence"]) and
+                float(config["min_market_cap"]) <= candidate["market_cap"] <= float(config["max_market_cap"]) and
+                candidate["liquidity"] >= float(config["min_liquidity"]) and
+                candidate.get("risk_score", 0) <= float(config["max_risk_score"]))
+
+    def snapshot(self):
+        """
+        Estado serializable. Se llama bajo el lock del diario y se serializa
+        en segundo plano: los trades se copian porque las salidas los modifican.
+        """
+        return {
+            "trades": [dict(trade) for trade in self.trades.view()],
+            "alerts": [alert.to_record() for alert in self.alerts.to_list()],
+            "performance": list(self.performance.view()),
+            "config": self.config.to_dict()
+        }
+
+    def load(self, state, alert_from_record):
+        self.trades.replace(state["trades"])
+        self.open_positions.clear()
+        self.open_positions.update((t["id"], t) for t in state["trades"] if t["status"] == "ACTIVE")
+        self.analytics.rebuild(state["trades"])
+        self.alerts.load([alert_from_record(record) for record in state["alerts"]])
+        self.performance.replace(state["performance"])
+        self.config.update(state["config"])
+
+    def summary(self):
+        risk = self.risk_gate.snapshot()
+        return {
+            "name": self.name,
+            "bot_enabled": self.config.get("bot_enabled", False),
+            "trades": len(self.trades),
+            "open_positions": len(self.open_positions),
+            "alerts": len(self.alerts),
+            "daily_trades": risk["daily_trades"],
+            "available_capital": risk["available_capital"],
+            "total_pnl": round(self.analytics.overall.pnl_sum, 2)
+        }
+
+
+class StrategyRegistry:
+    """Estrategias por nombre; la de por defecto siempre existe"""
+
+    def __init__(self, default_config):
+        self._lock = threading.Lock()
+        self._strategies = {DEFAULT_STRATEGY: Strategy(DEFAULT_STRATEGY, default_config)}
+
+    @property
+    def default(self):
+        return self._strategies[DEFAULT_STRATEGY]
+
+    def get(self, name=None):
+        return self._strategies.get(name or DEFAULT_STRATEGY)
+
+    def create(self, name, config):
+        """Crear (o devolver si ya existe) la estrategia `name`"""
+        if not valid_strategy_name(name):
+            raise ValueError(f"Nombre de estrategia inválido: {name!r}")
+        with self._lock:
+            strategy = self._strategies.get(name)
+            if strategy is None:
+                # Copy-on-write del registro: los lectores iteran sin lock
+                strategies = dict(self._strategies)
+                strategy = strategies[name] = Strategy(name, config)
+                self._strategies = strategies
+            return strategy
+
+    def names(self):
+        return list(self._strategies)
+
+    def __iter__(self):
+        return iter(list(self._strategies.values()))
+
+    def __len__(self):
+        return len(self._strategies)
+
+    def __contains__(self, name):
+        return name in self._strategies
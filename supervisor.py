@@ -0,0 +1,260 @@
+"""
+Supervisor de etapas: latidos, detección de bloqueos y reinicio en caliente.
+
+Cada etapa (bucle de salidas, velas, ingesta y workers de cada red) marca
+el inicio y el fin de cada ciclo en un `Heartbeat`. Un hilo vigilante
+revisa las etapas cada `interval` segundos y:
+
+- reinicia la etapa si su hilo ha muerto mientras debería estar activa;
+- la da por bloqueada si un ciclo lleva más de `stall_factor` veces su
+  presupuesto o si lleva ese tiempo sin completar ciclos, y la reinicia.
+
+Un hilo de Python no se puede matar: reiniciar una etapa de bucle es
+arrancar un hilo nuevo con otra generación; el antiguo sale en cuanto su
+ciclo vuelve. Los reinicios de una misma etapa se espacian con backoff
+exponencial para no entrar en bucle si el fallo persiste.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat:
+    """Tiempos de ciclo de una etapa (un solo hilo escritor)"""
+
+    def __init__(self, budget, samples=256):
+        self.budget = float(budget)
+        self.started = None
+        self.last_beat = time.monotonic()
+        self.cycles = 0
+        self.over_budget = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+        self._samples = deque(maxlen=samples)
+
+    def begin(self):
+        self.started = time.monotonic()
+
+    def end(self):
+        now = time.monotonic()
+        if self.started is None:
+            return
+        duration = now - self.started
+        self.started = None
+        self.last_beat = now
+        self.cycles += 1
+        self.last = duration
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        if duration > self.budget:
+            self.over_budget += 1
+        self._samples.append(duration)
+
+    def touch(self):
+        """Latido sin ciclo (espera activa sin trabajo)"""
+        self.last_beat = time.monotonic()
+
+    def running_for(self, now):
+        started = self.started
+        return now - started if started is not None else 0.0
+
+    def idle_for(self, now):
+        return now - self.last_beat if self.started is None else 0.0
+
+    def stats(self):
+        samples = sorted(self._samples)
+        return {
+            "cycles": self.cycles,
+            "budget_ms": round(self.budget * 1000, 1),
+            "last_ms": round(self.last * 1000, 2),
+            "avg_ms": round(self.total / self.cycles * 1000, 2) if self.cycles else 0.0,
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2) if samples else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "over_budget": self.over_budget
+        }
+
+
+class Stage:
+    """Etapa supervisada: `heartbeats()` → latidos, `alive()`, `restart()`, `wanted()`"""
+
+    def __init__(self, name, heartbeats, alive, restart, wanted, max_idle=None):
+        self.name = name
+        self.heartbeats = heartbeats
+        self.alive = alive
+        self.restart = restart
+        self.wanted = wanted
+        # Sin ciclos durante `max_idle` s también es un bloqueo (None = las esperas son normales)
+        self.max_idle = max_idle
+        self.deaths = 0
+        self.stalls = 0
+        self.restarts = 0
+        self.last_restart = 0.0
+        self.backoff = 0.0
+        self.last_error = None
+        self.failing = False
+
+
+class LoopRunner:
+    """Bucle `cycle()` cada `interval` s en un hilo propio, reiniciable por generación"""
+
+    def __init__(self, name, cycle, interval, budget, wanted):
+        self.name = name
+        self.cycle = cycle
+        self.interval = interval
+        self.wanted = wanted
+        self.heartbeat = Heartbeat(budget)
+        self.generation = 0
+        self.errors = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            return self._spawn()
+
+    def restart(self):
+        with self._lock:
+            return self._spawn()
+
+    def _spawn(self):
+        self.generation += 1
+        self.heartbeat = Heartbeat(self.heartbeat.budget)
+        self._thread = threading.Thread(
+            target=self._run, args=(self.generation, self.heartbeat),
+            name=f'{self.name}-{self.generation}', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, generation, heartbeat):
+        while self.wanted() and generation == self.generation:
+            heartbeat.begin()
+            try:
+                self.cycle()
+            except Exception as e:
+                self.errors += 1
+                logger.error("Error en la etapa %s: %s", self.name, e)
+            heartbeat.end()
+            time.sleep(self.interval)
+
+    def alive(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+
+class Supervisor:
+    """Vigilante de etapas con reinicio automático"""
+
+    def __init__(self, interval=1.0, stall_factor=3.0, max_backoff=60.0):
+        self.interval = interval
+        self.stall_factor = stall_factor
+        self.max_backoff = max_backoff
+        self.stages = {}
+        self.checks = 0
+        self._thread = None
+        self._stop = threading.Event()
+
+    def register(self, stage):
+        self.stages[stage.name] = stage
+        return stage
+
+    def loop(self, name, cycle, interval, budget, wanted):
+        """Registrar un bucle gestionado por el supervisor; devuelve su LoopRunner"""
+        runner = LoopRunner(name, cycle, interval, budget, wanted)
+        self.register(Stage(
+            name, lambda: [runner.heartbeat], runner.alive, runner.restart, wanted,
+            max_idle=interval + budget * self.stall_factor
+        ))
+        return runner
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name='supervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error("Error en el supervisor: %s", e)
+
+    def stall_reason(self, stage, now):
+        """Motivo de bloqueo de la etapa, o None si está sana"""
+        for heartbeat in stage.heartbeats():
+            limit = heartbeat.budget * self.stall_factor
+            running = heartbeat.running_for(now)
+            if running > limit:
+                return f"ciclo de {running:.1f}s (presupuesto {heartbeat.budget:.1f}s)"
+            if stage.max_idle is not None and heartbeat.idle_for(now) > stage.max_idle:
+                return f"sin latidos desde hace {heartbeat.idle_for(now):.1f}s"
+        return None
+
+    def check(self, now=None):
+        """Revisar todas las etapas una vez (lo llama el hilo vigilante)"""
+        now = time.monotonic() if now is None else now
+        self.checks += 1
+        for stage in list(self.stages.values()):
+            if not stage.wanted():
+                stage.failing = False
+                continue
+            if not stage.alive():
+                if not stage.failing:
+                    stage.deaths += 1
+                self._restart(stage, now, "hilo detenido")
+                continue
+            reason = self.stall_reason(stage, now)
+            if reason:
+                if not stage.failing:
+                    stage.stalls += 1
+                self._restart(stage, now, reason)
+                continue
+            stage.failing = False
+            if stage.backoff and now - stage.last_restart > 2 * stage.backoff:
+                # Sana durante un tiempo: el siguiente fallo se reinicia sin esperar
+                stage.backoff = 0.0
+
+    def _restart(self, stage, now, reason):
+        # Un fallo se cuenta una vez aunque siga presente en varias revisiones (backoff)
+        stage.failing = True
+        stage.last_error = reason
+        if now - stage.last_restart < stage.backoff:
+            return
+        logger.warning("🩺 Reiniciando etapa %s: %s", stage.name, reason)
+        try:
+            stage.restart()
+        except Exception as e:
+            logger.error("Error reiniciando la etapa %s: %s", stage.name, e)
+        stage.restarts += 1
+        stage.backoff = min(self.max_backoff, max(self.interval, stage.backoff * 2))
+        stage.last_restart = now
+
+    def summary(self):
+        now = time.monotonic()
+        stages = {}
+        for name, stage in self.stages.items():
+            heartbeats = stage.heartbeats()
+            stages[name] = {
+                "wanted": stage.wanted(),
+                "alive": stage.alive(),
+                "deaths": stage.deaths,
+                "stalls": stage.stalls,
+                "restarts": stage.restarts,
+                "last_error": stage.last_error,
+                "cycles": [heartbeat.stats() for heartbeat in heartbeats],
+                "running_ms": round(max((h.running_for(now) for h in heartbeats), default=0.0) * 1000, 1)
+            }
+        return {"checks": self.checks, "stages": stages}
@@ -0,0 +1,61 @@
+"""
+Validación de parámetros de la API.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('JOURNAL_DIR', tempfile.mkdtemp(prefix='journal-test-'))
+
+import pytest
+
+import app
+from alert_templates import Alert, TEMPLATE_IDS
+
+
+@pytest.fixture
+def client():
+    app.startup_ready.set()
+    return app.app.test_client()
+
+
+@pytest.fixture(scope="module")
+def paged_strategy():
+    app.record_event("strategy_created", {"name": "pages", "config": dict(app.DEFAULT_CONFIG)})
+    for trade_id in (901, 902):
+        app.record_event("trade", {
+            "id": trade_id, "strategy": "pages", "token_symbol": "PAGE", "network": "BSC", "trade_type": "BUY",
+            "entry_price": 0.001, "quantity": 1000.0, "position_size": 1.0, "pnl": 0.0, "status": "COMPLETED",
+            "confidence": 90.0, "market_cap": 50000.0, "liquidity": 100000.0,
+            "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-01T00:00:00"
+        })
+        alert = Alert(trade_id, TEMPLATE_IDS["GEM_DETECTED"], "PAGE", 90.0, 50000.0, 100000.0, 0.0)
+        app.record_event("alert", {**alert.to_record(), "strategy": "pages"})
+    return "pages"
+
+
+@pytest.mark.parametrize("path", ['/api/alerts', '/api/trades'])
+def test_per_page_is_clamped_to_one(client, paged_strategy, path):
+    response = client.get(f'{path}?strategy={paged_strategy}&per_page=-1')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+
+@pytest.mark.parametrize("path", ['/api/alerts', '/api/trades'])
+def test_per_page_must_be_an_integer(client, path):
+    response = client.get(f'{path}?per_page=abc')
+    assert response.status_code == 400
+    assert "per_page" in response.get_json()["error"]
+
+
+def test_market_data_limit_zero_returns_one_bar(client, tmp_path, monkeypatch):
+    import market_data
+
+    cache = market_data.MarketDataCache(str(tmp_path))
+    cache.append("PAGE", [1, 2, 3, 4, 5], [1.0] * 5, [1.0] * 5, [1.0] * 5, [1.0, 2.0, 3.0, 4.0, 5.0], [1.0] * 5)
+    monkeypatch.setattr(app, "_market_cache", cache)
+
+    response = client.get('/api/market-data/PAGE?limit=0')
+    assert response.status_code == 200
+    assert response.get_json()["bars"]["close"] == [5.0]
+    assert client.get('/api/market-data/PAGE?limit=x').status_code == 400
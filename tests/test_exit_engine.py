@@ -0,0 +1,67 @@
+"""
+Motor de salidas: take-profit escalonado, trailing stop, stop loss y salida por tiempo.
+"""
+
+import math
+
+import pytest
+
+from exit_engine import ExitEngine
+
+
+@pytest.fixture
+def engine():
+    engine = ExitEngine(stop_loss_pct=20.0, take_profit_pcts=(100.0, 200.0, 400.0), trailing_stop_pct=15.0,
+                        max_hold_seconds=100.0, capacity=2)
+    engine.open(1, 1.0, 100.0, opened_at=0.0)
+    return engine
+
+
+def exits(engine, price, now=1.0):
+    return [(reason, round(quantity, 6), closed) for _, quantity, _, _, reason, closed in engine.tick([price], now=now)]
+
+
+def test_take_profit_levels_sell_fractions_of_the_initial_quantity(engine):
+    assert exits(engine, 2.0) == [("take_profit_1", 40.0, False)]
+    assert exits(engine, 2.5) == []
+    # Un salto que cruza TP2 y TP3 en el mismo tick vende ambos tramos
+    assert exits(engine, 5.0) == [("take_profit_2", 30.0, False), ("take_profit_3", 30.0, True)]
+    assert 1 not in engine
+    assert len(engine) == 0
+
+
+def test_trailing_stop_follows_the_high_and_never_moves_down(engine):
+    exits(engine, 2.0)
+    slot = engine.slot(1)
+    assert engine.stop[slot] == pytest.approx(1.7)
+    assert exits(engine, 2.5) == []
+    assert engine.stop[slot] == pytest.approx(2.125)
+    assert exits(engine, 2.2) == []
+    assert engine.stop[slot] == pytest.approx(2.125)
+    assert exits(engine, 2.1) == [("trailing_stop", 60.0, True)]
+
+
+def test_fixed_stop_loss_before_the_first_take_profit(engine):
+    assert exits(engine, 0.81) == []
+    assert exits(engine, 0.8) == [("stop_loss", 100.0, True)]
+
+
+def test_time_exit_after_max_hold(engine):
+    assert exits(engine, 1.1, now=99.0) == []
+    assert exits(engine, 1.1, now=100.0) == [("time_exit", 100.0, True)]
+
+
+def test_missing_prices_are_skipped(engine):
+    assert exits(engine, math.nan, now=500.0) == []
+    assert 1 in engine
+
+
+def test_resumed_position_keeps_its_stage(engine):
+    engine.open(2, 1.0, 60.0, opened_at=0.0, initial_quantity=100.0, stage=1)
+    batch = list(engine.tick([1.0, 3.0], now=1.0))
+    assert [(trade_id, reason, quantity) for trade_id, quantity, _, _, reason, _ in batch] == [
+        (2, "take_profit_2", 30.0)
+    ]
+    # Slot libre reutilizado tras cerrar
+    engine.close(1)
+    assert engine.open(3, 1.0, 10.0) == 0
@@ -0,0 +1,196 @@
+"""
+Recuperación del diario: snapshot + reproducción de la cola debe dar el
+mismo estado que el proceso en marcha y que reproducir el diario completo.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('JOURNAL_DIR', tempfile.mkdtemp(prefix='journal-test-'))
+
+import pytest
+
+import app
+from alert_templates import Alert
+from journal import Journal
+
+
+def make_trade(trade_id, status="ACTIVE", pnl=0.0):
+    return {
+        "id": trade_id,
+        "strategy": "default",
+        "token_symbol": f"TKN{trade_id}",
+        "network": "BSC",
+        "trade_type": "BUY",
+        "entry_price": 0.001,
+        "quantity": 1000.0,
+        "position_size": 100.0,
+        "pnl": pnl,
+        "status": status,
+        "confidence": 90.0,
+        "market_cap": 50000.0,
+        "liquidity": 100000.0,
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+
+
+def make_exit(trade_id, pnl, remaining, closed, reason="take_profit_1"):
+    return {
+        "trade_id": trade_id,
+        "quantity": 1000.0 - remaining,
+        "price": 0.002,
+        "reason": reason,
+        "pnl": pnl,
+        "remaining": remaining,
+        "closed": closed,
+        "at": "2026-01-01T00:05:00"
+    }
+
+
+class Node:
+    """Proceso simulado: un registro de estrategias alimentado por su diario"""
+
+    def __init__(self, directory):
+        self.state = app.new_state()
+        self.journal = Journal(directory, snapshot_every=10 ** 9)
+
+    def open(self):
+        self.journal.open(snapshot_fn=self.snapshot)
+
+    def record(self, event_type, data):
+        self.journal.append(event_type, data, apply=lambda t, d, ts: app.apply_event(self.state, t, d))
+
+    def snapshot(self):
+        return {"strategies": {strategy.name: strategy.snapshot() for strategy in self.state}}
+
+    def load(self, snapshot):
+        for name, strategy_state in snapshot["strategies"].items():
+            strategy = self.state.create(name, {**app.DEFAULT_CONFIG, **strategy_state["config"]})
+            strategy.load(strategy_state, Alert.from_record)
+
+    def recover(self):
+        self.journal.recover(self.load, lambda t, d, ts: app.apply_event(self.state, t, d))
+
+    def trades(self):
+        return {trade["id"]: trade for trade in self.state.default.trades.view()}
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path)
+
+
+def test_snapshot_is_not_changed_by_later_exits(directory):
+    node = Node(directory)
+    node.open()
+    node.record("trade", make_trade(1))
+    with node.journal._lock:
+        offset = node.journal._file.tell()
+        snapshot = node.snapshot()
+    node.record("trade_exit", make_exit(1, 80.0, remaining=500.0, closed=False))
+    node.journal.write_snapshot(snapshot, offset)
+    node.journal.close()
+
+    assert snapshot["strategies"]["default"]["trades"][0]["realized_pnl"] == 0.0
+    restarted = Node(directory)
+    restarted.recover()
+    assert restarted.journal.stats["snapshot_loaded"]
+    assert restarted.journal.stats["events_replayed"] == 1
+    assert restarted.trades()[1]["realized_pnl"] == node.trades()[1]["realized_pnl"] == 80.0
+
+
+def test_snapshot_plus_tail_matches_full_replay(directory):
+    node = Node(directory)
+    node.open()
+    node.record("trade", make_trade(1))
+    node.record("trade", make_trade(2, status="COMPLETED", pnl=-20.0))
+    node.record("trade", make_trade(3))
+    node.record("trade_exit", make_exit(1, 80.0, remaining=500.0, closed=False))
+    with node.journal._lock:
+        node.journal._start_snapshot()
+    node.journal._snapshot_thread.join()
+    node.record("trade_exit", make_exit(1, 120.0, remaining=0.0, closed=True, reason="take_profit_2"))
+    node.record("trade_exit", make_exit(3, -30.0, remaining=0.0, closed=True, reason="stop_loss"))
+    node.journal.close()
+
+    restarted = Node(directory)
+    restarted.recover()
+    assert restarted.journal.stats["snapshot_loaded"]
+    assert restarted.journal.stats["events_replayed"] == 2
+
+    replayed = Node(directory)
+    for _, event_type, _, data in replayed.journal.iter_events(0):
+        app.apply_event(replayed.state, event_type, data)
+
+    for other in (restarted, replayed):
+        assert other.trades() == node.trades()
+        assert not other.state.default.open_positions
+    assert node.trades()[1]["pnl"] == 200.0
+    assert node.trades()[3]["status"] == "STOPPED"
+
+
+def test_analytics_match_with_and_without_snapshot(directory):
+    node = Node(directory)
+    node.open()
+    node.record("trade", make_trade(1, pnl=40.0))
+    node.record("trade", make_trade(2, status="COMPLETED", pnl=-20.0))
+    node.record("trade_exit", make_exit(1, 150.0, remaining=0.0, closed=True))
+    with node.journal._lock:
+        node.journal._start_snapshot()
+    node.journal._snapshot_thread.join()
+    node.journal.close()
+
+    restarted = Node(directory)
+    restarted.recover()
+    replayed = Node(directory)
+    for _, event_type, _, data in replayed.journal.iter_events(0):
+        app.apply_event(replayed.state, event_type, data)
+
+    expected = node.state.default.analytics.query()
+    assert expected["overall"]["total_pnl"] == 130.0
+    assert restarted.state.default.analytics.query() == expected
+    assert replayed.state.default.analytics.query() == expected
+
+
+def test_statistics_and_analytics_agree_after_exits():
+    app.record_event("strategy_created", {"name": "exits", "config": dict(app.DEFAULT_CONFIG)})
+    strategy = app.strategies.get("exits")
+    for trade_id, pnl in ((101, -0.25), (102, -0.25), (103, 5.0)):
+        trade = make_trade(trade_id, pnl=pnl)
+        trade["strategy"] = "exits"
+        if trade_id == 103:
+            trade["status"] = "COMPLETED"
+        app.record_event("trade", trade)
+    app.process_exits(strategy, [
+        (101, 500.0, 0.002, 0.001, "take_profit_1", False),
+        (101, 500.0, 0.003, 0.001, "take_profit_2", True),
+        (102, 1000.0, 0.0005, 0.001, "stop_loss", True),
+    ])
+    assert not strategy.open_positions
+
+    app.startup_ready.set()
+    client = app.app.test_client()
+    statistics = client.get('/api/statistics?strategy=exits').get_json()
+    analytics = client.get('/api/analytics?strategy=exits').get_json()
+    summary = next(s for s in client.get('/api/strategies').get_json() if s["name"] == "exits")
+    expected = round(sum(trade["pnl"] for trade in strategy.trades.view()), 2)
+    assert statistics["daily_pnl"] == expected
+    assert round(analytics["overall"]["total_pnl"], 2) == expected
+    assert summary["total_pnl"] == expected
+    assert analytics["overall"]["win_rate"] == statistics["win_rate"]
+
+
+def test_exit_pnl_charges_fees_on_both_sides():
+    app.record_event("strategy_created", {"name": "fees", "config": {**app.DEFAULT_CONFIG, "paper_trading": False,
+                                                                      "trading_fee_pct": 1.0}})
+    strategy = app.strategies.get("fees")
+    trade = make_trade(201)
+    trade["strategy"] = "fees"
+    app.record_event("trade", trade)
+    app.process_exits(strategy, [(201, 1000.0, 0.002, 0.001, "take_profit_2", True)])
+
+    closed = strategy.trades.view()[-1]
+    assert closed["status"] == "COMPLETED"
+    assert closed["pnl"] == round(1000.0 * (0.002 * 0.99 - 0.001 * 1.01), 2)
+    assert closed["fees"] == round(1000.0 * (0.001 + 0.002) * 0.01, 4)
@@ -0,0 +1,26 @@
+"""
+Pipeline de logging: no toca la configuración global del módulo logging y
+`stop` vacía la cola y se puede llamar más de una vez.
+"""
+
+import io
+import logging
+
+from log_pipeline import LogPipeline
+
+
+def test_stop_flushes_and_leaves_logging_globals_alone():
+    globals_before = (logging._srcfile, logging.logProcesses, logging.logMultiprocessing, logging.logThreads)
+    stream = io.StringIO()
+    logger = logging.getLogger('test.log_pipeline')
+    logger.propagate = False
+    pipeline = LogPipeline(fmt="text", sample_rate=0, stream=stream).install(logger)
+    for i in range(100):
+        logger.info("registro %d", i)
+    pipeline.stop()
+    pipeline.stop()
+
+    assert stream.getvalue().count("registro") == 100
+    assert pipeline.handler not in logger.handlers
+    assert not pipeline.started
+    assert (logging._srcfile, logging.logProcesses, logging.logMultiprocessing, logging.logThreads) == globals_before
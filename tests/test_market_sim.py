@@ -0,0 +1,26 @@
+"""
+Mercado sintético: tasas inválidas y mercado parado.
+"""
+
+import pytest
+
+from market_sim import SyntheticMarket
+
+
+def test_zero_rates_advance_the_clock_without_events():
+    market = SyntheticMarket(launch_rate=0, tick_rate=0, liquidity_rate=0, start_ts=100.0)
+    assert market.advance(5.0) == []
+    assert market.now == 105.0
+    with pytest.raises(ValueError):
+        market.next_event()
+
+
+def test_negative_rates_are_rejected():
+    with pytest.raises(ValueError):
+        SyntheticMarket(launch_rate=-1)
+
+
+def test_same_seed_same_events():
+    first = SyntheticMarket(seed=7).advance(0.5)
+    second = SyntheticMarket(seed=7).advance(0.5)
+    assert first and first == second
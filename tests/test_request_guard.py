@@ -0,0 +1,91 @@
+"""
+Endpoints de control: límite por cliente y coalescencia por clave de idempotencia.
+"""
+
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+from request_guard import Coalescer, ControlGuard
+
+
+@pytest.fixture
+def guarded():
+    app = Flask(__name__)
+    guard = ControlGuard(rate=0.001, burst=2)
+    calls = []
+
+    @app.route('/start', methods=['POST'])
+    @guard.protect("start")
+    def start():
+        calls.append(1)
+        return jsonify({"call": len(calls)}), 200
+
+    @app.route('/fail', methods=['POST'])
+    @guard.protect("fail")
+    def fail():
+        calls.append(1)
+        return jsonify({"error": "falla"}), 500
+
+    return app.test_client(), guard, calls
+
+
+def test_rate_limit_is_per_client(guarded):
+    client, guard, _ = guarded
+    for body in ("a", "b"):
+        assert client.post('/start', data=body).status_code == 200
+    limited = client.post('/start', data="c")
+    assert limited.status_code == 429
+    assert int(limited.headers['Retry-After']) >= 1
+
+    other = client.post('/start', data="c", environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other.status_code == 200
+    assert guard.summary()["rate_limited"] == 1
+
+
+def test_idempotency_key_replays_the_first_response(guarded):
+    client, guard, calls = guarded
+    first = client.post('/start', headers={'Idempotency-Key': 'k1'})
+    again = client.post('/start', headers={'Idempotency-Key': 'k1'})
+    assert again.get_json() == first.get_json() == {"call": 1}
+    assert again.headers['Idempotent-Replayed'] == 'true'
+    assert len(calls) == 1
+    assert guard.summary() == {"executed": 1, "coalesced": 1, "rate_limited": 0}
+
+
+def test_server_errors_are_not_replayed(guarded):
+    client, _, calls = guarded
+    for _ in range(2):
+        assert client.post('/fail', headers={'Idempotency-Key': 'k2'}).status_code == 500
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicates_run_once():
+    coalescer = Coalescer()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "hecho"
+
+    threads = [threading.Thread(target=lambda: results.append(coalescer.run("clic", slow, 0))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    # Margen para que los duplicados lleguen mientras la primera sigue en curso
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(reused for _, reused in results) == [False, True, True, True, True]
+    # Sin TTL la clave se olvida al terminar: un nuevo clic vuelve a ejecutar
+    assert coalescer.run("clic", lambda: "otra vez", 0) == ("otra vez", False)
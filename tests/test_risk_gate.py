@@ -0,0 +1,64 @@
+"""
+Control de riesgo: límite diario de trades, tamaño de posición y capital.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from risk_gate import RiskGate
+
+MONDAY = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def test_daily_trade_limit_resets_at_utc_midnight():
+    gate = RiskGate(max_daily_trades=2, total_capital=10000.0, max_position_size=100.0)
+    assert gate.try_reserve(1, 100.0, now=MONDAY) is None
+    assert gate.try_reserve(2, 100.0, now=MONDAY) is None
+    gate.release(1)
+    assert gate.try_reserve(3, 100.0, now=MONDAY) == "daily_limit"
+
+    tuesday = MONDAY.replace(hour=0) + timedelta(days=1)
+    assert gate.try_reserve(4, 100.0, now=tuesday) is None
+    assert gate.snapshot(now=tuesday)["daily_trades"] == 1
+    assert gate.rejections["daily_limit"] == 1
+
+
+def test_capital_is_reserved_until_release():
+    gate = RiskGate(max_daily_trades=10, total_capital=250.0, max_position_size=100.0)
+    assert gate.try_reserve(1, 100.0, now=MONDAY) is None
+    assert gate.try_reserve(2, 100.0, now=MONDAY) is None
+    assert gate.try_reserve(3, 100.0, now=MONDAY) == "capital"
+    assert gate.try_reserve(4, 150.0, now=MONDAY) == "position_size"
+
+    assert gate.release(1) == 100.0
+    assert gate.release(1) is None
+    assert gate.try_reserve(5, 100.0, now=MONDAY) is None
+    assert gate.snapshot(now=MONDAY)["available_capital"] == 50.0
+
+
+def test_adjust_shrinks_a_partial_fill_reservation():
+    gate = RiskGate(max_daily_trades=10, total_capital=200.0, max_position_size=200.0)
+    gate.try_reserve(1, 200.0, now=MONDAY)
+    gate.adjust(1, 120.0)
+    assert gate.try_reserve(2, 80.0, now=MONDAY) is None
+    assert gate.snapshot(now=MONDAY)["reserved_capital"] == 200.0
+
+
+def test_concurrent_reservations_never_oversubscribe_capital():
+    gate = RiskGate(max_daily_trades=1000, total_capital=1000.0, max_position_size=10.0)
+    approved = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        for i in range(100):
+            if gate.try_reserve(offset + i, 10.0) is None:
+                with lock:
+                    approved.append(offset + i)
+
+    threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(approved) == 100
+    assert gate.snapshot()["available_capital"] == 0.0
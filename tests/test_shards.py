@@ -0,0 +1,24 @@
+"""
+Shards de detección: autenticación obligatoria y orden de entrega.
+"""
+
+import pytest
+
+import shards
+
+
+def test_router_refuses_empty_authkey():
+    with pytest.raises(ValueError):
+        shards.ShardRouter(["127.0.0.1:1"], b"", lambda result, context: None)
+
+
+def test_local_pool_delivers_in_submission_order():
+    received = []
+    pool = shards.LocalShardPool(2, lambda result, seq: received.append(seq), concurrency=4)
+    try:
+        for seq, candidate in enumerate(shards._bench_candidates(200)):
+            pool.submit(candidate, seq)
+        assert pool.router.wait_idle(timeout=30)
+    finally:
+        pool.close()
+    assert received == list(range(200))
@@ -0,0 +1,123 @@
+"""
+Índice de estado de tokens para el escáner de gemas.
+
+Evita recomprar el mismo token en cada ciclo (cooldown por token) y descarta
+en memoria los contratos ya rechazados mediante un filtro de Bloom, sin tocar
+el almacenamiento.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre un bytearray con doble hashing"""
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenIndex:
+    """
+    Estado de tokens vistos por el escáner.
+
+    - Tokens comprados: dict dirección -> expiración del cooldown (O(1)).
+    - Contratos rechazados: dos generaciones de filtros de Bloom; al llenarse
+      la actual se descarta la anterior, así los rechazos antiguos caducan y
+      la memoria queda acotada.
+    """
+
+    def __init__(self, cooldown_seconds=3600, bloom_capacity=100000, bloom_error_rate=0.001):
+        self.cooldown_seconds = cooldown_seconds
+        self._bloom_capacity = bloom_capacity
+        self._bloom_error_rate = bloom_error_rate
+        self._cooldowns = {}
+        self._rejected = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._rejected_old = None
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+        self.stats = {"skipped_cooldown": 0, "skipped_rejected": 0, "checked": 0}
+
+    def is_rejected(self, key):
+        """Probablemente rechazado (admite falsos positivos, nunca falsos negativos)"""
+        return key in self._rejected or (self._rejected_old is not None and key in self._rejected_old)
+
+    def in_cooldown(self, key, now=None):
+        expires = self._cooldowns.get(key)
+        if expires is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if expires <= now:
+            with self._lock:
+                if self._cooldowns.get(key) == expires:
+                    del self._cooldowns[key]
+            return False
+        return True
+
+    def should_skip(self, key):
+        """True si el token ya fue rechazado o sigue en cooldown"""
+        self.stats["checked"] += 1
+        if self.is_rejected(key):
+            self.stats["skipped_rejected"] += 1
+            return True
+        if self.in_cooldown(key):
+            self.stats["skipped_cooldown"] += 1
+            return True
+        return False
+
+    def mark_bought(self, key, cooldown_seconds=None):
+        """Registrar una compra y abrir su ventana de cooldown"""
+        ttl = self.cooldown_seconds if cooldown_seconds is None else cooldown_seconds
+        now = time.monotonic()
+        with self._lock:
+            self._cooldowns[key] = now + ttl
+            if now - self._last_prune > 60:
+                self._prune(now)
+
+    def mark_rejected(self, key):
+        """Registrar un contrato descartado por el filtro"""
+        with self._lock:
+            if self._rejected.count >= self._bloom_capacity:
+                self._rejected_old = self._rejected
+                self._rejected = BloomFilter(self._bloom_capacity, self._bloom_error_rate)
+            self._rejected.add(key)
+
+    def clear_rejected(self):
+        """Olvidar los rechazos (p. ej. tras cambiar los filtros de configuración)"""
+        with self._lock:
+            self._rejected = BloomFilter(self._bloom_capacity, self._bloom_error_rate)
+            self._rejected_old = None
+
+    def _prune(self, now):
+        expired = [key for key, expires in self._cooldowns.items() if expires <= now]
+        for key in expired:
+            del self._cooldowns[key]
+        self._last_prune = now
+
+    def summary(self):
+        return {
+            "tokens_in_cooldown": len(self._cooldowns),
+            "rejected_tracked": self._rejected.count + (self._rejected_old.count if self._rejected_old else 0),
+            **self.stats
+        }
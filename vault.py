@@ -0,0 +1,164 @@
+"""
+Almacén cifrado de credenciales (API de Binance, token de Telegram).
+
+Los secretos se guardan cifrados con Fernet (AES-128-CBC + HMAC) en un
+fichero JSON con permisos 0600. La clave se toma de `VAULT_KEY` o, si no
+está definida, de un fichero de clave generado al primer arranque (también
+0600); en producción conviene la variable de entorno para no dejar la
+clave junto a los datos cifrados.
+
+Cada secreto se descifra una vez y queda en una caché en memoria con TTL,
+así que firmar peticiones o enviar alertas no paga un descifrado por
+llamada. La configuración y el diario nunca contienen el valor en claro:
+la API solo ve la versión enmascarada.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger(__name__)
+
+SECRET_FIELDS = ("binance_api_key", "binance_api_secret", "telegram_bot_token")
+MASK = "••••"
+
+
+def mask(value):
+    """Versión mostrable de un secreto (solo los 4 últimos caracteres si es largo)"""
+    if not value:
+        return ""
+    return MASK + value[-4:] if len(value) > 12 else MASK
+
+
+def is_masked(value):
+    return isinstance(value, str) and value.startswith(MASK)
+
+
+def split_secrets(data):
+    """Separar (datos sin secretos, secretos) de un dict de configuración"""
+    clean = {key: value for key, value in data.items() if key not in SECRET_FIELDS}
+    secrets = {key: data[key] for key in SECRET_FIELDS if key in data}
+    return clean, secrets
+
+
+def _write_private(path, data):
+    """Escritura atómica con permisos 0600"""
+    tmp_path = path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_key(key_path):
+    """Clave Fernet de `VAULT_KEY` o del fichero de clave (se genera si no existe)"""
+    key = os.environ.get('VAULT_KEY')
+    if key:
+        return key.encode()
+    try:
+        with open(key_path, 'rb') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(key_path) or '.', exist_ok=True)
+    key = Fernet.generate_key()
+    _write_private(key_path, key)
+    logger.warning(f"🔑 Clave del vault generada en {key_path} (define VAULT_KEY en producción)")
+    return key
+
+
+class SecretVault:
+    """
+    Secretos cifrados en disco con caché de descifrado en memoria. Sin
+    `path` solo cifra y descifra (p. ej. para columnas de base de datos).
+    """
+
+    def __init__(self, path, key, ttl=300.0):
+        self.path = path
+        self.ttl = ttl
+        self._fernet = Fernet(key)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self.stats = {"hits": 0, "decrypts": 0, "writes": 0}
+        self._tokens = {}
+        if path is not None:
+            try:
+                with open(path, 'rb') as f:
+                    self._tokens = json.loads(f.read())
+            except FileNotFoundError:
+                pass
+
+    def encrypt(self, value):
+        return self._fernet.encrypt(value.encode()).decode()
+
+    def decrypt(self, token):
+        return self._fernet.decrypt(token.encode()).decode()
+
+    def is_token(self, value):
+        """True si `value` es un token válido de esta clave"""
+        try:
+            self.decrypt(value)
+        except (InvalidToken, AttributeError, ValueError):
+            return False
+        return True
+
+    def __contains__(self, name):
+        return name in self._tokens
+
+    def get(self, name, default=None):
+        """Valor en claro; solo se descifra si no está en caché o ha caducado"""
+        now = time.monotonic()
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] > now:
+            self.stats["hits"] += 1
+            return entry[1]
+        token = self._tokens.get(name)
+        if token is None:
+            return default
+        value = self.decrypt(token)
+        self._cache[name] = (now + self.ttl, value)
+        self.stats["decrypts"] += 1
+        return value
+
+    def put(self, name, value):
+        """Guardar (cifrado) un secreto; devuelve False si no cambia"""
+        with self._lock:
+            if name in self._tokens and self.get(name) == value:
+                return False
+            tokens = {**self._tokens, name: self.encrypt(value)}
+            if self.path is not None:
+                _write_private(self.path, json.dumps(tokens).encode())
+            self._tokens = tokens
+            self._cache[name] = (time.monotonic() + self.ttl, value)
+            self.stats["writes"] += 1
+            return True
+
+    def sign(self, name, payload):
+        """HMAC-SHA256 de `payload` con el secreto `name` (firma de peticiones a la API)"""
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return hmac.new(self.get(name).encode(), payload, hashlib.sha256).hexdigest()
+
+    def masked(self):
+        return {name: mask(self.get(name)) for name in self._tokens}
+
+    def purge(self):
+        """Olvidar los valores descifrados (el siguiente acceso vuelve a descifrar)"""
+        self._cache.clear()
+
+    def summary(self):
+        now = time.monotonic()
+        return {
+            "secrets": len(self._tokens),
+            "cached": sum(1 for expires, _ in list(self._cache.values()) if expires > now),
+            "ttl": self.ttl,
+            **self.stats
+        }